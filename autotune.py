@@ -0,0 +1,289 @@
+"""
+Autotuning of the solver for the composite model.
+
+Every available solver configuration (IDAKLU with each linear solver and
+Jacobian form, CasADi in its "safe" and "fast with events" modes, each at a few
+tolerances) solves a short protocol representative of this project's runs. The
+voltage of each is compared with a reference solved at tight tolerances, step by
+step, and the fastest configuration within ``--tolerance`` of it is stored in the
+solver profile (see solver_profile.py), which the run helpers then use for every
+run of that model with that parameter set (and OCPs). Configurations that fail
+or stop early are recorded and skipped.
+
+Example (CLI)::
+
+    python autotune.py --parameter-set OG --tolerance 1e-3
+    python solver_profile.py info
+"""
+import argparse
+import warnings
+
+import numpy as np
+
+import pybamm
+
+import Durdel2023_composite  # noqa: F401, registers "final", "test" and "OG"
+import mesh_profile
+import parameter_sets
+import solver_profile
+from ocp_data import select_ocp
+from run_helpers import composite_model, model_identity
+
+# Half an hour out and back in at C/2 with rests: crosses the steep silicon OCP,
+# the hysteresis switch and the rest transients of longer protocols
+PROTOCOL = (
+    "Discharge at C/2 for 30 minutes",
+    "Rest for 10 minutes",
+    "Charge at C/2 for 30 minutes",
+    "Rest for 10 minutes",
+)
+
+REFERENCE = {"class": "IDAKLUSolver", "rtol": 1e-8, "atol": 1e-10}
+
+# (rtol, atol) tried with every configuration
+TOLERANCES = [(1e-3, 1e-6), (1e-4, 1e-6), (1e-5, 1e-8)]
+
+# (linear solver, Jacobian form) of IDAKLU
+LINEAR_SOLVERS = [
+    ("SUNLinSol_KLU", "sparse"),
+    ("SUNLinSol_Dense", "dense"),
+    ("SUNLinSol_Band", "banded"),
+    ("SUNLinSol_SPGMR", "sparse"),
+    ("SUNLinSol_SPBCGS", "matrix-free"),
+]
+
+CASADI_MODES = ["safe", "fast with events"]
+
+
+def candidates():
+    """Settings of every configuration tried, as stored in the profile."""
+    settings = []
+    for rtol, atol in TOLERANCES:
+        for linear_solver, jacobian in LINEAR_SOLVERS:
+            settings.append(
+                {
+                    "class": "IDAKLUSolver",
+                    "rtol": rtol,
+                    "atol": atol,
+                    "options": {"linear_solver": linear_solver, "jacobian": jacobian},
+                }
+            )
+        for mode in CASADI_MODES:
+            settings.append(
+                {"class": "CasadiSolver", "mode": mode, "rtol": rtol, "atol": atol}
+            )
+    return settings
+
+
+def _steps(solution):
+    return [step for cycle in solution.cycles for step in cycle.steps]
+
+
+def voltage_error(solution, reference, name="Voltage [V]"):
+    """
+    Largest difference [V] of the voltage (or of the potential ``name``) between
+    two solutions of the same experiment, each step interpolated on the
+    reference's times of that step; infinite if ``solution`` did not run every
+    step.
+    """
+    steps, reference_steps = _steps(solution), _steps(reference)
+    if len(steps) != len(reference_steps):
+        return np.inf
+    error = 0.0
+    for step, reference_step in zip(steps, reference_steps):
+        voltage = np.interp(reference_step.t, step.t, step[name].entries)
+        error = max(error, np.max(np.abs(voltage - reference_step[name].entries)))
+    return error
+
+
+def _solve(parameter_values, experiment, settings, options, model, repeats):
+    # median time of ``repeats`` solves, as the run helpers would do them, and
+    # the last solution. The solver times its own set-up and integration, as in
+    # benchmarks/suite.py, so that model processing and discretisation (the
+    # same for every solver) do not blur the ranking
+    seconds = []
+    for _ in range(repeats):
+        with warnings.catch_warnings():
+            # CasadiSolver is deprecated, but still tried while it is there
+            warnings.simplefilter("ignore", DeprecationWarning)
+            solver = solver_profile.make_solver(settings)
+        built_model = composite_model(options) if model is None else model
+        sim = pybamm.Simulation(
+            built_model,
+            parameter_values=parameter_values,
+            experiment=experiment,
+            var_pts=mesh_profile.var_pts(
+                model_identity(options, model), parameter_values, built_model
+            ),
+            solver=solver,
+        )
+        solution = sim.solve()
+        seconds.append(solution.set_up_time.value + solution.solve_time.value)
+    return float(np.median(seconds)), solution
+
+
+def autotune(
+    parameter_values,
+    options=None,
+    model=None,
+    protocol=PROTOCOL,
+    tolerance=1e-3,
+    repeats=1,
+    settings=None,
+    verbose=True,
+    name=None,
+):
+    """
+    Time every solver configuration on ``protocol`` and pick the fastest whose
+    voltage is within ``tolerance`` of the reference.
+
+    Parameters
+    ----------
+    parameter_values : :class:`pybamm.ParameterValues`
+        Parameter set to tune on
+    options : dict, optional
+        Model options, defaults to :data:`run_helpers.COMPOSITE_OPTIONS`
+    model : :class:`pybamm.BaseModel`, optional
+        Model to use instead of one built from ``options``
+    protocol : tuple of str, optional
+        Experiment steps, defaults to :data:`PROTOCOL`
+    tolerance : float, optional
+        Largest voltage error [V] accepted against the reference
+    repeats : int, optional
+        Solves per configuration; the median time is kept
+    settings : list of dict, optional
+        Configurations to try, defaults to :func:`candidates`
+    verbose : bool, optional
+        Whether to print each trial
+    name : str, optional
+        Name of the parameter set, recorded in the entry
+
+    Returns
+    -------
+    dict
+        Profile entry, for :func:`solver_profile.save_entry`
+
+    Raises
+    ------
+    ValueError
+        If no configuration is accurate enough
+    """
+    experiment = pybamm.Experiment([tuple(protocol)])
+    reference_seconds, reference = _solve(
+        parameter_values, experiment, REFERENCE, options, model, 1
+    )
+    if len(_steps(reference)) != len(protocol):
+        raise ValueError("the reference solve stopped early: choose another protocol")
+    trials = []
+    for trial_settings in candidates() if settings is None else settings:
+        trial = {"solver": trial_settings}
+        try:
+            trial["seconds"], solution = _solve(
+                parameter_values, experiment, trial_settings, options, model, repeats
+            )
+        except (pybamm.SolverError, RuntimeError, ValueError) as error:
+            trial["failed"] = str(error).splitlines()[0]
+        else:
+            trial["error [V]"] = float(voltage_error(solution, reference))
+            if not np.isfinite(trial["error [V]"]):
+                del trial["error [V]"]
+                trial["failed"] = "stopped early"
+        trials.append(trial)
+        if verbose:
+            if "failed" in trial:
+                outcome = "failed: " + trial["failed"]
+            else:
+                outcome = (
+                    f"{trial['seconds']:7.3f} s, "
+                    f"error {trial['error [V]'] * 1e3:8.3f} mV"
+                )
+            print(f"{_describe(trial_settings):58s} {outcome}", flush=True)
+    accurate = [
+        trial
+        for trial in trials
+        if "failed" not in trial and trial["error [V]"] <= tolerance
+    ]
+    if not accurate:
+        raise ValueError(f"no configuration is within {tolerance} V of the reference")
+    best = min(accurate, key=lambda trial: trial["seconds"])
+    if model is None:
+        model_class, model_options = model_identity(options)
+        model_label = f"{model_class.__name__} {model_options}"
+    else:
+        model_label = f"{type(model).__name__} (custom)"
+    return {
+        "model": model_label,
+        "parameter set": name,
+        "protocol": list(protocol),
+        "tolerance [V]": tolerance,
+        "reference solver": REFERENCE,
+        "reference seconds": reference_seconds,
+        "solver": best["solver"],
+        "seconds": best["seconds"],
+        "error [V]": best["error [V]"],
+        "pybamm": pybamm.__version__,
+        "trials": trials,
+    }
+
+
+def _describe(settings):
+    settings = dict(settings)
+    name = settings.pop("class")
+    options = settings.pop("options", {})
+    return " ".join([name, *map(str, settings.values()), *map(str, options.values())])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--parameter-set", default="OG")
+    parser.add_argument(
+        "--ocp",
+        choices=["table", "surrogate"],
+        default="table",
+        help="tabulated OCPs, or their analytic surrogates (see ocp_data.py)",
+    )
+    parser.add_argument(
+        "--step",
+        action="append",
+        default=[],
+        help="protocol step, can be repeated; defaults to autotune.PROTOCOL",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1e-3,
+        help="largest voltage error [V] against the reference",
+    )
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument(
+        "--path", default=None, help="profile file, see solver_profile.py"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="print the trials, save nothing"
+    )
+    args = parser.parse_args(argv)
+
+    parameter_values = select_ocp(
+        parameter_sets.parameter_values(args.parameter_set), args.ocp
+    )
+    entry = autotune(
+        parameter_values,
+        protocol=tuple(args.step) or PROTOCOL,
+        tolerance=args.tolerance,
+        repeats=args.repeats,
+        name=args.parameter_set,
+    )
+    print(
+        f"fastest within {args.tolerance * 1e3:g} mV: {_describe(entry['solver'])}, "
+        f"{entry['seconds']:.3f} s against {entry['reference seconds']:.3f} s for "
+        f"the reference"
+    )
+    if not args.dry_run:
+        solver_profile.save_entry(
+            model_identity(), parameter_values, entry, args.path
+        )
+        print("saved to " + (args.path or solver_profile.profile_path()))
+
+
+if __name__ == "__main__":
+    main()
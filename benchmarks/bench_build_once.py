@@ -0,0 +1,71 @@
+"""
+Rebuild-per-point vs build-once/solve-many on the composite silicon-fraction sweep.
+
+Run from the repository root::
+
+    python benchmarks/bench_build_once.py
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+
+import pybamm
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from run_helpers import build_simulation, run_simulation, solve_inputs  # noqa: E402
+from sweep import silicon_fraction_grid  # noqa: E402
+
+
+def base_parameter_values():
+    # same cell as composite_example.py
+    param = pybamm.ParameterValues("Chen2020_composite")
+    param.update(
+        {
+            "Upper voltage cut-off [V]": 4.5,
+            "Lower voltage cut-off [V]": 2.5,
+            "Primary: Initial concentration in negative electrode [mol.m-3]": 23000,
+            "Secondary: Initial concentration in negative electrode [mol.m-3]": 277000,
+            "Secondary: Maximum concentration in negative electrode [mol.m-3]": 278000,
+        }
+    )
+    param["Current function [A]"] = 0.5 * param["Nominal cell capacity [A.h]"]
+    return param
+
+
+def main(n_points=10):
+    param = base_parameter_values()
+    overrides = silicon_fraction_grid(np.linspace(0.001, 0.1, n_points))
+    t_eval = [0, 10000]
+
+    start = timeit.default_timer()
+    rebuilt = []
+    for point in overrides:
+        param_point = param.copy()
+        param_point.update(point)
+        rebuilt.append(run_simulation(param_point, t_eval=t_eval))
+    t_rebuild = timeit.default_timer() - start
+
+    start = timeit.default_timer()
+    sim = build_simulation(param, list(overrides[0]))
+    t_build = timeit.default_timer() - start
+    start = timeit.default_timer()
+    reused = solve_inputs(sim, overrides, t_eval=t_eval)
+    t_solve = timeit.default_timer() - start
+
+    error = max(
+        np.max(np.abs(a["Voltage [V]"] - b["Voltage [V]"]))
+        for a, b in zip(rebuilt, reused)
+    )
+    print(f"points: {n_points}")
+    print(f"rebuild per point: {t_rebuild:.2f} s ({t_rebuild / n_points:.3f} s/point)")
+    print(f"build once:        {t_build:.2f} s")
+    print(f"solve many:        {t_solve:.2f} s ({t_solve / n_points:.3f} s/point)")
+    print(f"speed-up:          {t_rebuild / (t_build + t_solve):.1f}x")
+    print(f"max voltage difference: {error:.2e} V")
+
+
+if __name__ == "__main__":
+    main()
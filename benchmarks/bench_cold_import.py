@@ -0,0 +1,87 @@
+"""
+Cold import time of the parameter and property modules, as a fresh worker
+process sees it, and whether importing them loads pybamm.
+
+Each module is imported in a new interpreter; the median of the repeats is
+reported. Given a git revision, the modules of that revision (extracted to a
+temporary directory) are timed as well, e.g. the one before a change. Run from
+the repository root::
+
+    python benchmarks/bench_cold_import.py [repeats] [revision]
+"""
+import io
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "numpy",
+    "pybamm",
+    "ocp_data",
+    "parameter_sets",
+    "Durdel2023_single",
+    "Durdel2023_composite",
+]
+
+
+def _run(module, directory):
+    # imported first thing in a new interpreter, nothing else loaded, not numpy
+    import timeit
+
+    sys.path.insert(0, directory)
+    start = timeit.default_timer()
+    __import__(module)
+    seconds = timeit.default_timer() - start
+    print(json.dumps({"seconds": seconds, "pybamm": "pybamm" in sys.modules}))
+
+
+def measure(module, directory):
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", module, directory],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _extract(revision, directory):
+    # the tree of ``revision``, without touching the working tree
+    archive = subprocess.run(
+        ["git", "-C", ROOT, "archive", "--format=tar", revision],
+        capture_output=True,
+        check=True,
+    ).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(directory, filter="data")
+
+
+def main(repeats=5, revision=None):
+    import numpy as np
+
+    with tempfile.TemporaryDirectory() as directory:
+        trees = [("working tree", ROOT)]
+        if revision is not None:
+            _extract(revision, directory)
+            trees.insert(0, (revision, directory))
+        for label, tree in trees:
+            for module in MODULES:
+                runs = [measure(module, tree) for _ in range(repeats)]
+                seconds = np.median([run["seconds"] for run in runs])
+                loads = "loads pybamm" if runs[0]["pybamm"] else ""
+                print(
+                    f"{label:12s} {module:20s} {seconds * 1e3:7.1f} ms  {loads}",
+                    flush=True,
+                )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        _run(sys.argv[2], sys.argv[3])
+    else:
+        main(*[int(arg) for arg in sys.argv[1:2]], *sys.argv[2:3])
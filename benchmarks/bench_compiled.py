@@ -0,0 +1,123 @@
+"""
+Compiled model functions (``compiled=True`` in run_helpers) against the casadi
+virtual machine, on the C/50 experiment of LiSi_composite.ipynb.
+
+For each mode: the total solve time, its set-up and integration phases (see
+profiling.py), the number of steps and the integration time per step, and the
+time of one evaluation of the residual and of the Jacobian. The compiled mode
+first compiles into an empty temporary directory, which is reported apart;
+the repeats load the library from it. Run from the repository root::
+
+    python benchmarks/bench_compiled.py [repeats]
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+import casadi
+import numpy as np
+import pybamm
+from pybamm.codegen.compilation import aot_compile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Durdel2023_composite  # noqa: E402
+from profiling import Profiler  # noqa: E402
+from run_helpers import _solver, composite_model  # noqa: E402
+
+EXPERIMENT = pybamm.Experiment(
+    [
+        (
+            "Rest for 5 minutes",
+            "Discharge at C/50 until 3.0 V",
+            "Charge at C/50 until 4.2 V",
+        ),
+    ]
+)
+
+
+def _simulation(compiled):
+    return pybamm.Simulation(
+        composite_model(),
+        parameter_values=pybamm.ParameterValues(
+            Durdel2023_composite.get_test_parameter_values()
+        ),
+        experiment=EXPERIMENT,
+        solver=_solver(None, compiled=compiled),
+    )
+
+
+def solve(compiled):
+    """Report of one solve of the experiment, with its final voltage."""
+    with Profiler() as profiler:
+        solution = _simulation(compiled).solve()
+    report = profiler.report
+    return {
+        "total": report["wall time [s]"],
+        "setup": report["phases"]["setup"]["self"],
+        "solve": report["phases"]["solve"]["self"],
+        "steps": report["solver"]["number_of_steps"],
+        "voltage": solution["Voltage [V]"].entries[-1],
+    }
+
+
+def evaluations(number=2000):
+    """Seconds per evaluation of the residual and Jacobian, interpreted/compiled."""
+    sim = pybamm.Simulation(
+        composite_model(),
+        parameter_values=pybamm.ParameterValues(
+            Durdel2023_composite.get_test_parameter_values()
+        ),
+    )
+    sim.build()
+    model = sim.built_model
+    pybamm.IDAKLUSolver().set_up(model)
+    t = casadi.MX.sym("t")
+    y = casadi.MX.sym("y", model.len_rhs_and_alg)
+    p = casadi.MX.sym("p", 0)
+    functions = {
+        "residual": model.rhs_algebraic_eval,
+        "Jacobian": casadi.Function(
+            "jacobian", [t, y, p], [model.jac_rhs_algebraic_eval(t, y, p)]
+        ),
+    }
+    y0 = model.y0_list[0].full().flatten()
+    times = {}
+    for name, function in functions.items():
+        for label, f in [("interpreted", function), ("compiled", aot_compile(function))]:
+            f(0.0, y0, [])
+            seconds = timeit.timeit(lambda: f(0.0, y0, []), number=number)
+            times[name, label] = seconds / number
+    return times
+
+
+def main(repeats=3):
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["PYBAMM_CASADI_AOT_CACHE"] = directory
+        first = solve(compiled=True)
+        print(
+            f"compiled, first run {first['total']:6.1f} s "
+            f"(set-up and compilation {first['setup']:.1f} s)",
+            flush=True,
+        )
+        for label, compiled in [("interpreted", False), ("compiled", True)]:
+            runs = [solve(compiled) for _ in range(repeats)]
+            total, setup, solve_time = (
+                np.median([run[key] for run in runs])
+                for key in ["total", "setup", "solve"]
+            )
+            steps = runs[0]["steps"]
+            print(
+                f"{label:11s} total {total:6.3f} s: set-up {setup:6.3f} s, "
+                f"integration {solve_time:6.3f} s, {steps} steps, "
+                f"{solve_time / steps * 1e3:6.2f} ms per step, "
+                f"end voltage {runs[0]['voltage']:.6f} V",
+                flush=True,
+            )
+        for (name, label), seconds in evaluations().items():
+            print(f"{name:8s} {label:11s} {seconds * 1e6:8.1f} us per evaluation")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
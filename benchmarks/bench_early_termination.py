@@ -0,0 +1,63 @@
+"""
+Step setups saved by stopping the notebook's GITT and C/100 protocols at the
+2.5 V cut-off instead of running all 100 cycles.
+
+Run from the repository root::
+
+    python benchmarks/bench_early_termination.py
+"""
+import os
+import sys
+import timeit
+
+import pybamm
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gitt import (  # noqa: E402
+    GITT_OPTIONS,
+    GITT_PARAMETER_SET,
+    gitt_experiment,
+    ocv_experiment,
+)
+
+
+class StepCounter(pybamm.callbacks.Callback):
+    def __init__(self):
+        self.steps = 0
+
+    def on_step_start(self, logs):
+        self.steps += 1
+
+
+def run(experiment):
+    counter = StepCounter()
+    sim = pybamm.Simulation(
+        pybamm.lithium_ion.DFN(GITT_OPTIONS),
+        parameter_values=pybamm.ParameterValues(GITT_PARAMETER_SET),
+        experiment=experiment,
+    )
+    start = timeit.default_timer()
+    solution = sim.solve(initial_soc=1.0, callbacks=[counter])
+    return counter.steps, len(solution.cycles), timeit.default_timer() - start
+
+
+def main():
+    protocols = {
+        "GITT C/10 6 min / rest 2.5 h": gitt_experiment,
+        "C/100 until 2.5 V": ocv_experiment,
+    }
+    for name, make_experiment in protocols.items():
+        full = run(make_experiment(stop_voltage=None))
+        stopped = run(make_experiment())
+        print(name)
+        print(f"  all cycles:      {full[0]} steps, {full[1]} cycles, {full[2]:.1f} s")
+        print(
+            f"  stop at cut-off: {stopped[0]} steps, {stopped[1]} cycles, "
+            f"{stopped[2]:.1f} s"
+        )
+        print(f"  step setups saved: {full[0] - stopped[0]}")
+
+
+if __name__ == "__main__":
+    main()
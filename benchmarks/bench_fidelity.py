@@ -0,0 +1,74 @@
+"""
+Speedup of the model fidelity ladder (fidelity.py) on protocols of this project,
+OG parameter set.
+
+For each protocol: the model the ladder picks for its C-rate, its solve time
+against the DFN's, and the largest voltage difference between the two. The
+choices are calibrated into an empty temporary file first, which is timed apart.
+Run from the repository root::
+
+    python benchmarks/bench_fidelity.py [tolerance] [repeats]
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+import pybamm
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fidelity  # noqa: E402
+from autotune import voltage_error  # noqa: E402
+from sweep import get_parameter_values  # noqa: E402
+
+PROTOCOLS = {
+    "C/50 discharge": ("Discharge at C/50 for 5 hours", "Rest for 1 hour"),
+    "C/20 cycle": (
+        "Discharge at C/20 for 2 hours",
+        "Rest for 30 minutes",
+        "Charge at C/20 for 2 hours",
+        "Rest for 30 minutes",
+    ),
+    "C/10 cycle": (
+        "Discharge at C/10 for 1 hour",
+        "Rest for 30 minutes",
+        "Charge at C/10 for 1 hour",
+        "Rest for 30 minutes",
+    ),
+    "C/5 pulses": ("Discharge at C/5 for 10 minutes", "Rest for 10 minutes") * 3,
+    "1C pulses": ("Discharge at 1C for 5 minutes", "Rest for 10 minutes") * 3,
+}
+
+
+def main(tolerance=2e-3, repeats=3):
+    parameter_values = get_parameter_values("OG")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "fidelity.json")
+        start = timeit.default_timer()
+        chosen = {}
+        for name, steps in PROTOCOLS.items():
+            experiment = pybamm.Experiment([steps])
+            c_rate = fidelity.protocol_c_rate(parameter_values, experiment)
+            chosen[name] = fidelity.select_model_class(
+                parameter_values, c_rate, tolerance, path=path
+            )
+        print(f"calibration {timeit.default_timer() - start:6.1f} s", flush=True)
+    for name, steps in PROTOCOLS.items():
+        experiment = pybamm.Experiment([steps])
+        reference_seconds, reference = fidelity._solve(
+            parameter_values, experiment, fidelity.LADDER[-1], None, repeats
+        )
+        seconds, solution = fidelity._solve(
+            parameter_values, experiment, chosen[name], None, repeats
+        )
+        print(
+            f"{name:15s} {chosen[name].__name__:4s} {seconds:6.3f} s, DFN "
+            f"{reference_seconds:6.3f} s: {reference_seconds / seconds:4.1f}x, "
+            f"error {voltage_error(solution, reference) * 1e3:6.3f} mV",
+            flush=True,
+        )
+
+
+if __name__ == "__main__":
+    main(*[float(arg) for arg in sys.argv[1:2]], *[int(arg) for arg in sys.argv[2:3]])
@@ -0,0 +1,102 @@
+"""
+Fitting with solver sensitivities (fitting.py) against the finite-difference
+baseline, on synthetic data.
+
+The data is the OG parameter set's voltage over two 10-minute pulses with rests,
+at C/2 and 1C, 25 and 40 degC, with 0.5 mV of noise. Four keys are fitted from
+a start 1.5 to 2 times off their values: a diffusivity of each electrode, the
+silicon volume fraction and the positive exchange-current density (a function,
+fitted as a factor). For each method: the optimizer's iterations and residual
+evaluations, the solves (finite differences included), the wall time, the
+fitted values and the final error. Run from the repository root::
+
+    python benchmarks/bench_fitting.py [processes]
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fitting import Dataset, fit, fitted_parameter_values  # noqa: E402
+from gitt import PulseCurrent  # noqa: E402
+from run_helpers import run_simulation  # noqa: E402
+from sweep import get_parameter_values  # noqa: E402
+
+TRUE = {
+    "Primary: Negative particle diffusivity [m2.s-1]": 5.5e-14,
+    "Positive particle diffusivity [m2.s-1]": 4e-15,
+    "Secondary: Negative electrode active material volume fraction": 0.015,
+    "Positive electrode exchange-current density [A.m-2]": 1.0,
+}
+START = {
+    "Primary: Negative particle diffusivity [m2.s-1]": 1.1e-13,
+    "Positive particle diffusivity [m2.s-1]": 2e-15,
+    "Secondary: Negative electrode active material volume fraction": 0.0225,
+    "Positive electrode exchange-current density [A.m-2]": 0.5,
+}
+BOUNDS = {key: (value / 10, value * 10) for key, value in TRUE.items()}
+
+C_RATES = [0.5, 1]
+TEMPERATURES = [298.15, 313.15]
+NOISE = 5e-4
+
+
+def datasets(parameter_values):
+    """Synthetic datasets of the true parameter values, see the module docstring."""
+    rng = np.random.default_rng(0)
+    true_values = fitted_parameter_values(parameter_values, TRUE)
+    capacity = parameter_values["Nominal cell capacity [A.h]"]
+    result = []
+    for c_rate in C_RATES:
+        for temperature in TEMPERATURES:
+            current = PulseCurrent(c_rate * capacity, 600, 600, 2)
+            overrides = {
+                "Current function [A]": current,
+                "Ambient temperature [K]": temperature,
+                "Initial temperature [K]": temperature,
+            }
+            t = np.linspace(0, current.end_time, 241)
+            point_values = fitted_parameter_values(true_values, {})
+            point_values.update(overrides)
+            solution = run_simulation(
+                point_values, t_eval=[0, t[-1]], solve_kwargs={"t_interp": t}
+            )
+            voltage = np.interp(t, solution["Time [s]"], solution["Voltage [V]"])
+            result.append(
+                Dataset(
+                    t,
+                    voltage + rng.normal(0, NOISE, len(t)),
+                    overrides,
+                    name=f"{c_rate:g}C, {temperature - 273.15:g} degC",
+                )
+            )
+    return result
+
+
+def main(processes=1):
+    parameter_values = get_parameter_values("OG")
+    data = datasets(parameter_values)
+    for jacobian in ["sensitivities", "finite differences"]:
+        result = fit(
+            parameter_values,
+            data,
+            BOUNDS,
+            initial=START,
+            jacobian=jacobian,
+            processes=processes,
+        )
+        print(
+            f"{jacobian:18s} {result['iterations']:3d} iterations, "
+            f"{result['residual evaluations']:3d} residual evaluations, "
+            f"{result['solves']:4d} solves, {result['seconds']:7.1f} s, "
+            f"rmse {result['rmse [V]'] * 1e3:.3f} mV",
+            flush=True,
+        )
+        for key, value in result["parameters"].items():
+            print(f"    {key:64s} {value:10.4g} (true {TRUE[key]:.4g})")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
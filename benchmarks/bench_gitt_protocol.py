@@ -0,0 +1,49 @@
+"""
+GITT as a 2N-step experiment vs the same protocol compiled into one piecewise
+current profile (gitt.run_gitt_fast), at one temperature.
+
+Run from the repository root::
+
+    python benchmarks/bench_gitt_protocol.py [pulses]
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gitt import gitt_experiment, run_gitt, run_gitt_fast  # noqa: E402
+
+
+def rest_end_voltages(result):
+    index = np.searchsorted(result["Time [s]"], result["Cycle end time [s]"])
+    return result["Terminal voltage [V]"][index]
+
+
+def main(pulses=100, temperature=298.15):
+    start = timeit.default_timer()
+    experiment = run_gitt(
+        [temperature], experiment=gitt_experiment(cycles=pulses), processes=1
+    )[0]
+    t_experiment = timeit.default_timer() - start
+
+    start = timeit.default_timer()
+    compiled = run_gitt_fast([temperature], pulses=pulses, processes=1)[0]
+    t_compiled = timeit.default_timer() - start
+
+    v_experiment = rest_end_voltages(experiment)
+    v_compiled = rest_end_voltages(compiled)
+    n = min(len(v_experiment), len(v_compiled))
+    print(f"pulses: {pulses}")
+    print(f"experiment: {t_experiment:.2f} s, {len(v_experiment)} rest ends")
+    print(f"compiled:   {t_compiled:.2f} s, {len(v_compiled)} rest ends")
+    print(
+        "max rest-end voltage difference: "
+        f"{np.max(np.abs(v_experiment[:n] - v_compiled[:n])):.2e} V"
+    )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
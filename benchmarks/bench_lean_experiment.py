@@ -0,0 +1,108 @@
+"""
+Memory of long cycling experiments on the silicon composite cell: a full Solution,
+the default run_simulation (arrays of every cycle), and its lean mode (the first
+and last cycles, plus per-cycle summaries).
+
+Each run is a fresh process, so its peak resident memory (``ru_maxrss``) is its
+own; the "baseline" is the resident memory once the model is built, before
+solving. Run from the repository root::
+
+    python benchmarks/bench_lean_experiment.py [cycles ...]
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import timeit
+
+import pybamm
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Durdel2023_composite  # noqa: E402
+from run_helpers import composite_model, run_simulation  # noqa: E402
+
+# 40 minutes per cycle: 10 % of the capacity out and back in, with rests
+CYCLE = (
+    "Discharge at 1C for 10 minutes",
+    "Rest for 10 minutes",
+    "Charge at 1C for 10 minutes",
+    "Rest for 10 minutes",
+)
+
+MODES = ["full Solution", "default", "lean"]
+
+
+def _rss():
+    # current resident memory [bytes], Linux only
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize()
+
+
+def _run(mode, cycles):
+    parameter_values = pybamm.ParameterValues(
+        Durdel2023_composite.get_OG_parameter_values()
+    )
+    experiment = pybamm.Experiment([CYCLE] * cycles)
+    model = composite_model()
+    baseline = _rss()
+    start = timeit.default_timer()
+    if mode == "full Solution":
+        sim = pybamm.Simulation(
+            model, parameter_values=parameter_values, experiment=experiment
+        )
+        solution = sim.solve()
+        end_voltage = solution.cycles[-1]["Voltage [V]"].entries[-1]
+    else:
+        result = run_simulation(
+            parameter_values, experiment=experiment, lean=mode == "lean"
+        )
+        end_voltage = result["Voltage [V]"][-1]
+    seconds = timeit.default_timer() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    print(
+        json.dumps(
+            {
+                "baseline": baseline,
+                "peak": peak,
+                "retained": _rss() - baseline,
+                "seconds": seconds,
+                "end voltage": float(end_voltage),
+            }
+        )
+    )
+
+
+def measure(mode, cycles):
+    """Memory [bytes] and time [s] of one run, in a fresh process."""
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", mode, str(cycles)],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(cycle_counts=(100, 1000)):
+    for cycles in cycle_counts:
+        # the full runs are only measured up to where they still fit comfortably
+        modes = MODES if cycles <= 100 else ["lean"]
+        for mode in modes:
+            run = measure(mode, cycles)
+            print(
+                f"{cycles:5d} cycles, {mode:14s} peak {run['peak'] / 2**20:7.0f} MiB "
+                f"(baseline {run['baseline'] / 2**20:4.0f} MiB, "
+                f"+{(run['peak'] - run['baseline']) / 2**20:6.0f} MiB solving, "
+                f"{run['retained'] / 2**20:6.0f} MiB still held), "
+                f"{run['seconds']:5.0f} s, end voltage {run['end voltage']:.4f} V",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        _run(sys.argv[2], int(sys.argv[3]))
+    else:
+        main([int(arg) for arg in sys.argv[1:]] or (100, 1000))
@@ -0,0 +1,88 @@
+"""
+Start-up cost of a sweep worker: building, parameterising and discretising the
+composite DFN, against loading it from model_cache.py, for each composite
+parameter set.
+
+Each measurement is a fresh process, as a pool worker would be: the first run
+fills a temporary cache, the next ones load from it. Run from the repository
+root::
+
+    python benchmarks/bench_model_cache.py [repeats]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PARAMETER_SETS = ["final", "test", "OG"]
+INPUT_NAMES = [
+    "Primary: Negative electrode active material volume fraction",
+    "Secondary: Negative electrode active material volume fraction",
+]
+
+
+def _run(parameter_set, directory):
+    # what sweep._init_worker does, timed from a cold start
+    start = timeit.default_timer()
+    import pybamm
+
+    from model_cache import ModelCache
+    from run_helpers import build_simulation
+    from sweep import get_parameter_values
+
+    imported = timeit.default_timer()
+    parameter_values = get_parameter_values(parameter_set)
+    cache = ModelCache(directory) if directory != "none" else None
+    sim = build_simulation(parameter_values, INPUT_NAMES, model_cache=cache)
+    built = timeit.default_timer()
+    pybamm.IDAKLUSolver().set_up(
+        sim.built_model, inputs={name: 0.375 for name in INPUT_NAMES}
+    )
+    set_up = timeit.default_timer()
+    print(
+        json.dumps(
+            {
+                "import": imported - start,
+                "build": built - imported,
+                "setup": set_up - built,
+            }
+        )
+    )
+
+
+def measure(parameter_set, directory):
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", parameter_set, directory],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(repeats=3):
+    with tempfile.TemporaryDirectory() as directory:
+        for parameter_set in PARAMETER_SETS:
+            measure(parameter_set, directory)  # fills the cache
+            for label, where in [("built", "none"), ("cached", directory)]:
+                runs = [measure(parameter_set, where) for _ in range(repeats)]
+                build = np.median([run["build"] for run in runs])
+                setup = np.median([run["setup"] for run in runs])
+                print(
+                    f"{parameter_set:6s} {label:7s} model {build * 1e3:6.0f} ms, "
+                    f"then solver set-up {setup * 1e3:5.0f} ms",
+                    flush=True,
+                )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        _run(sys.argv[2], sys.argv[3])
+    else:
+        main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,99 @@
+"""
+Solver cost of the conditioned Durdel2023 OCP tables: piecewise-linear vs PCHIP.
+
+Both variants use the sorted and merged tables of :func:`ocp_data.condition_table`
+(the raw silicon delithiation table cannot be interpolated at all). Run from the
+repository root::
+
+    python benchmarks/bench_ocp_conditioning.py
+"""
+import dataclasses
+import os
+import sys
+import timeit
+
+import numpy as np
+
+import pybamm
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Durdel2023_composite  # noqa: E402
+import Durdel2023_single  # noqa: E402
+import ocp_data  # noqa: E402
+from run_helpers import COMPOSITE_OPTIONS  # noqa: E402
+
+CASES = {
+    "single (final)": (Durdel2023_single.get_final_parameter_values, None),
+    "composite (test)": (
+        Durdel2023_composite.get_test_parameter_values,
+        COMPOSITE_OPTIONS,
+    ),
+}
+
+EXPERIMENT = pybamm.Experiment(
+    [
+        (
+            "Discharge at C/2 until 3.0 V",
+            "Rest for 1 hour",
+            "Charge at C/2 until 4.1 V",
+            "Rest for 1 hour",
+        )
+    ]
+)
+
+
+def use_interpolator(interpolator):
+    # switch the silicon and NCA tables, and drop the cached interpolants
+    for name in ["silicon_lith_ocp", "silicon_delith_ocp", "nca_lith_ocp", "nca_delith_ocp"]:
+        sto, volt, _, extrapolate = ocp_data.OCP_TABLES[name]
+        ocp_data.OCP_TABLES[name] = (sto, volt, interpolator, extrapolate)
+    ocp_data._prototype.cache_clear()
+
+
+def run(get_parameter_values, options):
+    sim = pybamm.Simulation(
+        pybamm.lithium_ion.DFN(options),
+        parameter_values=pybamm.ParameterValues(get_parameter_values()),
+        experiment=EXPERIMENT,
+    )
+    start = timeit.default_timer()
+    solution = sim.solve()
+    wall = timeit.default_timer() - start
+    steps = {}
+    for sub in solution.sub_solutions:
+        for key, value in dataclasses.asdict(sub.solver_statistics).items():
+            steps[key] = steps.get(key, 0) + value
+    voltage = solution["Time [s]"].entries, solution["Voltage [V]"].entries
+    return voltage, wall, steps
+
+
+def main():
+    for case, (get_parameter_values, options) in CASES.items():
+        voltages = {}
+        for interpolator in ["linear", "pchip"]:
+            use_interpolator(interpolator)
+            voltage, wall, steps = run(get_parameter_values, options)
+            voltages[interpolator] = voltage
+            print(
+                f"{case:18s} {interpolator:6s} wall {wall:6.2f} s, "
+                f"steps {steps['number_of_steps']}, "
+                f"error test failures {steps['number_of_error_test_failures']}, "
+                f"nonlinear fails {steps['number_of_nonlinear_solver_fails']}, "
+                f"linear setups {steps['number_of_linear_solver_setups']}"
+            )
+        t, V = voltages["pchip"]
+        t_linear, V_linear = voltages["linear"]
+        in_both = t <= t_linear[-1]
+        difference = np.abs(V[in_both] - np.interp(t[in_both], t_linear, V_linear))
+        # the steps switch at slightly different times, so the maximum sits on a
+        # step change; the median is the difference along the curves
+        print(
+            f"{case:18s} voltage difference median {np.median(difference) * 1e3:.2f} mV"
+            f" (max {difference.max() * 1e3:.0f} mV), "
+            f"end time {t[-1] - t_linear[-1]:+.0f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
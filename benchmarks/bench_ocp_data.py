@@ -0,0 +1,113 @@
+"""
+Cost of the Durdel2023 OCP functions and of processing a model with them.
+
+Compares the shared, cached tables of ocp_data.py with the previous behaviour of
+building the arrays and a fresh interpolant on every call. Run from the
+repository root::
+
+    python benchmarks/bench_ocp_data.py
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+
+import pybamm
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Durdel2023_composite  # noqa: E402
+import Durdel2023_single  # noqa: E402
+import ocp_data  # noqa: E402
+
+
+def _uncached(name):
+    # OCP function as it was: new arrays and a new interpolant per call
+    sto_data, volt_data, interpolator, extrapolate = ocp_data.OCP_TABLES[name]
+    sto_data, volt_data = sto_data.tolist(), volt_data.tolist()
+
+    def ocp(sto):
+        return pybamm.Interpolant(
+            np.array(sto_data),
+            np.array(volt_data),
+            sto,
+            name=name,
+            interpolator=interpolator,
+            extrapolate=extrapolate,
+        )
+
+    return ocp
+
+
+def _uncached_average(lithiation, delithiation):
+    return lambda sto: (lithiation(sto) + delithiation(sto)) / 2
+
+
+def _uncached_parameter_values(get_parameter_values):
+    parameter_values = get_parameter_values()
+    functions = {
+        Durdel2023_single.nca_ocp_average_Durdel2023: _uncached_average(
+            _uncached("nca_lith_ocp"), _uncached("nca_delith_ocp")
+        ),
+        Durdel2023_single.nca_ocp_lithiation_Durdel2023: _uncached("nca_lith_ocp"),
+        Durdel2023_single.nca_ocp_delithiation_Durdel2023: _uncached("nca_delith_ocp"),
+        Durdel2023_composite.graphite_ocp_Enertech_Ai2020: _uncached("graphite_ocp"),
+    }
+    return {
+        name: functions.get(value, value) if callable(value) else value
+        for name, value in parameter_values.items()
+    }
+
+
+def time_calls(ocp, number=2000):
+    sto = pybamm.StateVector(slice(0, 10))
+    return min(timeit.repeat(lambda: ocp(sto), number=number, repeat=3)) / number
+
+
+def time_processing(get_values, options, repeat=7):
+    model = pybamm.lithium_ion.DFN(options)
+    return min(
+        timeit.repeat(
+            lambda: pybamm.ParameterValues(get_values()).process_model(
+                model, inplace=False
+            ),
+            number=1,
+            repeat=repeat,
+        )
+    )
+
+
+def main():
+    print("per call [us]               uncached   cached")
+    calls = {
+        "nca_ocp_average_Durdel2023": (
+            _uncached_average(_uncached("nca_lith_ocp"), _uncached("nca_delith_ocp")),
+            Durdel2023_single.nca_ocp_average_Durdel2023,
+        ),
+        "graphite_ocp_Enertech_Ai2020": (
+            _uncached("graphite_ocp"),
+            Durdel2023_composite.graphite_ocp_Enertech_Ai2020,
+        ),
+    }
+    for name, (before, after) in calls.items():
+        print(
+            f"{name:28s} {time_calls(before) * 1e6:8.1f} {time_calls(after) * 1e6:8.1f}"
+        )
+
+    print("process_model [ms]          uncached   cached")
+    composite = {"particle phases": ("2", "1")}
+    for name, get_values in {
+        "composite OG": Durdel2023_composite.get_OG_parameter_values,
+        "composite final": Durdel2023_composite.get_final_parameter_values,
+    }.items():
+        before = time_processing(
+            lambda get_values=get_values: _uncached_parameter_values(get_values),
+            composite,
+        )
+        after = time_processing(get_values, composite)
+        print(f"{name:28s} {before * 1e3:8.1f} {after * 1e3:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
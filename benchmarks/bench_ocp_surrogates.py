@@ -0,0 +1,97 @@
+"""
+Tabulated Durdel2023 OCPs vs their analytic surrogates: error bound per table, and
+solve cost and voltage difference of a C/2 cycle with each.
+
+Run from the repository root::
+
+    python benchmarks/bench_ocp_surrogates.py
+"""
+import dataclasses
+import os
+import sys
+import timeit
+
+import numpy as np
+
+import pybamm
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Durdel2023_composite  # noqa: E402
+import Durdel2023_single  # noqa: E402
+import ocp_data  # noqa: E402
+from run_helpers import COMPOSITE_OPTIONS  # noqa: E402
+
+CASES = {
+    "single (final)": (Durdel2023_single.get_final_parameter_values, None),
+    "composite (test)": (
+        Durdel2023_composite.get_test_parameter_values,
+        COMPOSITE_OPTIONS,
+    ),
+}
+
+EXPERIMENT = pybamm.Experiment(
+    [
+        (
+            "Discharge at C/2 until 3.0 V",
+            "Rest for 1 hour",
+            "Charge at C/2 until 4.1 V",
+            "Rest for 1 hour",
+        )
+    ]
+)
+
+
+def run(parameter_values, options):
+    sim = pybamm.Simulation(
+        pybamm.lithium_ion.DFN(options),
+        parameter_values=parameter_values,
+        experiment=EXPERIMENT,
+    )
+    start = timeit.default_timer()
+    solution = sim.solve()
+    wall = timeit.default_timer() - start
+    steps = sum(
+        dataclasses.asdict(sub.solver_statistics)["number_of_steps"]
+        for sub in solution.sub_solutions
+    )
+    voltage = solution["Time [s]"].entries, solution["Voltage [V]"].entries
+    return voltage, wall, steps
+
+
+def main():
+    print("surrogate             tanh terms  range            max error [mV]")
+    for name, surrogate in ocp_data.OCP_SURROGATES.items():
+        low, high = surrogate["range"]
+        print(
+            f"  {name:20s} {len(surrogate['tanh']):4d}       [{low:.3f}, {high:.3f}]"
+            f"   {surrogate['max_error'] * 1e3:6.2f}"
+            + (
+                " (above tolerance, table kept)"
+                if surrogate["max_error"] > surrogate["tolerance"]
+                else ""
+            )
+        )
+
+    for case, (get_parameter_values, options) in CASES.items():
+        voltages = {}
+        for ocp in ["table", "surrogate"]:
+            parameter_values = ocp_data.select_ocp(get_parameter_values(), ocp)
+            run(parameter_values, options)  # warm up
+            voltage, wall, steps = run(parameter_values, options)
+            voltages[ocp] = voltage
+            print(f"{case:18s} {ocp:9s} wall {wall:6.2f} s, steps {steps}")
+        t, V = voltages["surrogate"]
+        t_table, V_table = voltages["table"]
+        in_both = t <= t_table[-1]
+        difference = np.abs(V[in_both] - np.interp(t[in_both], t_table, V_table))
+        # as in bench_ocp_conditioning.py, the maximum sits on a shifted step change
+        print(
+            f"{case:18s} voltage difference median {np.median(difference) * 1e3:.2f} mV"
+            f" (max {difference.max() * 1e3:.0f} mV), "
+            f"end time {t[-1] - t_table[-1]:+.0f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Cost of handing out a parameter set per run: the dict of the set, a
+:class:`pybamm.ParameterValues` built from it, ``ParameterValues.copy``, and the
+cached set of parameter_sets.py and its copies.
+
+Run from the repository root::
+
+    python benchmarks/bench_parameter_sets.py [points]
+"""
+import os
+import sys
+import timeit
+
+import pybamm
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Durdel2023_composite  # noqa: E402
+import parameter_sets  # noqa: E402
+
+OVERRIDE = {"Current function [A]": 0.0029}
+
+
+def _clone_and_update(copy):
+    def clone(parameter_values):
+        point_values = copy(parameter_values)
+        point_values.update(OVERRIDE)
+        return point_values
+
+    return clone
+
+
+def main(points=10000):
+    base = pybamm.ParameterValues(Durdel2023_composite.get_final_parameter_values())
+    cases = {
+        "dict (get_final_parameter_values)": (
+            Durdel2023_composite.get_final_parameter_values
+        ),
+        "ParameterValues(dict)": lambda: pybamm.ParameterValues(
+            Durdel2023_composite.get_final_parameter_values()
+        ),
+        "parameter_sets.parameter_values": lambda: parameter_sets.parameter_values(
+            "final"
+        ),
+        "sweep point, ParameterValues.copy + update": lambda: _clone_and_update(
+            pybamm.ParameterValues.copy
+        )(base),
+        "sweep point, copy_parameter_values + update": lambda: _clone_and_update(
+            parameter_sets.copy_parameter_values
+        )(base),
+    }
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=points, repeat=3))
+        print(
+            f"{name:45s} {seconds / points * 1e6:8.1f} us per call, "
+            f"{seconds:6.3f} s per {points} points",
+            flush=True,
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,131 @@
+"""
+Horner forms of the Mark2016 silicon and Kim2011 NCA OCPs vs the expanded sums of
+powers they replace: equivalence, expression size, and residual/Jacobian
+evaluation cost of the composite DFN with the "final" parameter set.
+
+Run from the repository root::
+
+    python benchmarks/bench_polynomial_ocp.py
+"""
+import os
+import sys
+import timeit
+
+import casadi
+import numpy as np
+
+import pybamm
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Durdel2023_composite as D  # noqa: E402
+from run_helpers import COMPOSITE_OPTIONS  # noqa: E402
+
+
+def _powers(coefficients, sto):
+    # the previous form: one sto**k term per coefficient
+    degree = len(coefficients) - 1
+    result = coefficients[-1]
+    for k, coefficient in enumerate(coefficients[:-1]):
+        result = result + coefficient * sto ** (degree - k)
+    return result
+
+
+def expanded_silicon_lithiation(sto):
+    return _powers(D.SILICON_LITHIATION_Mark2016, sto)
+
+
+def expanded_silicon_delithiation(sto):
+    return _powers(D.SILICON_DELITHIATION_Mark2016, sto)
+
+
+def expanded_silicon_average(sto):
+    return (expanded_silicon_lithiation(sto) + expanded_silicon_delithiation(sto)) / 2
+
+
+def expanded_nca(sto):
+    return _powers(D.NCA_Kim2011, sto) - 0.61386 * np.exp(5.8201 * sto**136.4)
+
+
+PAIRS = {
+    "silicon lithiation": (
+        expanded_silicon_lithiation,
+        D.silicon_ocp_lithiation_Mark2016,
+    ),
+    "silicon delithiation": (
+        expanded_silicon_delithiation,
+        D.silicon_ocp_delithiation_Mark2016,
+    ),
+    "silicon average": (expanded_silicon_average, D.silicon_ocp_average_Mark2016),
+    "NCA": (expanded_nca, D.nca_ocp_Kim2011),
+}
+
+
+def count_nodes(symbol):
+    return len(list(symbol.pre_order()))
+
+
+def residual_and_jacobian(parameter_values):
+    sim = pybamm.Simulation(
+        pybamm.lithium_ion.DFN(COMPOSITE_OPTIONS), parameter_values=parameter_values
+    )
+    sim.build()
+    model = sim.built_model
+    t = casadi.MX.sym("t")
+    y = casadi.MX.sym("y", model.len_rhs_and_alg)
+    residual = casadi.vertcat(
+        model.concatenated_rhs.to_casadi(t, y),
+        model.concatenated_algebraic.to_casadi(t, y),
+    )
+    f = casadi.Function("residual", [t, y], [residual])
+    jac = casadi.Function("jacobian", [t, y], [casadi.jacobian(residual, y)])
+    y0 = model.concatenated_initial_conditions.evaluate()
+    return f, jac, y0
+
+
+def main():
+    sto = np.linspace(0, 1, 100001)
+    print("max |Horner - expanded| on sto in [0, 1], and nodes per expression")
+    for name, (expanded, horner) in PAIRS.items():
+        error = np.max(np.abs(horner(sto) - expanded(sto)))
+        assert error < 1e-12, (name, error)
+        x = pybamm.StateVector(slice(0, 10))
+        print(
+            f"  {name:22s} {error:.1e}   "
+            f"{count_nodes(expanded(x)):3d} -> {count_nodes(horner(x)):3d}"
+        )
+
+    functions = {}
+    for variant, index in [("expanded", 0), ("Horner", 1)]:
+        parameter_values = pybamm.ParameterValues(D.get_final_parameter_values())
+        parameter_values.update(
+            {
+                name: PAIRS[pair][index]
+                for name, pair in [
+                    ("Secondary: Negative electrode lithiation OCP [V]", "silicon lithiation"),
+                    (
+                        "Secondary: Negative electrode delithiation OCP [V]",
+                        "silicon delithiation",
+                    ),
+                    ("Secondary: Negative electrode OCP [V]", "silicon average"),
+                    ("Positive electrode OCP [V]", "NCA"),
+                ]
+            }
+        )
+        functions[variant] = residual_and_jacobian(parameter_values)
+
+    print("composite DFN, final parameters   expanded     Horner")
+    (f0, jac0, y0), (f1, jac1, _) = functions["expanded"], functions["Horner"]
+    for name, (a, b) in {"residual": (f0, f1), "Jacobian": (jac0, jac1)}.items():
+        times = [
+            min(timeit.repeat(lambda g=g: g(0, y0), number=200, repeat=5)) / 200
+            for g in (a, b)
+        ]
+        print(f"  {name:8s} instructions       {a.n_instructions():9d}  {b.n_instructions():9d}")
+        print(f"  {name:8s} evaluation [us]    {times[0] * 1e6:9.1f}  {times[1] * 1e6:9.1f}")
+    difference = np.max(np.abs(np.array(f0(0, y0)) - np.array(f1(0, y0))))
+    print(f"  max residual difference at y0    {difference:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Memory held by the results of a multi-temperature GITT campaign: full Solutions
+(as the notebook used to keep), compact dicts of arrays (gitt.run_gitt_fast), and
+the columnar store of results_store.py, streamed and memory-mapped back.
+
+Memory is the Python heap traced by tracemalloc in this process, the solves
+running in two worker processes. Run from the repository root::
+
+    python benchmarks/bench_results_store.py [temperatures] [pulses]
+"""
+import gc
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+import numpy as np
+
+import pybamm
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gitt  # noqa: E402
+from results_store import ResultsWriter  # noqa: E402
+
+
+def traced(function):
+    """(result, retained bytes, peak bytes, seconds) of ``function()``."""
+    gc.collect()
+    tracemalloc.start()
+    start = timeit.default_timer()
+    result = function()
+    seconds = timeit.default_timer() - start
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained, peak, seconds
+
+
+def full_solution(temperature, pulses):
+    # one temperature as the notebook ran it: a GITT experiment kept as a Solution
+    sim = pybamm.Simulation(
+        pybamm.lithium_ion.DFN(gitt.GITT_OPTIONS),
+        parameter_values=gitt.temperature_parameter_values(),
+        experiment=gitt.gitt_experiment(cycles=pulses),
+    )
+    solution = sim.solve(inputs={gitt.TEMPERATURE_INPUT: temperature})
+    for name in gitt.GITT_OUTPUT_VARIABLES:
+        solution[name].entries  # the notebook plots these, which caches them
+    return solution
+
+
+def main(n_temperatures=21, pulses=100):
+    temperatures = np.linspace(273.15, 313.15, n_temperatures)
+    print(f"{n_temperatures} temperatures, {pulses} pulses")
+
+    _, retained, peak, seconds = traced(lambda: full_solution(298.15, pulses))
+    print(
+        f"full Solution, one temperature:  retained {retained / 2**20:8.1f} MiB "
+        f"(x{n_temperatures} = {retained * n_temperatures / 2**30:.2f} GiB), "
+        f"{seconds:.0f} s"
+    )
+
+    results, retained, peak, seconds = traced(
+        lambda: gitt.run_gitt_fast(temperatures, pulses=pulses, processes=2)
+    )
+    print(
+        f"dicts of arrays:                 retained {retained / 2**20:8.2f} MiB, "
+        f"peak {peak / 2**20:8.2f} MiB, {seconds:.0f} s"
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "gitt.results")
+        store, retained, peak, seconds = traced(
+            lambda: gitt.run_gitt_fast(
+                temperatures,
+                pulses=pulses,
+                processes=2,
+                store=ResultsWriter(path, np.float32),
+            )
+        )
+        size = sum(entry.stat().st_size for entry in os.scandir(path))
+        print(
+            f"float32 store:                   retained {retained / 2**20:8.2f} MiB, "
+            f"peak {peak / 2**20:8.2f} MiB, {seconds:.0f} s, "
+            f"{size / 2**20:.2f} MiB on disk"
+        )
+        # same values, through the memory map
+        ocv = gitt.extract_ocv_points(store)["OCV [V]"]
+        reference = gitt.extract_ocv_points(results)["OCV [V]"]
+        print(f"max OCV difference, float32 store vs arrays: {np.nanmax(abs(ocv - reference)):.1e} V")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
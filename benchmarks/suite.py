@@ -0,0 +1,349 @@
+"""
+Benchmark suite: every shipped parameter set, model and protocol, timed phase by
+phase, with a machine-readable history and a regression check.
+
+Each model benchmark goes through the steps of :meth:`pybamm.Simulation.solve`
+one at a time and times them as separate phases:
+
+    build        model construction, e.g. ``pybamm.lithium_ion.DFN(options)``
+    parameters   the parameter-set function, and processing of model and geometry
+    discretise   mesh and discretisation
+    setup        solver set-up (casadi functions, Jacobian, initial conditions)
+    solve        integration
+
+The parameter-set functions and the OCP and property functions (on arrays of
+:data:`ARRAY_SIZE` points) are timed on their own as well. Each phase is the
+fastest of ``--repeat`` runs. Runs are appended to a JSON Lines history, one
+record per run, and ``compare`` flags phases that got slower than the threshold.
+The history is kept out of the repository, in
+~/.cache/LiSi/benchmark_history.jsonl, or the path in the LISI_BENCHMARK_HISTORY
+environment variable or ``--history``.
+
+Run from the repository root::
+
+    python benchmarks/suite.py run [--repeat 3] [--filter composite]
+    python benchmarks/suite.py compare [--threshold 0.1] [BASE [HEAD]]
+
+BASE and HEAD are history indices (default -2 and -1) or commit prefixes.
+``compare`` exits with status 1 when it finds a regression.
+"""
+import argparse
+import datetime
+import inspect
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import timeit
+from contextlib import contextmanager
+
+import numpy as np
+
+import pybamm
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import Durdel2023_composite  # noqa: E402
+import Durdel2023_single  # noqa: E402
+import gitt  # noqa: E402
+from run_helpers import COMPOSITE_OPTIONS  # noqa: E402
+
+HISTORY = os.environ.get("LISI_BENCHMARK_HISTORY") or os.path.join(
+    os.path.expanduser("~"), ".cache", "LiSi", "benchmark_history.jsonl"
+)
+
+# Points per array argument in the function benchmarks
+ARRAY_SIZE = 1_000_000
+
+PARAMETER_SETS = {
+    "single final": Durdel2023_single.get_final_parameter_values,
+    "single test": Durdel2023_single.get_test_parameter_values,
+    "composite final": Durdel2023_composite.get_final_parameter_values,
+    "composite test": Durdel2023_composite.get_test_parameter_values,
+    "composite OG": Durdel2023_composite.get_OG_parameter_values,
+}
+
+# Arrays passed to the property functions, by argument name
+ARGUMENTS = {
+    "sto": np.linspace(0.001, 0.999, ARRAY_SIZE),
+    "c_e": np.linspace(100, 3000, ARRAY_SIZE),
+    "c_s_surf": np.linspace(100, 25000, ARRAY_SIZE),
+    "c_s_max": 30000.0,
+    "T": np.linspace(258.15, 328.15, ARRAY_SIZE),
+}
+
+
+@contextmanager
+def timer(times, phase):
+    start = timeit.default_timer()
+    yield
+    times[phase] = timeit.default_timer() - start
+
+
+def time_pipeline(options, get_parameter_values, t_eval, inputs=None, setup=None):
+    """
+    Phase timings of one DFN run, see the module docstring.
+
+    ``setup`` is called on the fresh :class:`pybamm.ParameterValues` before the
+    model is processed, e.g. to compile a current protocol into it.
+    """
+    times = {}
+    with timer(times, "build"):
+        model = pybamm.lithium_ion.DFN(options)
+    with timer(times, "parameters"):
+        parameter_values = pybamm.ParameterValues(get_parameter_values())
+        if setup is not None:
+            setup(parameter_values)
+        geometry = model.default_geometry
+        parameter_values.process_model(model)
+        parameter_values.process_geometry(geometry)
+    with timer(times, "discretise"):
+        mesh = pybamm.Mesh(geometry, model.default_submesh_types, model.default_var_pts)
+        disc = pybamm.Discretisation(mesh, model.default_spatial_methods)
+        disc.process_model(model)
+    try:
+        solution = pybamm.IDAKLUSolver().solve(model, t_eval, inputs=inputs)
+    except pybamm.SolverError as error:
+        # keep the phases that ran; the missing ones are skipped by compare
+        print(f"  solve failed: {error}", flush=True)
+        return times
+    # the solver times its own set-up and integration
+    times["setup"] = solution.set_up_time.value
+    times["solve"] = solution.solve_time.value
+    return times
+
+
+def _gitt_parameter_values():
+    return gitt.temperature_parameter_values()
+
+
+def _compile_gitt(parameter_values):
+    gitt.gitt_pulse_protocol(parameter_values, pulses=10)
+
+
+MODELS = {
+    "single DFN (final)": lambda: time_pipeline(
+        None, Durdel2023_single.get_final_parameter_values, [0, 20000]
+    ),
+    "composite DFN (final)": lambda: time_pipeline(
+        COMPOSITE_OPTIONS, Durdel2023_composite.get_final_parameter_values, [0, 20000]
+    ),
+    "composite DFN (test)": lambda: time_pipeline(
+        COMPOSITE_OPTIONS, Durdel2023_composite.get_test_parameter_values, [0, 5000]
+    ),
+    "composite DFN (OG)": lambda: time_pipeline(
+        COMPOSITE_OPTIONS, Durdel2023_composite.get_OG_parameter_values, [0, 5000]
+    ),
+    "GITT, 10 pulses": lambda: time_pipeline(
+        gitt.GITT_OPTIONS,
+        _gitt_parameter_values,
+        [0, 10 * (360 + 9000)],
+        inputs={gitt.TEMPERATURE_INPUT: 298.15},
+        setup=_compile_gitt,
+    ),
+}
+
+
+def _functions():
+    # every distinct function of the shipped parameter sets
+    functions = {}
+    for get_parameter_values in PARAMETER_SETS.values():
+        for value in get_parameter_values().values():
+            if callable(value):
+                functions.setdefault(f"{value.__module__}.{value.__name__}", value)
+    return dict(sorted(functions.items()))
+
+
+def time_function(function):
+    """Time of one call of ``function`` on arrays of :data:`ARRAY_SIZE` points."""
+    names = inspect.signature(function).parameters
+    arguments = [ARGUMENTS[name] for name in names]
+    if getattr(function, "ocp_tables", None):
+        # tabulated functions build an interpolant; evaluate it on the arrays
+        children = [
+            pybamm.StateVector(slice(i * ARRAY_SIZE, (i + 1) * ARRAY_SIZE))
+            for i in range(len(names))
+        ]
+        symbol = function(*children)
+        y = np.concatenate([np.broadcast_to(a, ARRAY_SIZE) for a in arguments])
+        start = timeit.default_timer()
+        symbol.evaluate(y=y)
+        return {"evaluate": timeit.default_timer() - start}
+    start = timeit.default_timer()
+    function(*arguments)
+    return {"evaluate": timeit.default_timer() - start}
+
+
+def benchmarks():
+    """Name -> callable returning ``{phase: seconds}``, for every benchmark."""
+    cases = {}
+    for name, get_parameter_values in PARAMETER_SETS.items():
+        cases[f"parameter set: {name}"] = (
+            lambda f=get_parameter_values: _time_call(f)
+        )
+    for name, function in _functions().items():
+        cases[f"function: {name}"] = lambda f=function: time_function(f)
+    for name, run in MODELS.items():
+        cases[f"model: {name}"] = run
+    return cases
+
+
+def _time_call(function):
+    start = timeit.default_timer()
+    function()
+    return {"call": timeit.default_timer() - start}
+
+
+def run_suite(pattern=None, repeat=3):
+    """
+    Run the benchmarks whose name matches the regular expression ``pattern``.
+
+    Returns
+    -------
+    dict
+        Benchmark name -> phase -> fastest time of ``repeat`` runs [s]
+    """
+    results = {}
+    for name, run in benchmarks().items():
+        if pattern and not re.search(pattern, name):
+            continue
+        runs = [run() for _ in range(repeat)]
+        results[name] = {
+            phase: min(r[phase] for r in runs if phase in r) for phase in runs[0]
+        }
+        phases = ", ".join(f"{p} {t:.4g}" for p, t in results[name].items())
+        print(f"{name}: {phases}", flush=True)
+    return results
+
+
+def _commit():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("+dirty" if dirty else "")
+
+
+def append_history(results, history=HISTORY, repeat=None):
+    """Append one run to the JSON Lines ``history`` and return the record."""
+    record = {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "machine": platform.node(),
+        "python": platform.python_version(),
+        "pybamm": pybamm.__version__,
+        "repeat": repeat,
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(history)), exist_ok=True)
+    with open(history, "a") as f:
+        f.write(json.dumps(record) + "\n")
+    return record
+
+
+def load_history(history=HISTORY):
+    with open(history) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _find(records, key):
+    try:
+        return records[int(key)]
+    except ValueError:
+        matches = [r for r in records if (r["commit"] or "").startswith(key)]
+        if not matches:
+            raise KeyError(f"no run of commit {key!r} in the history") from None
+        return matches[-1]
+
+
+def compare(base, head, threshold=0.1, min_time=1e-3):
+    """
+    Phases of ``head`` slower than in ``base`` by more than ``threshold``
+    (relative) and ``min_time`` (absolute, [s], to ignore timer noise).
+
+    Returns
+    -------
+    list of tuple
+        (benchmark, phase, base time, head time) for every regression
+    """
+    regressions = []
+    for name, phases in head["results"].items():
+        for phase, time in phases.items():
+            before = base["results"].get(name, {}).get(phase)
+            if before is None:
+                continue
+            if time > before * (1 + threshold) and time - before > min_time:
+                regressions.append((name, phase, before, time))
+    return regressions
+
+
+def print_comparison(base, head, threshold, min_time):
+    regressions = {(n, p) for n, p, _, _ in compare(base, head, threshold, min_time)}
+    print(f"base {base['commit']} ({base['date']}), head {head['commit']} ({head['date']})")
+    for name, phases in head["results"].items():
+        for phase, time in phases.items():
+            before = base["results"].get(name, {}).get(phase)
+            if before is None:
+                print(f"  {name} [{phase}]: {time:.4g} s (new)")
+                continue
+            flag = "  REGRESSION" if (name, phase) in regressions else ""
+            print(
+                f"  {name} [{phase}]: {before:.4g} -> {time:.4g} s "
+                f"({time / before - 1:+.0%}){flag}"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--history", default=HISTORY)
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="run the suite and append it to the history")
+    run.add_argument("--filter", help="regular expression on the benchmark names")
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--list", action="store_true", help="only list the benchmarks")
+    check = commands.add_parser("compare", help="compare two runs of the history")
+    check.add_argument("base", nargs="?", default="-2")
+    check.add_argument("head", nargs="?", default="-1")
+    check.add_argument("--threshold", type=float, default=0.1)
+    check.add_argument("--min-time", type=float, default=1e-3, help="[s]")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        if args.list:
+            print("\n".join(benchmarks()))
+            return
+        results = run_suite(args.filter, args.repeat)
+        append_history(results, args.history, args.repeat)
+        print(f"appended to {args.history}")
+        return
+
+    records = load_history(args.history)
+    try:
+        base, head = _find(records, args.base), _find(records, args.head)
+    except (IndexError, KeyError) as error:
+        parser.error(f"{args.base} or {args.head}: {error}")
+    regressions = print_comparison(base, head, args.threshold, args.min_time)
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
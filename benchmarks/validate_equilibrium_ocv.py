@@ -0,0 +1,71 @@
+"""
+Equilibrium OCV engine vs the notebook's C/100 DFN discharge (ORegan2022,
+lumped thermal), at a few temperatures.
+
+Run from the repository root::
+
+    python benchmarks/validate_equilibrium_ocv.py
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+
+import pybamm
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from equilibrium_ocv import equilibrium_ocv  # noqa: E402
+from gitt import (  # noqa: E402
+    GITT_PARAMETER_SET,
+    ocv_experiment,
+    run_gitt,
+)
+
+
+def main(temperatures=(273.15, 298.15, 313.15)):
+    start = timeit.default_timer()
+    slow = run_gitt(temperatures, experiment=ocv_experiment())
+    t_dfn = timeit.default_timer() - start
+
+    start = timeit.default_timer()
+    ocv = equilibrium_ocv(
+        pybamm.ParameterValues(GITT_PARAMETER_SET),
+        temperatures,
+        initial_soc=1.0,
+        n_points=5000,
+    )
+    t_equilibrium = timeit.default_timer() - start
+
+    print(f"C/100 DFN:   {t_dfn:.1f} s")
+    print(f"equilibrium: {1000 * t_equilibrium:.1f} ms")
+    for i, result in enumerate(slow):
+        # both start from the same initial state, so compare at equal discharge
+        # capacity; the equilibrium curve stops at the cut-offs (NaN outside)
+        v_eq = np.interp(
+            result["Discharge capacity [A.h]"],
+            ocv["Discharge capacity [A.h]"],
+            ocv["OCV [V]"][i],
+            left=np.nan,
+            right=np.nan,
+        )
+        error = np.abs(result["Terminal voltage [V]"] - v_eq)
+        # skip the first hour (the DFN relaxes from its initial state) and the
+        # knee below 3 V, where the curves are too steep to compare
+        body = (
+            (result["Time [s]"] > 3600)
+            & (result["Terminal voltage [V]"] > 3.0)
+            & np.isfinite(error)
+        )
+        print(
+            f"T = {result['Temperature [K]']:.2f} K: "
+            f"median {1000 * np.median(error[body]):.1f} mV, "
+            f"max {1000 * np.max(error[body]):.1f} mV over the body of the curve, "
+            f"max {1000 * np.nanmax(error):.0f} mV overall "
+            "(C/100 overpotential included)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,146 +4,158 @@ import matplotlib.pyplot as plt
 from matplotlib import style
 import pybamm
 
+from model_cache import ModelCache
+from profiling import Profiler
+from results_store import ResultsWriter
+from run_helpers import COMPOSITE_OPTIONS
+from solution_cache import SolutionCache
+from sweep import run_sweep, silicon_fraction_grid
+
 style.use("ggplot")
 
-start = timeit.default_timer()
-model = pybamm.lithium_ion.DFN(
-    {"particle phases": ("2", "1"),
-     "open-circuit potential": (("single", "current sigmoid"), "single"),
-    }
-)
-
-param = pybamm.ParameterValues("Chen2020_composite")
-
-param.update({"Upper voltage cut-off [V]": 4.5})
-param.update({"Lower voltage cut-off [V]": 2.5})
-
-param.update(
-    {
-        "Primary: Maximum concentration in negative electrode [mol.m-3]": 28700,
-        "Primary: Initial concentration in negative electrode [mol.m-3]": 23000,
-        "Primary: Negative particle diffusivity [m2.s-1]": 5.5e-14,
-        "Secondary: Negative particle diffusivity [m2.s-1]": 1.67e-14,
-        "Secondary: Initial concentration in negative electrode [mol.m-3]": 277000,
-        "Secondary: Maximum concentration in negative electrode [mol.m-3]": 278000,
-    }
-)
-
-C_rate = 0.5
-capacity = param["Nominal cell capacity [A.h]"]
-I_load = C_rate * capacity
-
-t_eval = [0, 10000]
-
-param["Current function [A]"] = I_load
-
-v_si = [0.001, 0.04, 0.1]
-total_am_volume_fraction = 0.75
-solution = []  
-
-for v in v_si:
-    param.update(
-        {
-            "Primary: Negative electrode active material volume fraction": (1 - v)
-            * total_am_volume_fraction,  # primary
-            "Secondary: Negative electrode active material volume fraction": v
-            * total_am_volume_fraction,
-        }
-    )
-    print(v)
-    sim = pybamm.Simulation(
-        model,
-        parameter_values=param,
-    )
-    solution.append(sim.solve(t_eval=t_eval))
-stop = timeit.default_timer()
-print("running time: " + str(stop - start) + "s")
-
-
-
-ltype = ["k-", "r--", "b-.", "g:", "m-", "c--", "y-."]
-for i in range(0, len(v_si)):
-    t_i = solution[i]["Time [s]"].entries / 3600
-    V_i = solution[i]["Voltage [V]"].entries
-    plt.plot(t_i, V_i, ltype[i], label="$V_\mathrm{si}=$" + str(v_si[i]))
-plt.xlabel("Time [h]")
-plt.ylabel("Voltage [V]")
-plt.legend()
-plt.savefig("composite_ocvs.png")
-
-plt.figure()
-for i in range (0, len(v_si)):
-    t_i = solution[i]["Time [s]"].entries / 3600
-    OCP_i = solution[i]["X-averaged negative electrode primary open-circuit potential [V]"].entries
-    plt.plot(t_i, OCP_i, ltype[i], label="$V_\mathrm{si}=$" + str(v_si[i]))
-plt.xlabel("Time [h]")
-plt.ylabel("OCP [V]")
-plt.legend()
-plt.title("Graphite")
-plt.savefig("graphite_ocp.png")
-
-plt.figure()
-for i in range (0, len(v_si)):
-    t_i = solution[i]["Time [s]"].entries / 3600
-    OCP_i = solution[i]["X-averaged negative electrode secondary open-circuit potential [V]"].entries
-    plt.plot(t_i, OCP_i, ltype[i], label="$V_\mathrm{si}=$" + str(v_si[i]))
-plt.xlabel("Time [h]")
-plt.ylabel("OCP [V]")
-plt.legend()
-plt.title("Silicon")
-plt.savefig("silicon_ocp.png")
-
-plt.figure()
-for i in range (0, len(v_si)):
-    t_i = solution[i]["Time [s]"].entries / 3600
-    OCP_i = solution[i]["X-averaged positive electrode open-circuit potential [V]"].entries
-    plt.plot(t_i, OCP_i, ltype[i], label="$V_\mathrm{si}=$" + str(v_si[i]))
-plt.xlabel("Time [h]")
-plt.ylabel("OCP [V]")
-plt.legend()
-plt.title("NMC811")
-plt.savefig("NMC_ocp.png")
-
-#Cycling
-
-experiment = pybamm.Experiment(
-    [
-        (
-            "Discharge at C/2 until 3.0 V",
-            "Rest for 1 hour",
-            "Charge at C/2 until 4.2 V",
-            "Rest for 1 hour",
-        ),
-    ]
-)
-
-
-solution = []
-for v in v_si:
-    param.update(
-        {
-            "Primary: Negative electrode active material volume fraction": (1 - v)
-            * total_am_volume_fraction,  # primary
-            "Secondary: Negative electrode active material volume fraction": v
-            * total_am_volume_fraction,
-        }
-    )
-    print(v)
-    sim = pybamm.Simulation(
-        model,
-        experiment=experiment,
-        parameter_values=param,
-    )
-    solution.append(sim.solve())
-stop = timeit.default_timer()
-print("running time: " + str(stop - start) + "s")
-
-plt.figure()
-for i in range(0, len(v_si)):
-    t_i = solution[i]["Time [s]"].entries / 3600
-    V_i = solution[i]["Voltage [V]"].entries
-    plt.plot(t_i, V_i, ltype[i], label="$V_\mathrm{si}=$" + str(v_si[i]))
-plt.xlabel("Time [h]")
-plt.ylabel("Voltage [V]")
-plt.legend()
-plt.savefig("composite_cycling_ocvs.png")
+# Set to True to time every phase of the runs (model build, parameters,
+# discretisation, solver set-up, integration) into composite_example.profile.json
+# and .folded, see profiling.py. The points are then solved in this process,
+# without the cache.
+PROFILE = False
+
+if __name__ == "__main__":
+    profiler = Profiler("composite_example.profile.json", enabled=PROFILE)
+    profiler.start()
+    try:
+        start = timeit.default_timer()
+
+        param = pybamm.ParameterValues("Chen2020_composite")
+
+        param.update({"Upper voltage cut-off [V]": 4.5})
+        param.update({"Lower voltage cut-off [V]": 2.5})
+
+        param.update(
+            {
+                "Primary: Maximum concentration in negative electrode [mol.m-3]": 28700,
+                "Primary: Initial concentration in negative electrode [mol.m-3]": 23000,
+                "Primary: Negative particle diffusivity [m2.s-1]": 5.5e-14,
+                "Secondary: Negative particle diffusivity [m2.s-1]": 1.67e-14,
+                "Secondary: Initial concentration in negative electrode [mol.m-3]": 277000,
+                "Secondary: Maximum concentration in negative electrode [mol.m-3]": 278000,
+            }
+        )
+
+        C_rate = 0.5
+        capacity = param["Nominal cell capacity [A.h]"]
+        I_load = C_rate * capacity
+
+        t_eval = [0, 10000]
+
+        param["Current function [A]"] = I_load
+
+        v_si = [0.001, 0.04, 0.1]
+        total_am_volume_fraction = 0.75
+        # one point per silicon fraction, solved in parallel (processes=None uses every core)
+        overrides = silicon_fraction_grid(v_si, total_am_volume_fraction)
+
+        # the volume fractions are runtime inputs, so each worker builds the model once
+        solution = run_sweep(
+            param,
+            overrides,
+            t_eval=t_eval,
+            options=COMPOSITE_OPTIONS,
+            processes=1 if PROFILE else None,
+            inputs=True,
+            # reruns load the results instead of solving
+            cache=None if PROFILE else SolutionCache(),
+            # workers load the discretised model instead of building it
+            model_cache=None if PROFILE else ModelCache(),
+            # the plotted variables only, streamed to disk and memory-mapped back
+            store=ResultsWriter("composite_example_discharge.results"),
+        )
+        stop = timeit.default_timer()
+        print("running time: " + str(stop - start) + "s")
+
+
+
+        ltype = ["k-", "r--", "b-.", "g:", "m-", "c--", "y-."]
+        for i in range(0, len(v_si)):
+            t_i = solution[i]["Time [s]"] / 3600
+            V_i = solution[i]["Voltage [V]"]
+            plt.plot(t_i, V_i, ltype[i], label="$V_\mathrm{si}=$" + str(v_si[i]))
+        plt.xlabel("Time [h]")
+        plt.ylabel("Voltage [V]")
+        plt.legend()
+        plt.savefig("composite_ocvs.png")
+
+        plt.figure()
+        for i in range (0, len(v_si)):
+            t_i = solution[i]["Time [s]"] / 3600
+            OCP_i = solution[i]["X-averaged negative electrode primary open-circuit potential [V]"]
+            plt.plot(t_i, OCP_i, ltype[i], label="$V_\mathrm{si}=$" + str(v_si[i]))
+        plt.xlabel("Time [h]")
+        plt.ylabel("OCP [V]")
+        plt.legend()
+        plt.title("Graphite")
+        plt.savefig("graphite_ocp.png")
+
+        plt.figure()
+        for i in range (0, len(v_si)):
+            t_i = solution[i]["Time [s]"] / 3600
+            OCP_i = solution[i]["X-averaged negative electrode secondary open-circuit potential [V]"]
+            plt.plot(t_i, OCP_i, ltype[i], label="$V_\mathrm{si}=$" + str(v_si[i]))
+        plt.xlabel("Time [h]")
+        plt.ylabel("OCP [V]")
+        plt.legend()
+        plt.title("Silicon")
+        plt.savefig("silicon_ocp.png")
+
+        plt.figure()
+        for i in range (0, len(v_si)):
+            t_i = solution[i]["Time [s]"] / 3600
+            OCP_i = solution[i]["X-averaged positive electrode open-circuit potential [V]"]
+            plt.plot(t_i, OCP_i, ltype[i], label="$V_\mathrm{si}=$" + str(v_si[i]))
+        plt.xlabel("Time [h]")
+        plt.ylabel("OCP [V]")
+        plt.legend()
+        plt.title("NMC811")
+        plt.savefig("NMC_ocp.png")
+
+        #Cycling
+
+        experiment = pybamm.Experiment(
+            [
+                (
+                    "Discharge at C/2 until 3.0 V",
+                    "Rest for 1 hour",
+                    "Charge at C/2 until 4.2 V",
+                    "Rest for 1 hour",
+                ),
+            ]
+        )
+
+
+        solution = run_sweep(
+            param,
+            overrides,
+            experiment=experiment,
+            options=COMPOSITE_OPTIONS,
+            processes=1 if PROFILE else None,
+            inputs=True,
+            # reruns load the results instead of solving
+            cache=None if PROFILE else SolutionCache(),
+            # the plotted variables only, streamed to disk and memory-mapped back
+            store=ResultsWriter("composite_example_cycling.results"),
+        )
+        stop = timeit.default_timer()
+        print("running time: " + str(stop - start) + "s")
+    finally:
+        profiler.stop()
+    if PROFILE:
+        print(profiler.summary())
+
+    plt.figure()
+    for i in range(0, len(v_si)):
+        t_i = solution[i]["Time [s]"] / 3600
+        V_i = solution[i]["Voltage [V]"]
+        plt.plot(t_i, V_i, ltype[i], label="$V_\mathrm{si}=$" + str(v_si[i]))
+    plt.xlabel("Time [h]")
+    plt.ylabel("Voltage [V]")
+    plt.legend()
+    plt.savefig("composite_cycling_ocvs.png")
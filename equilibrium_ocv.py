@@ -0,0 +1,239 @@
+"""
+Equilibrium open-circuit voltage of a cell, without time integration.
+
+At equilibrium every particle of an electrode sits at the same potential, so for
+a composite electrode the graphite and silicon phases share their lithium such
+that U_primary(x_primary, T) = U_secondary(x_secondary, T). The lithium inventory
+fixes how much lithium each electrode holds after a discharge capacity Q:
+
+    N_negative = Q_Li_negative_init - Q,    N_positive = Q_Li_positive_init + Q
+
+and the OCV is the difference of the two electrode potentials. Each electrode is
+handled by tabulating the lithium it holds as a function of its potential, then
+inverting that (monotone) relation, which is vectorised over every SOC point.
+
+The OCPs, entropic changes, capacities and initial lithium are read from a
+pybamm parameter set through :class:`pybamm.LithiumIonParameters`, so the
+Durdel2023_single.py / Durdel2023_composite.py sets and the pybamm sets all work,
+with U(x, T) = U_ref(x) + (T - T_ref) dU/dT(x) as in the DFN.
+
+Example::
+
+    from equilibrium_ocv import equilibrium_ocv
+    ocv = equilibrium_ocv(pybamm.ParameterValues("ORegan2022"), temps, initial_soc=1)
+"""
+import numpy as np
+
+import pybamm
+
+# Branch of a hysteretic OCP followed by each electrode during discharge/charge
+HYSTERESIS_BRANCHES = {
+    "discharge": {"negative": "delithiation", "positive": "lithiation"},
+    "charge": {"negative": "lithiation", "positive": "delithiation"},
+}
+
+
+def _phase_tables(parameter_values, param, domain, n_sto, hysteresis):
+    # U_ref, dU/dT and capacity of every phase of one electrode
+    domain_param = param.domain_params[domain]
+    Domain = domain.capitalize()
+    sto = np.linspace(0, 1, n_sto)[1:-1]
+    tables = []
+    for phase in param.options.phases[domain]:
+        phase_param = domain_param.phase_params[phase]
+        branch = None
+        if hysteresis is not None:
+            branch = HYSTERESIS_BRANCHES[hysteresis][domain]
+            key = f"{phase_param.phase_prefactor}{Domain} electrode {branch} OCP [V]"
+            if key not in parameter_values.keys():
+                branch = None
+        x = pybamm.Vector(sto)
+        T_ref = parameter_values["Reference temperature [K]"]
+        U = [
+            parameter_values.process_symbol(phase_param.U(x, pybamm.Scalar(T), branch))
+            .evaluate()
+            .ravel()
+            for T in (T_ref, T_ref + 1)
+        ]
+        defined = np.isfinite(U[0]) & np.isfinite(U[1])
+        tables.append(
+            {
+                "sto": sto[defined],
+                "U_ref": U[0][defined],
+                "dUdT": U[1][defined] - U[0][defined],
+                "T_ref": T_ref,
+                "capacity": parameter_values.evaluate(phase_param.Q_init),
+                "lithium": parameter_values.evaluate(phase_param.Q_Li_init),
+            }
+        )
+    return tables
+
+
+def _electrode_lithium(tables, T):
+    """
+    Potential grid of one electrode at temperature ``T`` and, on that grid, the
+    lithium held [A.h] and the stoichiometry of each phase.
+    """
+    curves = []
+    for table in tables:
+        U = table["U_ref"] + (T - table["T_ref"]) * table["dUdT"]
+        # digitised tables are not always monotone; use the decreasing envelope
+        curves.append((table, np.minimum.accumulate(U)))
+    potential = np.unique(np.concatenate([U for _, U in curves]))
+    sto = [
+        np.interp(potential, U[::-1], table["sto"][::-1]) for table, U in curves
+    ]
+    lithium = sum(table["capacity"] * x for (table, _), x in zip(curves, sto))
+    return potential, lithium, sto
+
+
+def equilibrium_ocv(
+    parameter_values,
+    temperatures,
+    options=None,
+    n_points=1000,
+    initial_soc=None,
+    hysteresis=None,
+    n_sto=2001,
+):
+    """
+    Equilibrium OCV as a function of discharge capacity, at each temperature,
+    between the parameter set's voltage cut-offs.
+
+    Parameters
+    ----------
+    parameter_values : :class:`pybamm.ParameterValues` or dict
+        Parameter set, e.g. ``get_final_parameter_values()``
+    temperatures : array-like
+        Temperatures [K]
+    options : dict, optional
+        Model options giving the particle phases, e.g.
+        :data:`run_helpers.COMPOSITE_OPTIONS` for the composite electrode
+    n_points : int, optional
+        Number of discharge-capacity points
+    initial_soc : float, optional
+        If given, the initial stoichiometries are first set for this SOC with
+        :meth:`pybamm.ParameterValues.set_initial_state`, as ``initial_soc`` does
+        in :meth:`pybamm.Simulation.solve`
+    hysteresis : str, optional
+        "discharge" or "charge" to follow the delithiation/lithiation OCP
+        branches of electrodes that have them, instead of the average OCP
+    n_sto : int, optional
+        Number of stoichiometry points the OCPs are tabulated at
+
+    Returns
+    -------
+    dict
+        "Temperature [K]" (n_T,), "Discharge capacity [A.h]" and "SOC"
+        (n_points,), "OCV [V]", "Negative electrode potential [V]" and
+        "Positive electrode potential [V]" (n_T, n_points), and
+        "Stoichiometry", a dict (domain, phase) -> (n_T, n_points) array.
+        The discharge capacity Q spans the cut-off window of every temperature,
+        from the upper cut-off at the first to the lower cut-off at the last;
+        points outside a temperature's own window are NaN. SOC = 1 at the start
+        of Q and 0 at its end.
+    """
+    if not isinstance(parameter_values, pybamm.ParameterValues):
+        parameter_values = pybamm.ParameterValues(parameter_values)
+    if initial_soc is not None:
+        parameter_values = parameter_values.set_initial_state(
+            float(initial_soc), options=options, inplace=False
+        )
+    param = pybamm.LithiumIonParameters(options)
+    temperatures = np.atleast_1d(np.asarray(temperatures, dtype=float))
+    tables = {
+        domain: _phase_tables(parameter_values, param, domain, n_sto, hysteresis)
+        for domain in ["negative", "positive"]
+    }
+
+    # discharge capacity range allowed by both electrodes' stoichiometry limits
+    initial = {d: sum(t["lithium"] for t in tables[d]) for d in tables}
+    limits = {
+        d: (
+            sum(t["capacity"] * t["sto"][0] for t in tables[d]),
+            sum(t["capacity"] * t["sto"][-1] for t in tables[d]),
+        )
+        for d in tables
+    }
+    Q_min = max(
+        initial["negative"] - limits["negative"][1],
+        limits["positive"][0] - initial["positive"],
+    )
+    Q_max = min(
+        initial["negative"] - limits["negative"][0],
+        limits["positive"][1] - initial["positive"],
+    )
+
+    # narrowed to the voltage cut-offs: outside them the OCPs are extrapolated
+    # (e.g. the NCA OCP diverges near sto = 1) and no run gets there
+    V_min = parameter_values["Lower voltage cut-off [V]"]
+    V_max = parameter_values["Upper voltage cut-off [V]"]
+    Q_fine = np.linspace(Q_min, Q_max, max(n_points, n_sto))
+    ocv_fine = _ocv(tables, param, temperatures, initial, Q_fine)[0]
+    windows = np.array([_window(Q_fine, ocv, V_min, V_max) for ocv in ocv_fine])
+    Q = np.linspace(windows[:, 0].min(), windows[:, 1].max(), n_points)
+    ocv, potentials, stoichiometry = _ocv(tables, param, temperatures, initial, Q)
+    for i, (low, high) in enumerate(windows):
+        outside = (Q < low) | (Q > high)
+        ocv[i, outside] = np.nan
+        for values in [*potentials.values(), *stoichiometry.values()]:
+            values[i, outside] = np.nan
+
+    return {
+        "Temperature [K]": temperatures,
+        "Discharge capacity [A.h]": Q,
+        "SOC": (Q[-1] - Q) / (Q[-1] - Q[0]),
+        "OCV [V]": ocv,
+        "Negative electrode potential [V]": potentials["negative"],
+        "Positive electrode potential [V]": potentials["positive"],
+        "Stoichiometry": stoichiometry,
+    }
+
+
+def _ocv(tables, param, temperatures, initial, Q):
+    # OCV, electrode potentials and stoichiometries (n_T, len(Q)) after
+    # discharging Q from the initial lithium
+    lithium = {"negative": initial["negative"] - Q, "positive": initial["positive"] + Q}
+    potentials = {d: np.empty((len(temperatures), len(Q))) for d in tables}
+    stoichiometry = {
+        (d, phase): np.empty((len(temperatures), len(Q)))
+        for d in tables
+        for phase in param.options.phases[d]
+    }
+    for i, T in enumerate(temperatures):
+        for domain in tables:
+            potential, held, sto = _electrode_lithium(tables[domain], T)
+            # lithium held decreases as the electrode potential rises
+            potentials[domain][i] = np.interp(
+                lithium[domain], held[::-1], potential[::-1]
+            )
+            for phase, x in zip(param.options.phases[domain], sto):
+                stoichiometry[domain, phase][i] = np.interp(
+                    potentials[domain][i], potential, x
+                )
+    ocv = potentials["positive"] - potentials["negative"]
+    return ocv, potentials, stoichiometry
+
+
+def _window(Q, ocv, V_min, V_max):
+    # (first, last) discharge capacity of the longest run of ``ocv`` between the
+    # cut-offs, each end moved to where the OCV crosses the cut-off
+    inside = (ocv >= V_min) & (ocv <= V_max)
+    if not inside.any():
+        raise ValueError(
+            f"the OCV never lies between the cut-offs {V_min} V and {V_max} V"
+        )
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], inside.astype(int), [0]])))
+    starts, stops = edges[::2], edges[1::2] - 1
+    longest = np.argmax(stops - starts)
+    first, last = starts[longest], stops[longest]
+    ends = []
+    for inner, outer in [(first, first - 1), (last, last + 1)]:
+        if outer < 0 or outer >= len(Q):
+            ends.append(Q[inner])
+            continue
+        cut_off = V_max if ocv[outer] > V_max else V_min
+        # linear crossing between the last point inside and the first outside
+        weight = (cut_off - ocv[inner]) / (ocv[outer] - ocv[inner])
+        ends.append(Q[inner] + weight * (Q[outer] - Q[inner]))
+    return ends
@@ -0,0 +1,403 @@
+"""
+Model fidelity ladder for the composite cell: SPM, then SPMe, then DFN.
+
+Slow protocols rarely need the full DFN. For a parameter set and a range of
+C-rates, each model of :data:`LADDER` (all with the composite options of
+run_helpers.py) solves a short calibration protocol at the top rate of the range,
+cheapest first, and the first whose voltage stays within ``tolerance`` of the
+DFN's, step by step, is chosen. If none is, or the DFN itself cannot run the
+protocol, the DFN is chosen.
+
+The choice is cached with the times and errors that made it, keyed by
+:func:`solution_cache.content_hash` of the parameter values, options, range and
+tolerance, in ~/.cache/LiSi/fidelity.json or the path in the LISI_FIDELITY
+environment variable; set it to an empty string to keep the choices of each
+process to itself. Sweeps given ``fidelity=tolerance`` (``--fidelity`` on the
+command line) run the chosen model for the highest C-rate of their points.
+Steps at a voltage or power, and rates above the last range, run the DFN.
+
+Calibrate every range and print the speedups, or inspect the cache (CLI)::
+
+    python fidelity.py calibrate --parameter-set OG --tolerance 2e-3
+    python fidelity.py info
+    python fidelity.py clear
+"""
+import argparse
+import numbers
+import os
+import timeit
+
+import numpy as np
+
+import pybamm
+
+import Durdel2023_composite  # noqa: F401, registers "final", "test" and "OG"
+import mesh_profile
+import parameter_sets
+import solver_profile
+from autotune import voltage_error
+from ocp_data import select_ocp
+from run_helpers import COMPOSITE_OPTIONS, composite_model, model_identity
+from solution_cache import content_hash
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "LiSi", "fidelity.json")
+
+# Model classes, cheapest first; the last one is the reference
+LADDER = [pybamm.lithium_ion.SPM, pybamm.lithium_ion.SPMe, pybamm.lithium_ion.DFN]
+
+# Top C-rates of the calibrated ranges, each starting where the previous ends
+RATE_EDGES = [1 / 50, 1 / 20, 1 / 10, 1 / 5, 1 / 2, 1, 2]
+
+# Fraction of the capacity the calibration protocol takes out and puts back
+CALIBRATION_DEPTH = 0.1
+
+# key -> choice made or read in this process
+_chosen = {}
+
+
+def fidelity_path():
+    """Path of the cache in use, or None if choices are not saved."""
+    return os.environ.get("LISI_FIDELITY", DEFAULT_PATH) or None
+
+
+def rate_range(c_rate):
+    """``(lower, upper)`` C-rates of the range holding ``c_rate``, None above 2C."""
+    lower = 0.0
+    for upper in RATE_EDGES:
+        if c_rate <= upper * (1 + 1e-9):
+            return lower, upper
+        lower = upper
+    return None
+
+
+def calibration_protocol(c_rate, depth=CALIBRATION_DEPTH):
+    """
+    Steps taking ``depth`` of the capacity out at ``c_rate``, resting, putting it
+    back and resting again.
+    """
+    minutes = f"{60 * depth / c_rate:.6g}"
+    return (
+        f"Discharge at {c_rate:.6g}C for {minutes} minutes",
+        "Rest for 10 minutes",
+        f"Charge at {c_rate:.6g}C for {minutes} minutes",
+        "Rest for 10 minutes",
+    )
+
+
+def protocol_c_rate(parameter_values, experiment=None, overrides=None):
+    """
+    Highest C-rate of ``experiment``, or of the constant "Current function [A]"
+    without one, over the points of a sweep if ``overrides`` are given.
+
+    Returns
+    -------
+    float or None
+        None if a step is not at a set current (e.g. a voltage hold or a power
+        step), or the current is not a number
+    """
+    highest = 0.0
+    for point in [{}] if not overrides else overrides:
+        if point:
+            point_values = parameter_sets.copy_parameter_values(parameter_values)
+            point_values.update(point, check_already_exists=False)
+        else:
+            point_values = parameter_values
+        capacity = point_values["Nominal cell capacity [A.h]"]
+        if experiment is None:
+            rates = [(point_values["Current function [A]"], capacity)]
+        else:
+            rates = []
+            for step in experiment.steps:
+                if isinstance(step, pybamm.step.CRate):
+                    rates.append((step.value, 1.0))
+                elif isinstance(step, pybamm.step.Current):
+                    rates.append((step.value, capacity))
+                else:
+                    return None
+        for value, scale in rates:
+            if not isinstance(value, numbers.Number):
+                return None
+            highest = max(highest, abs(value) / scale)
+    return highest
+
+
+def choice_key(parameter_values, rates, tolerance, options=None):
+    """Cache key of the choice for a parameter set, C-rate range and tolerance."""
+    return content_hash(
+        kind="fidelity",
+        ladder=[model_class.__name__ for model_class in LADDER],
+        options=COMPOSITE_OPTIONS if options is None else options,
+        parameter_values=parameter_values,
+        rates=list(rates),
+        tolerance=tolerance,
+        protocol=calibration_protocol(rates[1]),
+    )
+
+
+def _solve(parameter_values, experiment, model_class, options, repeats):
+    # median wall time of ``repeats`` solves, with the solver and mesh a run of
+    # this model gets from run_helpers (the profiled ones, or the model's
+    # defaults), and the last solution; the model itself is built once per
+    # process, as in runs
+    model = composite_model(options, model_class)
+    identity = model_identity(options, model_class=model_class)
+    settings = solver_profile.lookup(identity, parameter_values)
+    var_pts = mesh_profile.var_pts(identity, parameter_values, model)
+    seconds = []
+    for _ in range(repeats):
+        sim = pybamm.Simulation(
+            model,
+            parameter_values=parameter_values,
+            experiment=experiment,
+            var_pts=var_pts,
+            solver=None if settings is None else solver_profile.make_solver(settings),
+        )
+        start = timeit.default_timer()
+        solution = sim.solve()
+        seconds.append(timeit.default_timer() - start)
+    return float(np.median(seconds)), solution
+
+
+def calibrate(
+    parameter_values,
+    c_rate,
+    tolerance,
+    options=None,
+    protocol=None,
+    repeats=1,
+    verbose=True,
+):
+    """
+    Solve the calibration protocol at ``c_rate`` with the DFN, then with each
+    cheaper model of :data:`LADDER` until one is within ``tolerance``.
+
+    Parameters
+    ----------
+    parameter_values : :class:`pybamm.ParameterValues`
+        Parameter set to calibrate on
+    c_rate : float
+        C-rate of the protocol
+    tolerance : float
+        Largest voltage error [V] accepted against the DFN
+    options : dict, optional
+        Model options, defaults to :data:`run_helpers.COMPOSITE_OPTIONS`
+    protocol : tuple of str, optional
+        Experiment steps, defaults to :func:`calibration_protocol` at ``c_rate``
+    repeats : int, optional
+        Solves per model; the median time is kept
+    verbose : bool, optional
+        Whether to print each trial
+
+    Returns
+    -------
+    dict
+        Entry of the choice: "model" (class name), its "seconds", "error [V]" and
+        "speedup" over the DFN, and every trial
+    """
+    protocol = calibration_protocol(c_rate) if protocol is None else protocol
+    experiment = pybamm.Experiment([tuple(protocol)])
+    reference_class = LADDER[-1]
+    entry = {
+        "C-rate": c_rate,
+        "protocol": list(protocol),
+        "tolerance [V]": tolerance,
+        "model": reference_class.__name__,
+        "error [V]": 0.0,
+        "speedup": 1.0,
+        "pybamm": pybamm.__version__,
+        "trials": [],
+    }
+    try:
+        reference_seconds, reference = _solve(
+            parameter_values, experiment, reference_class, options, repeats
+        )
+    except (pybamm.SolverError, RuntimeError, ValueError) as error:
+        entry["failed"] = "reference: " + str(error).splitlines()[0]
+        return entry
+    if len(reference.cycles[0].steps) != len(protocol):
+        entry["failed"] = "reference: stopped early"
+        return entry
+    entry["seconds"] = entry["reference seconds"] = reference_seconds
+    for model_class in LADDER[:-1]:
+        trial = {"model": model_class.__name__}
+        try:
+            trial["seconds"], solution = _solve(
+                parameter_values, experiment, model_class, options, repeats
+            )
+        except (pybamm.SolverError, RuntimeError, ValueError) as error:
+            trial["failed"] = str(error).splitlines()[0]
+        else:
+            trial["error [V]"] = float(voltage_error(solution, reference))
+            if not np.isfinite(trial["error [V]"]):
+                del trial["error [V]"]
+                trial["failed"] = "stopped early"
+        entry["trials"].append(trial)
+        if verbose:
+            if "failed" in trial:
+                outcome = "failed: " + trial["failed"]
+            else:
+                outcome = (
+                    f"{trial['seconds']:7.3f} s, "
+                    f"error {trial['error [V]'] * 1e3:8.3f} mV"
+                )
+            print(f"  {trial['model']:5s} {outcome}", flush=True)
+        if "failed" not in trial and trial["error [V]"] <= tolerance:
+            entry.update(
+                {
+                    "model": trial["model"],
+                    "seconds": trial["seconds"],
+                    "error [V]": trial["error [V]"],
+                    "speedup": reference_seconds / trial["seconds"],
+                }
+            )
+            break
+    if verbose:
+        print(f"  DFN   {reference_seconds:7.3f} s (reference)", flush=True)
+    return entry
+
+
+def choice(
+    parameter_values,
+    c_rate,
+    tolerance,
+    options=None,
+    name=None,
+    path=None,
+    recalibrate=False,
+    verbose=False,
+):
+    """
+    Entry of the model chosen for the C-rate range holding ``c_rate``, read from
+    the cache, or calibrated (see :func:`calibrate`) and stored in it.
+
+    Parameters
+    ----------
+    parameter_values : :class:`pybamm.ParameterValues`
+        Parameter set, e.g. the base set of a sweep
+    c_rate : float
+        C-rate to run at, at most the top of the last range (2C)
+    tolerance : float
+        Largest voltage error [V] accepted against the DFN
+    options : dict, optional
+        Model options, defaults to :data:`run_helpers.COMPOSITE_OPTIONS`
+    name : str, optional
+        Name of the parameter set, recorded in the entry
+    path : str, optional
+        Cache file, defaults to :func:`fidelity_path`
+    recalibrate : bool, optional
+        Whether to calibrate again even if the choice is cached
+    verbose : bool, optional
+        Whether to print the trials of a calibration
+    """
+    rates = rate_range(c_rate)
+    key = choice_key(parameter_values, rates, tolerance, options)
+    path = fidelity_path() if path is None else path
+    if recalibrate or key not in _chosen:
+        entry = None
+        if not recalibrate and path is not None:
+            entry = solver_profile.load(path).get(key)
+        if entry is None:
+            if verbose:
+                print(f"{_describe_range(rates)}:", flush=True)
+            entry = calibrate(
+                parameter_values, rates[1], tolerance, options, verbose=verbose
+            )
+            entry["parameter set"] = name
+            entry["C-rate range"] = list(rates)
+            if path is not None:
+                entries = dict(solver_profile.load(path))
+                entries[key] = entry
+                solver_profile.write_entries(path, entries)
+        _chosen[key] = entry
+    return _chosen[key]
+
+
+def select_model_class(parameter_values, c_rate, tolerance, options=None, **kwargs):
+    """
+    Cheapest model class of :data:`LADDER` within ``tolerance`` [V] of the DFN at
+    ``c_rate`` (see :func:`choice`, which takes the other keyword arguments);
+    the DFN if ``c_rate`` is None or above the last range.
+    """
+    if c_rate is None or rate_range(c_rate) is None:
+        return LADDER[-1]
+    entry = choice(parameter_values, c_rate, tolerance, options, **kwargs)
+    return getattr(pybamm.lithium_ion, entry["model"])
+
+
+def _describe_range(rates):
+    return f"({rates[0]:.3g}C, {rates[1]:.3g}C]"
+
+
+def _describe(entry):
+    outcome = f"{entry['model']:4s}"
+    if "failed" in entry:
+        return f"{outcome} ({entry['failed']})"
+    if entry["model"] == LADDER[-1].__name__:
+        return f"{outcome} {entry['seconds']:6.3f} s, nothing cheaper is accurate"
+    return (
+        f"{outcome} {entry['seconds']:6.3f} s, {entry['speedup']:4.1f}x faster than "
+        f"the DFN ({entry['reference seconds']:.3f} s), "
+        f"error {entry['error [V]'] * 1e3:6.3f} mV"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("command", choices=["calibrate", "info", "clear"])
+    parser.add_argument("--parameter-set", default="OG")
+    parser.add_argument(
+        "--ocp",
+        choices=["table", "surrogate"],
+        default="table",
+        help="tabulated OCPs, or their analytic surrogates (see ocp_data.py)",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=2e-3,
+        help="largest voltage error [V] against the DFN",
+    )
+    parser.add_argument("--path", default=None)
+    args = parser.parse_args(argv)
+    path = fidelity_path() if args.path is None else args.path
+
+    if args.command == "calibrate":
+        parameter_values = select_ocp(
+            parameter_sets.parameter_values(args.parameter_set), args.ocp
+        )
+        report = []
+        for upper in RATE_EDGES:
+            entry = choice(
+                parameter_values,
+                upper,
+                args.tolerance,
+                name=args.parameter_set,
+                path=path,
+                recalibrate=True,
+                verbose=True,
+            )
+            report.append(entry)
+        print(f"{args.parameter_set}, within {args.tolerance * 1e3:g} mV of the DFN:")
+        for entry in report:
+            print(f"{_describe_range(entry['C-rate range']):16s} {_describe(entry)}")
+        return
+    if path is None:
+        print("fidelity choices are not saved (LISI_FIDELITY is empty)")
+        return
+    entries = solver_profile.load(path)
+    if args.command == "clear":
+        if os.path.exists(path):
+            os.remove(path)
+        print(f"removed {len(entries)} entries from {path}")
+        return
+    print(f"{path}: {len(entries)} entries")
+    for key, entry in entries.items():
+        print(
+            f"{key[:12]}  {entry['parameter set']!r} "
+            f"{_describe_range(entry['C-rate range']):16s} "
+            f"within {entry['tolerance [V]'] * 1e3:g} mV: {_describe(entry)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
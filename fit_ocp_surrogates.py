@@ -0,0 +1,243 @@
+"""
+Fit analytic surrogates to the tabulated OCPs of ocp_data.py.
+
+Each surrogate is a smooth sum of the kind used by ``nmc_LGM50_ocp_Chen2020``::
+
+    U(sto) = a + b sto + sum_i c_i tanh((sto - d_i) / w_i) [+ e exp(-sto / k)]
+
+The centres d_i, widths w_i (and k) are fitted by nonlinear least squares, with
+the amplitudes solved exactly inside each iteration (variable projection). Two
+tanh terms whose slopes nearly coincide can cancel each other with large
+amplitudes of opposite sign, which fits no better and makes the surrogate and
+its derivative ill-conditioned; such pairs are merged into one term and the fit
+is repeated. Terms are added until the error bound of the surrogate (see
+:func:`max_error`) is within the tolerance. The bound is stored with the
+coefficients, with the tolerance; a table with no surrogate within it keeps its
+most accurate one, flagged by "max_error" above "tolerance", which
+:func:`ocp_data.select_ocp` does not use.
+
+Example (CLI), printing the entries of :data:`ocp_data.OCP_SURROGATES`::
+
+    python fit_ocp_surrogates.py --tolerance 0.005
+"""
+import argparse
+import warnings
+
+import numpy as np
+from scipy import interpolate, optimize
+
+import ocp_data
+
+# Stoichiometry range fitted per table, where it differs from the table's range.
+# Below 0.005 the graphite table climbs to 3.5 V; pybamm's OCP asymptotes cover it.
+FIT_RANGES = {"graphite_ocp": (0.005, 1)}
+
+# Largest cosine similarity of the slopes (sech^2 bumps) of two tanh terms on the
+# fitted range; above it the pair is merged
+MAX_SIMILARITY = 0.99
+
+
+def _basis(sto, centres, widths, decay):
+    columns = [np.ones_like(sto), sto]
+    columns += [np.tanh((sto - d) / w) for d, w in zip(centres, widths)]
+    if decay is not None:
+        columns.append(np.exp(-sto / decay))
+    return np.column_stack(columns)
+
+
+def _solve(sto, volt, centres, widths, decay, ridge=1e-6):
+    # small ridge penalty for the conditioning of the projection; it does not
+    # stop coincident terms from cancelling, see :func:`_coincident`
+    A = _basis(sto, centres, widths, decay)
+    n = A.shape[1]
+    amplitudes = np.linalg.lstsq(
+        np.vstack([A, ridge * np.sqrt(len(sto)) * np.eye(n)]),
+        np.concatenate([volt, np.zeros(n)]),
+        rcond=None,
+    )[0]
+    return A, amplitudes
+
+
+def _coincident(sto, centres, widths):
+    # the pair of tanh terms whose slopes are the most alike, if above
+    # MAX_SIMILARITY, else None
+    if len(centres) < 2:
+        return None
+    slopes = np.column_stack(
+        [1 - np.tanh((sto - d) / w) ** 2 for d, w in zip(centres, widths)]
+    )
+    slopes /= np.linalg.norm(slopes, axis=0)
+    similarity = slopes.T @ slopes
+    np.fill_diagonal(similarity, 0)
+    i, j = np.unravel_index(np.argmax(similarity), similarity.shape)
+    return (i, j) if similarity[i, j] > MAX_SIMILARITY else None
+
+
+def fit_surrogate(sto, volt, n_tanh, exponential=False, n_fit=2001):
+    """
+    Fit up to ``n_tanh`` tanh terms (and optionally the exponential) to the curve
+    ``volt(sto)``, sampled at ``n_fit`` points. Returns the surrogate dict, with
+    fewer terms if coincident ones were merged.
+    """
+    x = np.linspace(sto[0], sto[-1], n_fit)
+    y = np.interp(x, sto, volt)
+    # start with the centres spread evenly along the arc length of the curve
+    u = (x - x[0]) / np.ptp(x)
+    v = (y - y.min()) / np.ptp(y)
+    arc = np.concatenate([[0], np.cumsum(np.hypot(np.diff(u), np.diff(v)))])
+    centres = np.interp((np.arange(n_tanh) + 0.5) / n_tanh, arc / arc[-1], x)
+    # centres stay in the fitted range, widths between 1/2000 of it and all of it
+    width_bounds = np.log(np.ptp(x) / 2000), np.log(np.ptp(x))
+    widths = np.clip(np.gradient(centres), *np.exp(width_bounds))
+    exponential_start = np.log(np.ptp(x) / 50) if exponential else None
+
+    while True:
+        theta = np.concatenate([centres, np.log(widths)])
+        lower = np.concatenate(
+            [np.full(n_tanh, x[0]), np.full(n_tanh, width_bounds[0])]
+        )
+        upper = np.concatenate(
+            [np.full(n_tanh, x[-1]), np.full(n_tanh, width_bounds[1])]
+        )
+        if exponential:
+            theta = np.append(theta, exponential_start)
+            lower = np.append(lower, width_bounds[0])
+            upper = np.append(upper, width_bounds[1])
+
+        def unpack(theta):
+            decay = np.exp(theta[2 * n_tanh]) if exponential else None
+            return theta[:n_tanh], np.exp(theta[n_tanh : 2 * n_tanh]), decay
+
+        def residual(theta):
+            A, amplitudes = _solve(x, y, *unpack(theta))
+            return A @ amplitudes - y
+
+        theta = optimize.least_squares(
+            residual, theta, bounds=(lower, upper), max_nfev=400
+        ).x
+        centres, widths, decay = unpack(theta)
+        pair = _coincident(x, centres, widths)
+        if pair is None:
+            break
+        # merge the pair into one term between them, and fit again from there
+        i, j = pair
+        centres[i] = (centres[i] + centres[j]) / 2
+        widths[i] = np.sqrt(widths[i] * widths[j])
+        centres, widths = np.delete(centres, j), np.delete(widths, j)
+        n_tanh -= 1
+        if exponential:
+            exponential_start = np.log(decay)
+
+    _, amplitudes = _solve(x, y, centres, widths, decay)
+    surrogate = {
+        "range": (float(x[0]), float(x[-1])),
+        "linear": (float(amplitudes[0]), float(amplitudes[1])),
+        "tanh": [
+            (float(c), float(d), float(w))
+            for c, d, w in zip(amplitudes[2 : 2 + n_tanh], centres, widths)
+        ],
+    }
+    if exponential:
+        surrogate["exp"] = (float(amplitudes[-1]), float(decay))
+    return surrogate
+
+
+def _slope(surrogate, sto):
+    # derivative of :func:`ocp_data.evaluate_surrogate` with respect to ``sto``
+    slope = np.full_like(sto, surrogate["linear"][1])
+    for amplitude, centre, width in surrogate["tanh"]:
+        slope += amplitude / width * (1 - np.tanh((sto - centre) / width) ** 2)
+    if "exp" in surrogate:
+        amplitude, decay = surrogate["exp"]
+        slope -= amplitude / decay * np.exp(-sto / decay)
+    return slope
+
+
+def max_error(name, surrogate, n_check=100001):
+    """
+    Bound of |surrogate - table| over the surrogate's range [V]: the largest
+    difference on ``n_check`` points, plus half their spacing times the largest
+    slope of the difference, which bounds how much it can grow between them.
+    """
+    sto, volt, interpolator, _ = ocp_data.OCP_TABLES[name]
+    if interpolator == "pchip":
+        table = interpolate.PchipInterpolator(sto, volt)
+    else:
+        table = interpolate.CubicSpline(sto, volt)
+    x = np.linspace(*surrogate["range"], n_check)
+    difference = ocp_data.evaluate_surrogate(surrogate, x) - table(x)
+    slope = _slope(surrogate, x) - table.derivative()(x)
+    return float(np.max(np.abs(difference)) + (x[1] - x[0]) / 2 * np.max(np.abs(slope)))
+
+
+def fit_table(name, tolerance, max_tanh=16):
+    """
+    Smallest surrogate of the table ``name`` within ``tolerance`` [V], trying
+    2, 4, ... ``max_tanh`` tanh terms with and without the exponential. If none
+    is within tolerance, the most accurate one is returned, with a warning; its
+    "max_error" is then above its "tolerance", see :func:`ocp_data.select_ocp`.
+    """
+    sto, volt, interpolator, _ = ocp_data.OCP_TABLES[name]
+    low, high = FIT_RANGES.get(name, (sto[0], sto[-1]))
+    x = np.linspace(low, high, 20001)
+    if interpolator == "pchip":
+        y = interpolate.PchipInterpolator(sto, volt)(x)
+    else:
+        y = interpolate.CubicSpline(sto, volt)(x)
+    best = None
+    for n_tanh in range(2, max_tanh + 1, 2):
+        for exponential in (False, True):
+            surrogate = fit_surrogate(x, y, n_tanh, exponential)
+            surrogate["max_error"] = max_error(name, surrogate)
+            surrogate["tolerance"] = tolerance
+            if best is None or surrogate["max_error"] < best["max_error"]:
+                best = surrogate
+            if surrogate["max_error"] <= tolerance:
+                return surrogate
+    warnings.warn(
+        f"no surrogate of {name} is within {tolerance * 1e3:g} mV; the best one "
+        f"({best['max_error'] * 1e3:.2f} mV) is flagged and not used by select_ocp",
+        stacklevel=2,
+    )
+    return best
+
+
+def format_surrogates(surrogates):
+    """Python source of the ``OCP_SURROGATES`` dict, one term per line."""
+    lines = ["OCP_SURROGATES = {"]
+    for name, surrogate in surrogates.items():
+        lines.append(f'    "{name}": {{')
+        lines.append(f'        "range": {surrogate["range"]!r},')
+        lines.append(f'        "max_error": {surrogate["max_error"]:.3e},')
+        lines.append(f'        "tolerance": {surrogate["tolerance"]!r},')
+        lines.append(f'        "linear": ({surrogate["linear"][0]!r}, {surrogate["linear"][1]!r}),')
+        lines.append('        "tanh": [')
+        for c, d, w in surrogate["tanh"]:
+            lines.append(f"            ({c:.10g}, {d:.10g}, {w:.10g}),")
+        lines.append("        ],")
+        if "exp" in surrogate:
+            lines.append(f'        "exp": ({surrogate["exp"][0]:.10g}, {surrogate["exp"][1]:.10g}),')
+        lines.append("    },")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--tolerance", type=float, default=0.005, help="[V]")
+    parser.add_argument("--max-tanh", type=int, default=16)
+    parser.add_argument("names", nargs="*", default=list(ocp_data.OCP_TABLES))
+    args = parser.parse_args(argv)
+
+    surrogates = {}
+    for name in args.names:
+        surrogates[name] = fit_table(name, args.tolerance, args.max_tanh)
+        print(
+            f"# {name}: {len(surrogates[name]['tanh'])} tanh terms, "
+            f"max error {surrogates[name]['max_error'] * 1e3:.2f} mV"
+        )
+    print(format_surrogates(surrogates))
+
+
+if __name__ == "__main__":
+    main()
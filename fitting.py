@@ -0,0 +1,361 @@
+"""
+Gradient-based fitting of parameters to measured voltage, e.g. GITT or cycling
+data, with the Jacobian from the solver's forward sensitivities.
+
+The keys fitted are made runtime inputs of one simulation per dataset, built
+once (see :func:`run_helpers.build_simulation`): numbers under their own name,
+and functions (e.g. an exchange-current density) through a factor multiplying
+them, named "<key> factor". IDAKLU integrates the sensitivities of the voltage
+to every input along with the solution, so each iteration of the bounded
+least-squares solver (:func:`scipy.optimize.least_squares`) costs one solve per
+dataset, where finite differences cost N + 1 for N keys. Keys are fitted in log
+space, relative to their initial values, so that diffusivities and volume
+fractions are scaled alike. Datasets (e.g. temperatures or C-rates) are solved
+in parallel, each worker building the simulation of a dataset the first time it
+gets it.
+
+``jacobian="finite differences"`` fits the same way with forward differences,
+as a baseline (see benchmarks/bench_fitting.py).
+
+Example::
+
+    from fitting import Dataset, fit
+    datasets = [
+        Dataset(t, voltage, {"Current function [A]": 2.5, "Ambient temperature [K]": T})
+        for t, voltage, T in measurements
+    ]
+    result = fit(
+        get_parameter_values("test"),
+        datasets,
+        {
+            "Primary: Negative particle diffusivity [m2.s-1]": (1e-15, 1e-12),
+            "Positive electrode exchange-current density [A.m-2]": (0.1, 10),
+        },
+    )
+    result["parameters"]
+"""
+import functools
+import os
+import timeit
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import optimize
+
+import pybamm
+
+import solver_profile
+from parameter_sets import copy_parameter_values
+from run_helpers import build_simulation
+
+# Solver of the fits: the sensitivities are as accurate as the solution, and
+# finite differences need the solution well below their step
+FIT_SOLVER = {"class": "IDAKLUSolver", "rtol": 1e-8, "atol": 1e-10}
+
+# Step of the finite-difference baseline, in the log of each key
+FINITE_DIFFERENCE_STEP = 1e-4
+
+VOLTAGE_VARIABLE = "Voltage [V]"
+
+
+class Dataset:
+    """
+    Measured voltage of one protocol.
+
+    Parameters
+    ----------
+    t : array-like
+        Times of the measurements [s], from 0
+    voltage : array-like
+        Measured voltage [V]
+    overrides : dict, optional
+        Parameter updates of this protocol, e.g. its "Current function [A]" (a
+        number, or a function of time such as :class:`gitt.PulseCurrent`) and
+        "Ambient temperature [K]"
+    name : str, optional
+        Name of the dataset, e.g. "C/2, 25 degC"
+    """
+
+    def __init__(self, t, voltage, overrides=None, name=None):
+        self.t = np.asarray(t, dtype=float)
+        self.voltage = np.asarray(voltage, dtype=float)
+        if self.t.shape != self.voltage.shape:
+            raise ValueError("t and voltage must have the same shape")
+        self.overrides = dict(overrides or {})
+        self.name = name
+
+
+def input_name(parameter_values, key):
+    """Name of the input fitted for ``key``: the key, or its factor's name."""
+    return f"{key} factor" if callable(parameter_values[key]) else key
+
+
+def _scaled(function, name):
+    # ``function`` times the input ``name``
+    @functools.wraps(function)
+    def scaled(*args):
+        return pybamm.InputParameter(name) * function(*args)
+
+    return scaled
+
+
+def _fixed(function, factor):
+    # ``function`` times ``factor``
+    @functools.wraps(function)
+    def scaled(*args):
+        return factor * function(*args)
+
+    return scaled
+
+
+def fitted_parameter_values(parameter_values, parameters):
+    """
+    Copy of ``parameter_values`` with the values ``parameters`` (key -> value, or
+    factor for a function, as returned by :func:`fit`) in place.
+    """
+    parameter_values = copy_parameter_values(parameter_values)
+    parameter_values.update(
+        {
+            key: (
+                _fixed(parameter_values[key], value)
+                if callable(parameter_values[key])
+                else value
+            )
+            for key, value in parameters.items()
+        }
+    )
+    return parameter_values
+
+
+# State of a process solving datasets: the arguments of the fit, and the built
+# simulation and solver of each dataset it has solved
+_worker = {}
+
+
+def _init_worker(parameter_values, datasets, keys, options, model_class, settings):
+    _worker.clear()
+    _worker.update(
+        parameter_values=parameter_values,
+        datasets=datasets,
+        keys=keys,
+        options=options,
+        model_class=model_class,
+        settings=settings,
+        simulations={},
+    )
+
+
+def _simulation(index):
+    # the simulation of dataset ``index``, with the keys as inputs, and its solver
+    simulations = _worker["simulations"]
+    if index not in simulations:
+        parameter_values = copy_parameter_values(_worker["parameter_values"])
+        parameter_values.update(
+            _worker["datasets"][index].overrides, check_already_exists=False
+        )
+        numbers = []
+        for key in _worker["keys"]:
+            if callable(parameter_values[key]):
+                parameter_values.update(
+                    {key: _scaled(parameter_values[key], f"{key} factor")}
+                )
+            else:
+                numbers.append(key)
+        sim = build_simulation(
+            parameter_values,
+            numbers,
+            options=_worker["options"],
+            model_class=_worker["model_class"],
+        )
+        simulations[index] = sim, solver_profile.make_solver(_worker["settings"])
+    return simulations[index]
+
+
+def _solve_dataset(args):
+    # residual of dataset ``index`` at the input values, and its Jacobian
+    # (None without sensitivities). The solution also has the times the current
+    # switches at, twice; each measurement takes the last value at or before its
+    # time, so points after an early stop (e.g. at the voltage cut-off) keep the
+    # last voltage, with no sensitivity.
+    index, inputs, sensitivities = args
+    dataset = _worker["datasets"][index]
+    sim, solver = _simulation(index)
+    solution = sim.solve(
+        t_eval=[0, dataset.t[-1]],
+        t_interp=dataset.t,
+        inputs=inputs,
+        solver=solver,
+        calculate_sensitivities=sensitivities,
+    )
+    voltage = solution[VOLTAGE_VARIABLE]
+    points = np.searchsorted(solution.t, dataset.t, side="right") - 1
+    residual = np.asarray(voltage.entries).ravel()[points] - dataset.voltage
+    if not sensitivities:
+        return residual, None
+    reached = dataset.t <= solution.t[-1]
+    jacobian = np.zeros((len(dataset.t), len(inputs)))
+    for column, name in enumerate(inputs):
+        sensitivity = np.asarray(voltage.sensitivities[name]).ravel()
+        jacobian[reached, column] = sensitivity[points[reached]]
+    return residual, jacobian
+
+
+def fit(
+    parameter_values,
+    datasets,
+    bounds,
+    initial=None,
+    options=None,
+    model_class=None,
+    jacobian="sensitivities",
+    processes=None,
+    max_iterations=100,
+    settings=FIT_SOLVER,
+    verbose=False,
+):
+    """
+    Fit ``bounds``' keys of ``parameter_values`` to the voltage of ``datasets``.
+
+    Parameters
+    ----------
+    parameter_values : :class:`pybamm.ParameterValues`
+        Parameter set, with every key not fitted at its value
+    datasets : list of :class:`Dataset`
+        Measurements, solved in parallel
+    bounds : dict
+        Key -> (lower, upper) bounds of its value, or of its factor for a key whose
+        value is a function; both positive, lower below upper, and the starting
+        value between them
+    initial : dict, optional
+        Key -> starting value (or factor), defaults to the parameter set's value
+        (or 1)
+    options : dict, optional
+        Model options, defaults to :data:`run_helpers.COMPOSITE_OPTIONS`
+    model_class : class, optional
+        pybamm model class, defaults to :class:`pybamm.lithium_ion.DFN`
+    jacobian : str, optional
+        "sensitivities" (from the solver) or "finite differences" (forward
+        differences of the solutions, the baseline)
+    processes : int, optional
+        Number of worker processes. Defaults to the number of datasets, at most
+        the number of CPUs; 1 solves every dataset in this process.
+    max_iterations : int, optional
+        Largest number of residual evaluations of the optimizer, not counting
+        those of finite differences
+    settings : dict, optional
+        Solver settings, as in a solver profile (see solver_profile.py); an
+        IDAKLU solver for sensitivities
+    verbose : bool, optional
+        Whether to print each evaluation
+
+    Returns
+    -------
+    dict
+        "parameters" (key -> fitted value, or factor), "rmse [V]", "iterations"
+        (Jacobian evaluations of the optimizer, one per iteration), "residual
+        evaluations" (not counting those of finite differences), "solves" (of one
+        dataset each, all included), "seconds", "success" and "message" of the
+        optimizer
+
+    Raises
+    ------
+    ValueError
+        If ``bounds`` are not positive and ordered, or do not contain the starting
+        value of their key
+    """
+    if jacobian not in ("sensitivities", "finite differences"):
+        raise ValueError(
+            "jacobian must be 'sensitivities' or 'finite differences', "
+            f"not {jacobian!r}"
+        )
+    keys = list(bounds)
+    names = [input_name(parameter_values, key) for key in keys]
+    initial = initial or {}
+    start_values = np.array(
+        [
+            initial.get(
+                key, 1.0 if callable(parameter_values[key]) else parameter_values[key]
+            )
+            for key in keys
+        ],
+        dtype=float,
+    )
+    for key, start_value in zip(keys, start_values):
+        low, high = bounds[key]
+        if not 0 < low < high:
+            raise ValueError(
+                f"bounds of {key!r} must be positive with lower < upper, not "
+                f"{bounds[key]}"
+            )
+        if not low <= start_value <= high:
+            raise ValueError(
+                f"the starting value {start_value:g} of {key!r} is outside its "
+                f"bounds {bounds[key]}; give another in initial"
+            )
+    lower, upper = (
+        np.log(np.array([bounds[key][i] for key in keys], dtype=float) / start_values)
+        for i in (0, 1)
+    )
+    sensitivities = jacobian == "sensitivities"
+    initargs = (parameter_values, datasets, keys, options, model_class, settings)
+    processes = min(processes or os.cpu_count(), len(datasets))
+    counts = {"solves": 0}
+    last = {}
+
+    def evaluate(theta, solve_map):
+        # residuals and Jacobians of every dataset at ``theta``, kept for the
+        # Jacobian call that follows at the same point
+        if last.get("theta") is not None and np.array_equal(last["theta"], theta):
+            return last
+        values = start_values * np.exp(theta)
+        inputs = dict(zip(names, values))
+        tasks = [(index, inputs, sensitivities) for index in range(len(datasets))]
+        results = list(solve_map(_solve_dataset, tasks))
+        counts["solves"] += len(datasets)
+        last["theta"] = np.array(theta)
+        last["residual"] = np.concatenate([residual for residual, _ in results])
+        if sensitivities:
+            # d voltage / d log(value) = d voltage / d value * value
+            last["jacobian"] = np.vstack([j for _, j in results]) * values
+        if verbose:
+            rmse = np.sqrt(np.mean(last["residual"] ** 2))
+            print(
+                f"{counts['solves']:5d} solves, rmse {rmse * 1e3:8.4f} mV", flush=True
+            )
+        return last
+
+    def run(solve_map):
+        kwargs = {}
+        if sensitivities:
+            kwargs["jac"] = lambda theta: evaluate(theta, solve_map)["jacobian"]
+        else:
+            kwargs.update(jac="2-point", diff_step=FINITE_DIFFERENCE_STEP)
+        return optimize.least_squares(
+            lambda theta: evaluate(theta, solve_map)["residual"],
+            np.zeros(len(keys)),
+            bounds=(lower, upper),
+            max_nfev=max_iterations,
+            **kwargs,
+        )
+
+    start = timeit.default_timer()
+    if processes <= 1:
+        _init_worker(*initargs)
+        result = run(map)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=processes, initializer=_init_worker, initargs=initargs
+        ) as executor:
+            result = run(executor.map)
+    seconds = timeit.default_timer() - start
+    return {
+        "parameters": dict(zip(keys, (start_values * np.exp(result.x)).tolist())),
+        "rmse [V]": float(np.sqrt(np.mean(result.fun**2))),
+        "jacobian": jacobian,
+        "iterations": int(result.njev),
+        "residual evaluations": int(result.nfev),
+        "solves": counts["solves"],
+        "seconds": seconds,
+        "success": bool(result.success),
+        "message": result.message,
+    }
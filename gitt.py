@@ -0,0 +1,423 @@
+"""
+Multi-temperature GITT campaigns, as run in OCVTFit_GITT_test.ipynb.
+
+Temperature is a runtime input of one built simulation per worker process, so the
+model is processed and discretised once per worker, never per temperature, and
+each temperature comes back as a dict of plain arrays rather than a full Solution.
+
+Example::
+
+    from gitt import run_gitt
+    results = run_gitt(np.linspace(273.15, 313.15, 21))
+"""
+import numpy as np
+
+import pybamm
+
+from run_helpers import repeated_experiment, summary_name
+from sweep import run_sweep
+
+# Default model options and parameter set of the GITT notebook
+GITT_OPTIONS = {"thermal": "lumped"}
+GITT_PARAMETER_SET = "ORegan2022"
+
+# One GITT cycle: SOC resolution = 0.1C * 6min/60min = 1%
+GITT_STEPS = ("Discharge at C/10 for 6 minutes or until 2.5 V", "Rest for 2.5 hours")
+GITT_CYCLES = 100
+GITT_CUTOFF_VOLTAGE = 2.5
+
+# Slow discharge used in the notebook to approximate the OCV curve
+OCV_STEPS = ("Discharge at C/100 until 2.5 V",)
+
+# Both temperatures are driven by this single input. The experiment machinery owns
+# "Initial temperature [K]" and "Ambient temperature [K]", so they cannot be made
+# inputs under their own names.
+TEMPERATURE_INPUT = "Temperature [K]"
+
+GITT_OUTPUT_VARIABLES = [
+    "Time [s]",
+    "Current [A]",
+    "Terminal voltage [V]",
+    "Discharge capacity [A.h]",
+    "Total lithium capacity [A.h]",
+]
+
+# End-of-cycle values kept for every pulse by lean runs: a cycle ends with its rest
+GITT_SUMMARY_VARIABLES = [
+    "Time [s]",
+    "Terminal voltage [V]",
+    "Discharge capacity [A.h]",
+    "Total lithium capacity [A.h]",
+]
+
+
+def gitt_experiment(
+    steps=GITT_STEPS,
+    cycles=GITT_CYCLES,
+    stop_voltage=GITT_CUTOFF_VOLTAGE,
+    stop_soc=None,
+):
+    """
+    Experiment repeating the GITT ``steps`` for up to ``cycles`` cycles.
+
+    The run ends after the cycle that reaches ``stop_voltage`` (pass None to run
+    every cycle), or once the pulses have taken the cell below ``stop_soc``; see
+    :func:`run_helpers.repeated_experiment`.
+    """
+    return repeated_experiment(
+        steps, cycles, stop_voltage=stop_voltage, stop_soc=stop_soc
+    )
+
+
+def ocv_experiment(
+    steps=OCV_STEPS, cycles=GITT_CYCLES, stop_voltage=GITT_CUTOFF_VOLTAGE
+):
+    """Slow-discharge pseudo-OCV experiment, stopped at ``stop_voltage``."""
+    return repeated_experiment(steps, cycles, stop_voltage=stop_voltage)
+
+
+def temperature_parameter_values(parameter_values=None):
+    """
+    Copy of ``parameter_values`` whose initial and ambient temperatures both read
+    the :data:`TEMPERATURE_INPUT` input.
+    """
+    if parameter_values is None:
+        parameter_values = pybamm.ParameterValues(GITT_PARAMETER_SET)
+    else:
+        parameter_values = parameter_values.copy()
+    temperature = pybamm.InputParameter(TEMPERATURE_INPUT)
+    parameter_values.update(
+        {"Initial temperature [K]": temperature, "Ambient temperature [K]": temperature}
+    )
+    return parameter_values
+
+
+def run_gitt(
+    temperatures,
+    parameter_values=None,
+    experiment=None,
+    options=None,
+    output_variables=None,
+    initial_soc=1.0,
+    processes=None,
+    model=None,
+    cache=None,
+    store=None,
+    lean=False,
+):
+    """
+    Run the GITT experiment at each temperature, in parallel.
+
+    Parameters
+    ----------
+    temperatures : array-like
+        Temperatures [K]
+    parameter_values : :class:`pybamm.ParameterValues`, optional
+        Parameter set, defaults to :data:`GITT_PARAMETER_SET`
+    experiment : :class:`pybamm.Experiment`, optional
+        Defaults to :func:`gitt_experiment`
+    options : dict, optional
+        Model options, defaults to :data:`GITT_OPTIONS`
+    output_variables : list of str, optional
+        Variables kept per temperature, defaults to :data:`GITT_OUTPUT_VARIABLES`
+    initial_soc : float, optional
+        Initial state of charge, 1 by default
+    processes : int, optional
+        Number of worker processes, defaults to the number of CPUs
+    model : :class:`pybamm.BaseModel`, optional
+        Model to use instead of a DFN built from ``options``
+    cache : :class:`solution_cache.SolutionCache`, optional
+        Cache of results; temperatures already in it are not solved again
+    store : :class:`results_store.ResultsWriter`, optional
+        Store each temperature is written to as soon as it is solved
+    lean : bool, optional
+        Whether to solve in the lean mode of :func:`run_helpers.run_simulation`:
+        the end-of-rest values of :data:`GITT_SUMMARY_VARIABLES` are kept for
+        every pulse, which is all :func:`extract_ocv_points` needs, and, for an
+        experiment without a voltage stop (e.g.
+        ``gitt_experiment(stop_voltage=None, stop_soc=0.05)``), the
+        ``output_variables`` of the first and last pulses only
+
+    Returns
+    -------
+    list of dict or :class:`results_store.ResultsStore`
+        One dict per temperature, variable name -> array, plus
+        "Temperature [K]" and "Cycle end time [s]" (and, when lean, the other
+        "Cycle end ..." summaries)
+    """
+    temperatures = np.asarray(temperatures, dtype=float)
+
+    def add_temperature(point, result):
+        return {**result, "Temperature [K]": np.array(point[TEMPERATURE_INPUT])}
+
+    return run_sweep(
+        temperature_parameter_values(parameter_values),
+        [{TEMPERATURE_INPUT: T} for T in temperatures],
+        experiment=gitt_experiment() if experiment is None else experiment,
+        options=GITT_OPTIONS if options is None else options,
+        output_variables=(
+            GITT_OUTPUT_VARIABLES if output_variables is None else output_variables
+        ),
+        processes=processes,
+        inputs=True,
+        solve_kwargs={"initial_soc": initial_soc},
+        model=model,
+        cache=cache,
+        store=store,
+        postprocess=add_temperature,
+        lean=lean,
+        summary_variables=GITT_SUMMARY_VARIABLES,
+    )
+
+
+def state_of_charge(result):
+    """SOC trace of one GITT result, 1 - Q / C as in the notebook."""
+    capacity = result["Total lithium capacity [A.h]"][0]  # assumed constant
+    return 1 - result["Discharge capacity [A.h]"] / capacity
+
+
+class PulseCurrent:
+    """
+    Piecewise-constant GITT current, usable as "Current function [A]".
+
+    The current is ``pulse_current`` during the first ``pulse_duration`` seconds of
+    each of the ``pulses`` periods and zero otherwise. It is written as a sum of
+    Heaviside steps in ``t`` with fixed switching times, which pybamm turns into
+    solver breakpoints, so the whole protocol integrates in one solve.
+
+    Parameters
+    ----------
+    pulse_current : float
+        Pulse current [A], positive for discharge
+    pulse_duration : float
+        Pulse duration [s]
+    rest_duration : float
+        Rest duration [s]
+    pulses : int
+        Number of pulse/rest periods
+    """
+
+    def __init__(self, pulse_current, pulse_duration, rest_duration, pulses):
+        self.pulse_current = pulse_current
+        self.pulse_duration = pulse_duration
+        self.rest_duration = rest_duration
+        self.pulses = pulses
+
+    @property
+    def segments(self):
+        """(pulses, 3) array of pulse start, pulse end and rest end times [s]."""
+        start = np.arange(self.pulses) * (self.pulse_duration + self.rest_duration)
+        return np.column_stack(
+            [
+                start,
+                start + self.pulse_duration,
+                start + self.pulse_duration + self.rest_duration,
+            ]
+        )
+
+    @property
+    def end_time(self):
+        return self.pulses * (self.pulse_duration + self.rest_duration)
+
+    def __call__(self, t):
+        on = 0
+        for start, end, _ in self.segments:
+            # Heaviside steps evaluate to booleans, hence the scaling
+            on = on + 1.0 * (t >= start) - 1.0 * (t >= end)
+        return self.pulse_current * on
+
+
+def gitt_pulse_protocol(
+    parameter_values,
+    c_rate=0.1,
+    pulse_duration=360,
+    rest_duration=9000,
+    pulses=GITT_CYCLES,
+    cutoff_voltage=GITT_CUTOFF_VOLTAGE,
+):
+    """
+    Compile a GITT protocol into the parameter set, instead of an experiment.
+
+    Parameters
+    ----------
+    parameter_values : :class:`pybamm.ParameterValues`
+        Parameter set, updated in place with the pulse current and cut-off
+    c_rate : float, optional
+        Pulse C-rate, relative to "Nominal cell capacity [A.h]"
+    pulse_duration, rest_duration : float, optional
+        Pulse and rest durations [s], 6 minutes and 2.5 hours by default
+    pulses : int, optional
+        Number of pulses
+    cutoff_voltage : float, optional
+        Lower voltage cut-off [V]; reaching it ends the solve
+
+    Returns
+    -------
+    :class:`PulseCurrent`
+        The current function, whose :attr:`~PulseCurrent.segments` give the pulse
+        and rest boundaries
+    """
+    current = PulseCurrent(
+        c_rate * parameter_values["Nominal cell capacity [A.h]"],
+        pulse_duration,
+        rest_duration,
+        pulses,
+    )
+    parameter_values.update(
+        {"Current function [A]": current, "Lower voltage cut-off [V]": cutoff_voltage}
+    )
+    return current
+
+
+def run_gitt_fast(
+    temperatures,
+    parameter_values=None,
+    options=None,
+    output_variables=None,
+    initial_soc=1.0,
+    processes=None,
+    model=None,
+    points_per_segment=20,
+    cache=None,
+    store=None,
+    **protocol,
+):
+    """
+    Same campaign as :func:`run_gitt`, with the protocol compiled by
+    :func:`gitt_pulse_protocol` so each temperature is a single solve.
+
+    Extra keyword arguments are passed to :func:`gitt_pulse_protocol`. Unlike the
+    experiment, the solve stops as soon as the cut-off is reached, without the
+    final rest. Results are sampled at ``points_per_segment`` points per pulse and
+    per rest, always including the segment boundaries; "Cycle end time [s]" holds
+    the rest end times reached, as for :func:`run_gitt`.
+
+    Returns
+    -------
+    list of dict
+        One dict per temperature, variable name -> array
+    """
+    temperatures = np.asarray(temperatures, dtype=float)
+    parameter_values = temperature_parameter_values(parameter_values)
+    current = gitt_pulse_protocol(parameter_values, **protocol)
+    boundaries = np.concatenate([[0], current.segments[:, 1:].ravel()])
+    t_interp = np.unique(
+        np.concatenate(
+            [
+                np.linspace(start, end, points_per_segment)
+                for start, end in zip(boundaries[:-1], boundaries[1:])
+            ]
+        )
+    )
+    rest_end = current.segments[:, 2]
+
+    def add_temperature(point, result):
+        return {
+            **result,
+            "Cycle end time [s]": rest_end[rest_end <= result["Time [s]"][-1]],
+            "Temperature [K]": np.array(point[TEMPERATURE_INPUT]),
+        }
+
+    return run_sweep(
+        parameter_values,
+        [{TEMPERATURE_INPUT: T} for T in temperatures],
+        t_eval=[0, current.end_time],
+        options=GITT_OPTIONS if options is None else options,
+        output_variables=(
+            GITT_OUTPUT_VARIABLES if output_variables is None else output_variables
+        ),
+        processes=processes,
+        inputs=True,
+        solve_kwargs={"initial_soc": initial_soc, "t_interp": t_interp},
+        model=model,
+        cache=cache,
+        store=store,
+        postprocess=add_temperature,
+    )
+
+
+def _gitt_arrays(result, voltage_variable):
+    # full Solutions are evaluated once here, compact results are used as they are
+    names = [
+        "Time [s]",
+        "Current [A]",
+        voltage_variable,
+        "Discharge capacity [A.h]",
+        "Total lithium capacity [A.h]",
+    ]
+    if isinstance(result, pybamm.Solution):
+        return [np.asarray(result[name].entries) for name in names]
+    return [np.asarray(result[name]) for name in names]
+
+
+def rest_end_indices(current, rest_tolerance=1e-6):
+    """
+    Indices of the last point of every rest segment of a current trace.
+
+    A point is at rest when ``|current|`` is below ``rest_tolerance`` times the
+    largest current magnitude; a rest segment ends where the next point is not at
+    rest, or at the end of the trace.
+    """
+    current = np.abs(np.asarray(current))
+    rest = current <= rest_tolerance * current.max()
+    end = rest.copy()
+    end[:-1] &= ~rest[1:]
+    return np.flatnonzero(end)
+
+
+def extract_ocv_points(
+    results, voltage_variable="Terminal voltage [V]", rest_tolerance=1e-6
+):
+    """
+    End-of-rest OCV points of GITT runs, for all temperatures at once.
+
+    As in the notebook, the points are the initial state followed by the last point
+    of every rest, with SOC = 1 - Q / C. Each variable is read once per run and the
+    rest ends are found from the current trace, see :func:`rest_end_indices`; for
+    lean results of :func:`run_gitt` they are the "Cycle end ..." summaries.
+
+    Parameters
+    ----------
+    results : list or :class:`results_store.ResultsStore`
+        :class:`pybamm.Solution` objects or compact results from :func:`run_gitt`
+        / :func:`run_gitt_fast` (a single one is also accepted)
+    voltage_variable : str, optional
+        Voltage to read the OCV from
+    rest_tolerance : float, optional
+        Relative current threshold for a point to count as rest
+
+    Returns
+    -------
+    dict
+        "SOC", "OCV [V]" and "Time [s]", each an array of shape
+        (number of runs, most points in a run), padded with NaN, and
+        "Number of points", the points found in each run
+    """
+    if isinstance(results, (dict, pybamm.Solution)):
+        results = [results]
+    points = []
+    for result in results:
+        t, current, voltage, Q, C = _gitt_arrays(result, voltage_variable)
+        if isinstance(result, dict) and summary_name(voltage_variable) in result:
+            # lean run: the initial state, then the end of every cycle's rest
+            t = np.concatenate([t[:1], result["Cycle end time [s]"]])
+            end_voltage = result[summary_name(voltage_variable)]
+            voltage = np.concatenate([voltage[:1], end_voltage])
+            Q = np.concatenate([Q[:1], result["Cycle end discharge capacity [A.h]"]])
+            points.append((1 - Q / C[0], voltage, t))
+            continue
+        index = np.concatenate([[0], rest_end_indices(current, rest_tolerance)])
+        index = np.unique(index)
+        points.append((1 - Q[index] / C[0], voltage[index], t[index]))
+
+    n_points = np.array([len(soc) for soc, _, _ in points])
+    out = {
+        name: np.full((len(points), n_points.max()), np.nan)
+        for name in ["SOC", "OCV [V]", "Time [s]"]
+    }
+    for i, (soc, ocv, t) in enumerate(points):
+        out["SOC"][i, : len(soc)] = soc
+        out["OCV [V]"][i, : len(ocv)] = ocv
+        out["Time [s]"][i, : len(t)] = t
+    out["Number of points"] = n_points
+    return out
@@ -0,0 +1,321 @@
+"""
+Mesh convergence study of the composite model: the fewest points per domain,
+through the cell and in each particle phase, that keep the voltage and the
+open-circuit potentials within a tolerance of a fine reference.
+
+The graphite and silicon phases need very different radial resolution, and the
+defaults (20 points everywhere) are paid for in every domain. The reference
+mesh has :data:`REFERENCE_SCALE` times the default points; the study and the
+reference are solved at tight tolerances, so that the differences measured are
+the mesh's. Each domain is coarsened on its own first, the others at the
+reference, to the fewest of :data:`POINTS` within half the tolerance; the
+domains are then combined, and the one with the largest error refined until the
+whole mesh is within the tolerance. Domains that do not change the size of the
+model (e.g. the cell domains of the SPM) are left at their default.
+
+The mesh is stored in the mesh profile (see mesh_profile.py), with its size and
+solve time against the default mesh, and the run helpers then use it for every
+run of that model with that parameter set (and OCPs).
+
+Example (CLI)::
+
+    python mesh_convergence.py --parameter-set OG --tolerance 1e-3
+    python mesh_profile.py info
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+import pybamm
+
+import Durdel2023_composite  # noqa: F401, registers "final", "test" and "OG"
+import mesh_profile
+import parameter_sets
+import solver_profile
+from autotune import PROTOCOL, voltage_error
+from ocp_data import select_ocp
+from run_helpers import DEFAULT_OUTPUT_VARIABLES, composite_model, model_identity
+
+# Domains studied: the electrodes and separator through the cell, and the radius
+# of the graphite (primary) and silicon (secondary) particles and of the NCA ones
+DOMAINS = ["x_n", "x_s", "x_p", "r_n_prim", "r_n_sec", "r_p"]
+
+# Points tried in each domain, fewest first
+POINTS = [3, 5, 8, 10, 15, 20, 30]
+
+# Reference points, as multiples of the model's defaults
+REFERENCE_SCALE = 2
+
+# Solver of the study, tight enough for its error to be small against the mesh's
+STUDY_SOLVER = {"class": "IDAKLUSolver", "rtol": 1e-7, "atol": 1e-9}
+
+# Potentials compared with the reference: the voltage and the open-circuit
+# potentials of both phases and of the positive electrode
+ERROR_VARIABLES = [name for name in DEFAULT_OUTPUT_VARIABLES if name != "Time [s]"]
+
+
+def model_size(model, parameter_values, var_pts):
+    """Number of states of ``model`` discretised on ``var_pts``."""
+    sim = pybamm.Simulation(model, parameter_values=parameter_values, var_pts=var_pts)
+    sim.build()
+    built_model = sim.built_model
+    return int(
+        built_model.concatenated_rhs.size + built_model.concatenated_algebraic.size
+    )
+
+
+def mesh_error(solution, reference):
+    """Largest difference [V] of :data:`ERROR_VARIABLES`, see autotune.py."""
+    return max(voltage_error(solution, reference, name) for name in ERROR_VARIABLES)
+
+
+def _solve(model, parameter_values, experiment, var_pts, settings, repeats=1):
+    # median wall time of ``repeats`` solves, and the last solution
+    seconds = []
+    for _ in range(repeats):
+        sim = pybamm.Simulation(
+            model,
+            parameter_values=parameter_values,
+            experiment=experiment,
+            var_pts=var_pts,
+            solver=None if settings is None else solver_profile.make_solver(settings),
+        )
+        start = timeit.default_timer()
+        solution = sim.solve()
+        seconds.append(timeit.default_timer() - start)
+    return float(np.median(seconds)), solution
+
+
+def study(
+    parameter_values,
+    options=None,
+    model_class=None,
+    protocol=PROTOCOL,
+    tolerance=1e-3,
+    domains=DOMAINS,
+    points=POINTS,
+    reference_scale=REFERENCE_SCALE,
+    repeats=1,
+    verbose=True,
+    name=None,
+):
+    """
+    Find the coarsest mesh within ``tolerance`` of the reference on ``protocol``.
+
+    Parameters
+    ----------
+    parameter_values : :class:`pybamm.ParameterValues`
+        Parameter set to study
+    options : dict, optional
+        Model options, defaults to :data:`run_helpers.COMPOSITE_OPTIONS`
+    model_class : class, optional
+        pybamm model class, defaults to :class:`pybamm.lithium_ion.DFN`
+    protocol : tuple of str, optional
+        Experiment steps, defaults to :data:`autotune.PROTOCOL`
+    tolerance : float, optional
+        Largest error [V] of the voltage and open-circuit potentials accepted
+    domains : list of str, optional
+        Domains to coarsen, keys of ``var_pts``
+    points : list of int, optional
+        Points tried in each domain, fewest first
+    reference_scale : int, optional
+        Reference points, as multiples of the model's defaults
+    repeats : int, optional
+        Solves of the chosen and default meshes timed with the run solver; the
+        median time is kept
+    verbose : bool, optional
+        Whether to print each trial
+    name : str, optional
+        Name of the parameter set, recorded in the entry
+
+    Returns
+    -------
+    dict
+        Profile entry, for :func:`mesh_profile.save_entry`
+
+    Raises
+    ------
+    ValueError
+        If the reference does not run the whole protocol
+    """
+    model = composite_model(options, model_class)
+    experiment = pybamm.Experiment([tuple(protocol)])
+    defaults = model.default_var_pts
+    reference_points = {
+        domain: defaults[domain] * reference_scale for domain in domains
+    }
+    _, reference = _solve(
+        model,
+        parameter_values,
+        experiment,
+        {**defaults, **reference_points},
+        STUDY_SOLVER,
+    )
+    if len(reference.cycles[0].steps) != len(protocol):
+        raise ValueError("the reference solve stopped early: choose another protocol")
+    reference_size = model_size(
+        model, parameter_values, {**defaults, **reference_points}
+    )
+    trials = []
+
+    def trial(mesh, label):
+        # error of the mesh with the points of ``mesh``, recorded
+        var_pts = {**defaults, **mesh}
+        result = {"var_pts": dict(mesh)}
+        result["size"] = model_size(model, parameter_values, var_pts)
+        try:
+            result["seconds"], solution = _solve(
+                model, parameter_values, experiment, var_pts, STUDY_SOLVER
+            )
+        except (pybamm.SolverError, RuntimeError, ValueError) as exception:
+            result["failed"] = str(exception).splitlines()[0]
+            error = np.inf
+        else:
+            error = mesh_error(solution, reference)
+            if np.isfinite(error):
+                result["error [V]"] = float(error)
+            else:
+                result["failed"] = "stopped early"
+        trials.append(result)
+        if verbose:
+            if "failed" in result:
+                outcome = "failed: " + result["failed"]
+            else:
+                outcome = (
+                    f"{result['size']:6d} states, {result['seconds']:7.3f} s, "
+                    f"error {error * 1e3:8.3f} mV"
+                )
+            if label == "combined":
+                outcome += f", {mesh}"
+            print(f"{label:16s} {outcome}", flush=True)
+        return error
+
+    def finer(domain, count):
+        # next count of ``domain`` after ``count``, up to its reference
+        more = [n for n in points if count < n < reference_points[domain]]
+        return more[0] if more else reference_points[domain]
+
+    # each domain on its own, the others at the reference
+    chosen, errors = {}, {}
+    for domain in domains:
+        coarser = [n for n in points if n < reference_points[domain]]
+        if not coarser:
+            continue
+        mesh = {**reference_points, domain: coarser[0]}
+        if model_size(model, parameter_values, {**defaults, **mesh}) == reference_size:
+            # not discretised in this model
+            continue
+        for count in coarser:
+            error = trial({**reference_points, domain: count}, f"{domain} {count}")
+            if error <= tolerance / 2:
+                break
+        else:
+            count, error = reference_points[domain], 0.0
+        chosen[domain], errors[domain] = count, error
+
+    # all together, refining the worst domain until the mesh is accurate enough
+    while True:
+        error = trial(chosen, "combined")
+        coarse = [d for d in chosen if chosen[d] < reference_points[d]]
+        if error <= tolerance or not coarse:
+            break
+        worst = max(coarse, key=errors.get)
+        chosen[worst] = finer(worst, chosen[worst])
+        if chosen[worst] < reference_points[worst]:
+            errors[worst] = trial(
+                {**reference_points, worst: chosen[worst]}, f"{worst} {chosen[worst]}"
+            )
+        else:
+            errors[worst] = 0.0
+
+    # what runs gain, with the solver they use
+    identity = model_identity(options, model_class=model_class)
+    settings = solver_profile.lookup(identity, parameter_values)
+    default_seconds, _ = _solve(
+        model, parameter_values, experiment, defaults, settings, repeats
+    )
+    seconds, _ = _solve(
+        model, parameter_values, experiment, {**defaults, **chosen}, settings, repeats
+    )
+    model_class, model_options = identity
+    return {
+        "model": f"{model_class.__name__} {model_options}",
+        "parameter set": name,
+        "protocol": list(protocol),
+        "tolerance [V]": tolerance,
+        "reference var_pts": reference_points,
+        "var_pts": chosen,
+        "error [V]": float(error),
+        "size": model_size(model, parameter_values, {**defaults, **chosen}),
+        "default size": model_size(model, parameter_values, defaults),
+        "seconds": seconds,
+        "default seconds": default_seconds,
+        "pybamm": pybamm.__version__,
+        "trials": trials,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--parameter-set", default="OG")
+    parser.add_argument(
+        "--ocp",
+        choices=["table", "surrogate"],
+        default="table",
+        help="tabulated OCPs, or their analytic surrogates (see ocp_data.py)",
+    )
+    parser.add_argument(
+        "--model",
+        choices=["SPM", "SPMe", "DFN"],
+        default="DFN",
+        help="model class, with the composite options",
+    )
+    parser.add_argument(
+        "--step",
+        action="append",
+        default=[],
+        help="protocol step, can be repeated; defaults to autotune.PROTOCOL",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1e-3,
+        help="largest error [V] of the voltage and open-circuit potentials",
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument(
+        "--path", default=None, help="profile file, see mesh_profile.py"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="print the trials, save nothing"
+    )
+    args = parser.parse_args(argv)
+
+    model_class = getattr(pybamm.lithium_ion, args.model)
+    parameter_values = select_ocp(
+        parameter_sets.parameter_values(args.parameter_set), args.ocp
+    )
+    entry = study(
+        parameter_values,
+        model_class=model_class,
+        protocol=tuple(args.step) or PROTOCOL,
+        tolerance=args.tolerance,
+        repeats=args.repeats,
+        name=args.parameter_set,
+    )
+    print(
+        f"coarsest mesh within {args.tolerance * 1e3:g} mV: {entry['var_pts']}, "
+        f"error {entry['error [V]'] * 1e3:.3f} mV, {entry['size']} states "
+        f"against {entry['default size']} and {entry['seconds']:.3f} s against "
+        f"{entry['default seconds']:.3f} s for the default mesh"
+    )
+    if not args.dry_run:
+        mesh_profile.save_entry(
+            model_identity(model_class=model_class), parameter_values, entry, args.path
+        )
+        print("saved to " + (args.path or mesh_profile.profile_path()))
+
+
+if __name__ == "__main__":
+    main()
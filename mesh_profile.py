@@ -0,0 +1,123 @@
+"""
+Mesh profile: the points per domain :mod:`mesh_convergence` found sufficient for
+a model and parameter set, used by the run helpers for every run of that model
+with that parameter set.
+
+The profile is a JSON file with one entry per model and parameter set, keyed
+and looked up like the solver profile (see solver_profile.py), sweep points by
+their base set, so that it no longer applies once the model, the parameter
+values or the pybamm version change: the mesh a tolerance needs depends on the
+concentrations, diffusivities and OCP slopes, so runs with other parameter
+values get the model's default mesh, with a warning if the model has entries
+for other parameter values. Each entry holds
+the points of the domains studied under "var_pts", e.g.::
+
+    {"x_n": 10, "x_s": 5, "x_p": 10, "r_n_prim": 15, "r_n_sec": 5, "r_p": 30}
+
+which replace the model's defaults, with the measurements that chose them: the
+parameter set and protocol studied, the accuracy required, the error, size and
+solve time of the mesh against the default one, and every trial.
+
+:func:`run_helpers.run_simulation`, :func:`run_helpers.build_simulation` and the
+sweeps look the model and parameter values up here, and discretise the model with
+the profiled points if there are any. The profile is read from
+~/.cache/LiSi/mesh_profile.json, or the path in the LISI_MESH_PROFILE environment
+variable; set it to an empty string to run with pybamm's default meshes.
+
+Inspect or clear the profile (CLI)::
+
+    python mesh_profile.py info
+    python mesh_profile.py clear
+"""
+import argparse
+import os
+
+import solver_profile
+
+DEFAULT_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "LiSi", "mesh_profile.json"
+)
+
+KIND = "mesh profile"
+
+
+def profile_path():
+    """Path of the profile in use, or None if profiles are switched off."""
+    return os.environ.get("LISI_MESH_PROFILE", DEFAULT_PATH) or None
+
+
+def model_key(model, parameter_values):
+    """
+    Profile key of ``model`` with ``parameter_values``, as for
+    :func:`solver_profile.model_key`.
+    """
+    return solver_profile.model_key(model, parameter_values, KIND)
+
+
+def lookup(model, parameter_values, path=None):
+    """
+    Points per domain profiled for ``model`` with ``parameter_values`` (see
+    :func:`model_key`), or None.
+    """
+    path = profile_path() if path is None else path
+    if path is None:
+        return None
+    entries = solver_profile.load(path)
+    if not entries:
+        return None
+    entry = solver_profile.find_entry(entries, model, parameter_values, KIND)
+    return None if entry is None else entry["var_pts"]
+
+
+def var_pts(model, parameter_values, built_model, path=None):
+    """
+    Points of every domain of ``built_model`` (``model`` and ``parameter_values``
+    are what it is looked up by): its defaults, with the profiled ones in their
+    place; None if there is no profile for it.
+    """
+    points = lookup(model, parameter_values, path)
+    if points is None:
+        return None
+    return {**built_model.default_var_pts, **points}
+
+
+def save_entry(model, parameter_values, entry, path=None):
+    """
+    Store the mesh study ``entry`` of ``model`` with ``parameter_values``,
+    replacing any previous one.
+    """
+    path = profile_path() if path is None else path
+    if path is None:
+        raise ValueError("LISI_MESH_PROFILE is empty: profiles are switched off")
+    entries = dict(solver_profile.load(path))
+    solver_profile.add_entry(entries, model, parameter_values, entry, KIND)
+    solver_profile.write_entries(path, entries)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("command", choices=["info", "clear"])
+    parser.add_argument("--path", default=None)
+    args = parser.parse_args(argv)
+    path = profile_path() if args.path is None else args.path
+    if path is None:
+        print("mesh profiles are switched off (LISI_MESH_PROFILE is empty)")
+        return
+    entries = solver_profile.load(path)
+    if args.command == "clear":
+        if os.path.exists(path):
+            os.remove(path)
+        print(f"removed {len(entries)} entries from {path}")
+        return
+    print(f"{path}: {len(entries)} entries")
+    for key, entry in entries.items():
+        print(
+            f"{key[:12]}  {entry['model']}, studied on {entry['parameter set']!r}: "
+            f"{entry['var_pts']}, {entry['size']} states against "
+            f"{entry['default size']}, {entry['seconds']:.2f} s against "
+            f"{entry['default seconds']:.2f} s, error {entry['error [V]'] * 1e3:.3f} mV"
+        )
+
+
+if __name__ == "__main__":
+    main()
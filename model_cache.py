@@ -0,0 +1,118 @@
+"""
+On-disk cache of parameterised and discretised models, ready to solve.
+
+Building the composite DFN, processing its parameters and discretising it is paid
+again by every process, and by every worker of a sweep. This cache stores the
+discretised model (pickled, a few hundred KiB to a few MiB) under a hash of what
+it is built from: the model class, options and submodels, the parameter values
+(functions by their source, as for the solution cache, so editing a parameter
+function gives a new key), the mesh points, and the pybamm version. Later
+processes load it instead of rebuilding it.
+
+Only models solved over ``t_eval`` can be reused this way: experiments rebuild a
+model per step, and ``initial_soc`` re-processes the parameters.
+
+Example::
+
+    from model_cache import ModelCache
+    results = run_sweep(param, overrides, t_eval=[0, 10000], inputs=True,
+                        model_cache=ModelCache())
+
+Inspect or clear the cache (CLI)::
+
+    python model_cache.py info
+    python model_cache.py clear
+"""
+import os
+import pickle
+
+import pybamm
+
+from run_helpers import COMPOSITE_OPTIONS, composite_model
+from solution_cache import SolutionCache, cache_cli
+
+# Cache directory, unless given explicitly or by the LISI_MODEL_CACHE variable
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "LiSi", "models")
+
+
+class ModelCache(SolutionCache):
+    """
+    Directory of discretised models, keyed by :func:`solution_cache.content_hash`.
+
+    Parameters
+    ----------
+    directory : str, optional
+        Cache directory, defaults to the LISI_MODEL_CACHE environment variable or
+        :data:`DEFAULT_DIRECTORY`
+    max_bytes : int, optional
+        Size the directory is kept under, 1 GiB by default
+    """
+
+    suffix = ".pkl"
+    environment_variable = "LISI_MODEL_CACHE"
+    default_directory = DEFAULT_DIRECTORY
+
+    def _read(self, f):
+        # only ever files this class wrote to its own directory
+        return pickle.load(f)
+
+    def _write(self, f, model):
+        pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def model_key(self, parameter_values, options=None, model=None, var_pts=None):
+        """Key of the model :meth:`discretised_model` returns for these arguments."""
+        if model is None:
+            options = COMPOSITE_OPTIONS if options is None else options
+            model = (pybamm.lithium_ion.DFN, options)
+        return self.key(
+            kind="discretised model",
+            model=model,
+            parameter_values=parameter_values,
+            var_pts=var_pts,
+        )
+
+    def discretised_model(
+        self, parameter_values, options=None, model=None, var_pts=None
+    ):
+        """
+        The composite model with ``options`` (or ``model``), processed with
+        ``parameter_values`` and discretised, from the cache if it is there.
+
+        Parameters
+        ----------
+        parameter_values : :class:`pybamm.ParameterValues`
+            Parameter values, with any runtime inputs already set, e.g. by
+            :func:`run_helpers.input_parameter_values`
+        options : dict, optional
+            Model options, defaults to :data:`run_helpers.COMPOSITE_OPTIONS`
+        model : :class:`pybamm.BaseModel`, optional
+            Built model to use instead of one built from ``options``
+        var_pts : dict, optional
+            Mesh points, defaults to the model's
+
+        Returns
+        -------
+        :class:`pybamm.BaseModel`
+            Discretised model, which :class:`pybamm.Simulation` solves without
+            building it again
+        """
+        key = self.model_key(parameter_values, options, model, var_pts)
+        discretised = self.get(key)
+        if discretised is None:
+            sim = pybamm.Simulation(
+                composite_model(options) if model is None else model,
+                parameter_values=parameter_values,
+                var_pts=var_pts,
+            )
+            sim.build()
+            discretised = sim.built_model
+            self.put(key, discretised)
+        return discretised
+
+
+def main(argv=None):
+    cache_cli(ModelCache, __doc__.split("\n\n")[0], argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,501 @@
+"""
+Digitised open-circuit potential tables of the Durdel2023 parameter sets.
+
+The tables are read-only module constants, built once at import and shared by
+Durdel2023_single.py and Durdel2023_composite.py. :func:`ocp_interpolant` builds
+the :class:`pybamm.Interpolant` of a table once, then copies it onto every new
+stoichiometry symbol, so processing a parameter set no longer rebuilds the
+arrays and re-hashes their data on each call of an OCP function.
+
+The digitised silicon and NCA curves are not usable as they are: the silicon
+delithiation points are out of order and several stoichiometries are repeated.
+:func:`condition_table` sorts, merges and makes them monotone, and they are
+interpolated with a shape-preserving PCHIP, whose derivative is continuous,
+instead of piecewise-linear segments whose kinks show up in the Jacobian.
+
+Each table also has a smooth analytic surrogate in :data:`OCP_SURROGATES`, with
+a bound of its error. :func:`select_ocp` picks tables or surrogates for a run.
+
+pybamm is only imported when a symbolic expression is first built, so that the
+tables, and OCPs evaluated on numbers or arrays, load without it.
+"""
+import functools
+import numbers
+import warnings
+
+import numpy as np
+
+
+def _read_only(values):
+    array = np.array(values)
+    array.flags.writeable = False
+    return array
+
+
+# Silicon lithiation and delithiation branches, digitised from Durdel2023
+silicon_lith_ocp_sto = _read_only([
+    0.03869, 0.03965, 0.04061, 0.04158, 0.04158, 0.0435, 0.0435, 0.04447,
+    0.0464, 0.04736, 0.05025, 0.05121, 0.05411, 0.05989, 0.06663, 0.07434,
+    0.08013, 0.09555, 0.10229, 0.11386, 0.12831, 0.13892, 0.14566, 0.15723,
+    0.17265, 0.17747, 0.18999, 0.2006, 0.21216, 0.22758, 0.23818, 0.24493,
+    0.25553, 0.26517, 0.2748, 0.29119, 0.29601
+])
+silicon_lith_ocp_volt = _read_only([
+    0.994, 0.9, 0.714, 0.62, 0.572, 0.54, 0.526, 0.504, 0.48, 0.456, 0.434,
+    0.412, 0.388, 0.356, 0.338, 0.322, 0.318, 0.306, 0.304, 0.298, 0.288, 0.282,
+    0.278, 0.274, 0.264, 0.262, 0.258, 0.252, 0.248, 0.238, 0.232, 0.23, 0.222,
+    0.214, 0.204, 0.19, 0.184
+])
+
+silicon_delith_ocp_sto = _read_only([
+    0.03676, 0.0329, 0.03001, 0.02712, 0.02519, 0.02423, 0.0223, 0.02134,
+    0.02037, 0.01941, 0.01845, 0.01748, 0.03985, 0.04254, 0.04736, 0.05218,
+    0.057, 0.06374, 0.07049, 0.0782, 0.08687, 0.09651, 0.10615, 0.11579,
+    0.12542, 0.13506, 0.1447, 0.15434, 0.16397, 0.17361, 0.18325, 0.19289,
+    0.20252, 0.21216, 0.2218, 0.23144, 0.24107, 0.25071, 0.26035, 0.26999,
+    0.27962, 0.28637, 0.29215, 0.29601, 0.2989, 0.30083, 0.30275, 0.30468,
+    0.30661, 0.30661
+])
+silicon_delith_ocp_volt = _read_only([
+    0.77, 0.79, 0.81, 0.83, 0.85, 0.87, 0.89, 0.91, 0.93, 0.95, 0.97, 0.99,
+    0.75333, 0.736, 0.716, 0.696, 0.676, 0.656, 0.636, 0.616, 0.596, 0.576,
+    0.558, 0.542, 0.53, 0.518, 0.506, 0.496, 0.488, 0.48, 0.474, 0.466, 0.458,
+    0.452, 0.442, 0.434, 0.424, 0.412, 0.4, 0.386, 0.366, 0.346, 0.326, 0.306,
+    0.286, 0.266, 0.246, 0.226, 0.206, 0.186
+])
+
+# NCA lithiation and delithiation branches, digitised from Durdel2023
+nca_lith_ocp_sto = _read_only([
+    0.13933, 0.14801, 0.15765, 0.16729, 0.17694, 0.18658, 0.19622, 0.20587,
+    0.21551, 0.22515, 0.2348, 0.24444, 0.25409, 0.26373, 0.27337, 0.28302,
+    0.29266, 0.3023, 0.31195, 0.32159, 0.33124, 0.34088, 0.35052, 0.36017,
+    0.36981, 0.37945, 0.3891, 0.39874, 0.40838, 0.41803, 0.42767, 0.43732,
+    0.44696, 0.4566, 0.46625, 0.47589, 0.48553, 0.49518, 0.50482, 0.51447,
+    0.52411, 0.53375, 0.5434, 0.55304, 0.56268, 0.57233, 0.58197, 0.59161,
+    0.60126, 0.6109, 0.62055, 0.63019, 0.63983, 0.64948, 0.65912, 0.66876,
+    0.67841, 0.6977, 0.70734, 0.71698, 0.72663, 0.73627, 0.74591, 0.75556,
+    0.7652, 0.77484, 0.78449, 0.79614, 0.80763, 0.81728, 0.82692, 0.83656,
+    0.84621, 0.85585, 0.8655, 0.87803, 0.8896, 0.89346, 0.89635, 0.89828,
+    0.89925, 0.90214
+])
+nca_lith_ocp_volt = _read_only([
+    4.37849, 4.33843, 4.30638, 4.27433, 4.2503, 4.23027, 4.21424, 4.19822,
+    4.1822, 4.16617, 4.15015, 4.13412, 4.1181, 4.10208, 4.08605, 4.07003,
+    4.05401, 4.04199, 4.02997, 4.01795, 4.00193, 3.98991, 3.97789, 3.96988,
+    3.95786, 3.94585, 3.93383, 3.92181, 3.90979, 3.89777, 3.88576, 3.87374,
+    3.86172, 3.8497, 3.83769, 3.82567, 3.81365, 3.80564, 3.79763, 3.78961,
+    3.7816, 3.77359, 3.76558, 3.75757, 3.74955, 3.74154, 3.73353, 3.72953,
+    3.72151, 3.71751, 3.7095, 3.70148, 3.69347, 3.68947, 3.68145, 3.66944,
+    3.65742, 3.64139, 3.63338, 3.62537, 3.61736, 3.60935, 3.60134, 3.59332,
+    3.58531, 3.58131, 3.57329, 3.56528, 3.56128, 3.55326, 3.54926, 3.54525,
+    3.54125, 3.53323, 3.51721, 3.46113, 3.38501, 3.29688, 3.21677, 3.15668,
+    3.12062, 3.01246
+])
+
+nca_delith_ocp_sto = _read_only([
+    0.13762, 0.14125, 0.1509, 0.16054, 0.17019, 0.17983, 0.18947, 0.19912,
+    0.20876, 0.2184, 0.22805, 0.23769, 0.24734, 0.25698, 0.26662, 0.27627,
+    0.28591, 0.29555, 0.3052, 0.31484, 0.32448, 0.33413, 0.34377, 0.35342,
+    0.36306, 0.3727, 0.38235, 0.39199, 0.40163, 0.41128, 0.42092, 0.43057,
+    0.44021, 0.44985, 0.4595, 0.46914, 0.47878, 0.48843, 0.49807, 0.50771,
+    0.51736, 0.527, 0.53665, 0.54629, 0.55593, 0.56558, 0.57522, 0.58486,
+    0.59451, 0.60415, 0.6138, 0.62344, 0.63308, 0.64273, 0.65237, 0.66201,
+    0.67166, 0.6813, 0.69094, 0.70059, 0.71023, 0.71988, 0.72952, 0.73916,
+    0.74881, 0.75845, 0.76809, 0.77774, 0.78738, 0.79486, 0.80386, 0.81245,
+    0.8221, 0.83174, 0.84139, 0.85103, 0.86067, 0.86559, 0.86646, 0.86742,
+    0.86839, 0.86935
+])
+nca_delith_ocp_volt = _read_only([
+    4.39318, 4.36647, 4.32641, 4.29436, 4.26632, 4.24228, 4.22226, 4.20623,
+    4.19421, 4.17819, 4.16617, 4.14614, 4.13012, 4.1141, 4.09807, 4.08205,
+    4.06602, 4.05, 4.03798, 4.02596, 4.00994, 3.99792, 3.98991, 3.97789,
+    3.96588, 3.95386, 3.94184, 3.92982, 3.9178, 3.90579, 3.89377, 3.88175,
+    3.86973, 3.85772, 3.8457, 3.83769, 3.82166, 3.81365, 3.80564, 3.79362,
+    3.78561, 3.7776, 3.76958, 3.76157, 3.75356, 3.74555, 3.74154, 3.73353,
+    3.72552, 3.72151, 3.7135, 3.70549, 3.70148, 3.68947, 3.68546, 3.67745,
+    3.66944, 3.66142, 3.65341, 3.64139, 3.63338, 3.62137, 3.61335, 3.60534,
+    3.59733, 3.58932, 3.58131, 3.57329, 3.56929, 3.56528, 3.55994, 3.55727,
+    3.55326, 3.54926, 3.54125, 3.53323, 3.52923, 3.51721, 3.40104, 3.32092,
+    3.16068, 3.0405
+])
+
+# Graphite, Enertech cell (Ai2020)
+graphite_ocp_sto = _read_only([
+    0, 0.0005, 0.00127041, 0.00152479, 0.00190595, 0.002223558,
+    0.004060547, 0.004820151, 0.006463943, 0.00741337, 0.008616506,
+    0.009123417, 0.010768226, 0.012665046, 0.014118344, 0.017786752,
+    0.02069469, 0.023983799, 0.030502175, 0.036001135, 0.039606662,
+    0.059148083, 0.061297942, 0.071349833, 0.080265526, 0.119208079,
+    0.128120548, 0.134253707, 0.141584594, 0.150874177, 0.160609131,
+    0.170345957, 0.189747769, 0.209222253, 0.21901773, 0.228756579,
+    0.238552575, 0.248349231, 0.258084023, 0.267821184, 0.28741535,
+    0.297209811, 0.307004942, 0.316798396, 0.326534032, 0.336321558,
+    0.346061758, 0.355856392, 0.365593044, 0.375388012, 0.385120781,
+    0.394915577, 0.404717479, 0.414512102, 0.424244871, 0.434039331,
+    0.44377024, 0.453564862, 0.463298139, 0.473034456, 0.482766544,
+    0.492564552, 0.502302892, 0.512042595, 0.521833161, 0.531572182,
+    0.541369033, 0.551104831, 0.5608998, 0.570635608, 0.580434806,
+    0.590235692, 0.599977407, 0.609716266, 0.619517822, 0.629313635,
+    0.639049108, 0.648790152, 0.658584104, 0.668320248, 0.67805504,
+    0.687851869, 0.69764938, 0.707389072, 0.717188097, 0.726977148,
+    0.736776336, 0.746515866, 0.756259106, 0.766055091, 0.775789039,
+    0.785537861, 0.79532979, 0.805080646, 0.814827099, 0.824570003,
+    0.834370889, 0.844173289, 0.853913187, 0.86365051, 0.873392073,
+    0.883126865, 0.892918286, 0.902708516, 0.912443308, 0.922232533,
+    0.932019724, 0.941812832, 0.951602392, 0.961392795, 0.970177652,
+    0.976051358, 0.980413449, 0.983887804, 0.986792703, 0.989255096,
+    0.991401407, 0.993359929, 0.995130154, 0.996776304, 0.99822944,
+    0.999241066, 0.999746961, 0.999936448, 1
+])
+
+graphite_ocp_volt = _read_only([
+    3.5, 3, 1.04, 1.01, 0.972653837, 0.94249055,
+    0.816240592, 0.780280928, 0.71896262, 0.691374757, 0.661391781,
+    0.649962232, 0.6165173, 0.583310858, 0.560830783, 0.512439476,
+    0.48025136, 0.448495867, 0.39598881, 0.359507681, 0.338477981,
+    0.256319558, 0.25117361, 0.236055324, 0.231009217, 0.2232966,
+    0.218284244, 0.213273859, 0.208228362, 0.203209739, 0.198620985,
+    0.193816376, 0.184166915, 0.176790532, 0.173830441, 0.170963261,
+    0.167903501, 0.164649979, 0.161491332, 0.15859383, 0.153399157,
+    0.151002319, 0.14886213, 0.146918911, 0.145328142, 0.144002109,
+    0.142902125, 0.142014262, 0.141316008, 0.140759105, 0.140314323,
+    0.139942322, 0.139617851, 0.139325406, 0.139051014, 0.138779297,
+    0.138517413, 0.138258897, 0.137981293, 0.137672226, 0.137329325,
+    0.136903224, 0.136390244, 0.135757581, 0.134947101, 0.133923235,
+    0.132621681, 0.130989474, 0.128964924, 0.126549987, 0.123742878,
+    0.120770834, 0.117929634, 0.115379983, 0.113205423, 0.111366477,
+    0.109855495, 0.108578952, 0.107520678, 0.106632536, 0.105893758,
+    0.105260613, 0.104713189, 0.104254365, 0.103845625, 0.103477119,
+    0.103153932, 0.102856541, 0.102587443, 0.102338279, 0.102101986,
+    0.101880905, 0.101676423, 0.101465878, 0.101264171, 0.101062635,
+    0.10087041, 0.10068096, 0.100489223, 0.100300437, 0.100099718,
+    0.099877104, 0.099628985, 0.099332616, 0.098958419, 0.098442542,
+    0.097683643, 0.096492, 0.094510791, 0.091136817, 0.086115186,
+    0.081078748, 0.07604037, 0.070991535, 0.065898328, 0.060844047,
+    0.055810118, 0.050670698, 0.045562401, 0.040392663, 0.035261272,
+    0.030242658, 0.024850768, 0.019251502, 0.004994678
+])
+
+
+def _non_increasing(values, weights):
+    # least-squares non-increasing fit (pool adjacent violators)
+    blocks = []  # [mean, weight, count]
+    for value, weight in zip(values, weights):
+        blocks.append([value, weight, 1])
+        while len(blocks) > 1 and blocks[-2][0] < blocks[-1][0]:
+            value, weight, count = blocks.pop()
+            block = blocks[-1]
+            block[0] = (block[0] * block[1] + value * weight) / (block[1] + weight)
+            block[1] += weight
+            block[2] += count
+    return np.concatenate([np.full(count, mean) for mean, _, count in blocks])
+
+
+def condition_table(sto, volt):
+    """
+    Make a digitised OCP table fit for a shape-preserving interpolant.
+
+    The points are sorted by stoichiometry, points sharing a stoichiometry are
+    merged into their mean potential, and the potential is made non-increasing
+    in stoichiometry by a least-squares (pool adjacent violators) fit, which
+    leaves an already monotone curve untouched.
+
+    Parameters
+    ----------
+    sto, volt : array-like
+        Digitised stoichiometries and potentials [V], in any order
+
+    Returns
+    -------
+    tuple of :class:`numpy.ndarray`
+        Read-only strictly increasing stoichiometries and the potentials
+    """
+    sto = np.asarray(sto, dtype=float)
+    volt = np.asarray(volt, dtype=float)
+    sto, index, counts = np.unique(sto, return_inverse=True, return_counts=True)
+    volt = np.bincount(index, weights=volt) / counts
+    return _read_only(sto), _read_only(_non_increasing(volt, counts))
+
+
+# name -> (sto, volt, interpolator, extrapolate) of every table
+OCP_TABLES = {
+    "silicon_lith_ocp": (
+        *condition_table(silicon_lith_ocp_sto, silicon_lith_ocp_volt),
+        "pchip",
+        False,
+    ),
+    "silicon_delith_ocp": (
+        *condition_table(silicon_delith_ocp_sto, silicon_delith_ocp_volt),
+        "pchip",
+        False,
+    ),
+    "nca_lith_ocp": (
+        *condition_table(nca_lith_ocp_sto, nca_lith_ocp_volt),
+        "pchip",
+        False,
+    ),
+    "nca_delith_ocp": (
+        *condition_table(nca_delith_ocp_sto, nca_delith_ocp_volt),
+        "pchip",
+        False,
+    ),
+    "graphite_ocp": (graphite_ocp_sto, graphite_ocp_volt, "cubic", True),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _prototype(name):
+    # interpolant of one table, built (and its data checked and hashed) once
+    import pybamm
+
+    sto, volt, interpolator, extrapolate = OCP_TABLES[name]
+    return pybamm.Interpolant(
+        sto,
+        volt,
+        pybamm.Scalar(0),
+        name=name,
+        interpolator=interpolator,
+        extrapolate=extrapolate,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _numeric_interpolant(name):
+    # the scipy interpolant pybamm.Interpolant evaluates for this table
+    from scipy import interpolate
+
+    sto, volt, interpolator, extrapolate = OCP_TABLES[name]
+    if interpolator == "pchip":
+        return interpolate.PchipInterpolator(sto, volt, extrapolate=extrapolate)
+    return interpolate.CubicSpline(sto, volt, extrapolate=extrapolate)
+
+
+def ocp_interpolant(name, sto):
+    """
+    Interpolant of the OCP table ``name`` (a key of :data:`OCP_TABLES`) at ``sto``.
+
+    For a :class:`pybamm.Symbol`, the result is identical to building a new
+    :class:`pybamm.Interpolant` from the table, but reuses the checks and data
+    hash of the cached one. For a number or array, the table is evaluated with
+    the same scipy interpolant, without pybamm.
+    """
+    if isinstance(sto, (numbers.Number, np.ndarray)):
+        return _numeric_interpolant(name)(sto)
+    return _prototype(name).create_copy(new_children=[sto])
+
+
+# Analytic surrogates of the tables above, written by ``python fit_ocp_surrogates.py``
+# (see :func:`evaluate_surrogate` for the form). "max_error" [V] bounds the
+# deviation from the table's interpolant over "range", where they were fitted;
+# a surrogate with no fit within "tolerance" [V] keeps its best one, which
+# :func:`select_ocp` does not use.
+OCP_SURROGATES = {
+    "silicon_lith_ocp": {
+        "range": (0.03869, 0.29601),
+        "max_error": 1.710e-03,
+        "tolerance": 0.005,
+        "linear": (26.831161909371804, -156.27560409646338),
+        "tanh": [
+            (-0.03863711893, 0.03915948694, 0.000534680232),
+            (-0.1093056706, 0.04014429033, 0.0005451742242),
+            (-0.04716833173, 0.04106257363, 0.0004785531298),
+            (-0.01386480106, 0.04210059739, 0.0006658447285),
+            (-0.02098693165, 0.04375884936, 0.0008318775838),
+            (-0.01132527599, 0.05082405727, 0.000560738106),
+            (-0.01179685565, 0.04679368214, 0.0004951682389),
+            (-0.008310009574, 0.05475060919, 0.00332341196),
+            (14.68793824, 0.03869413865, 0.1186197565),
+            (-0.3285903937, 0.138905583, 0.03828849876),
+            (0.03474968796, 0.1574945881, 0.01353601816),
+            (-0.130636043, 0.1609480469, 0.01927823197),
+            (0.0212526122, 0.2071717316, 0.01274503078),
+            (-3.608253996, 0.2028472245, 0.05206387639),
+            (54.22629351, 0.2519082771, 0.09897349818),
+            (-28.94903602, 0.2577196772, 0.07709515676),
+        ],
+    },
+    "silicon_delith_ocp": {
+        "range": (0.01748, 0.30661),
+        "max_error": 4.290e-03,
+        "tolerance": 0.005,
+        "linear": (67.26937896961262, -328.4287795481319),
+        "tanh": [
+            (-0.00328827093, 0.02491742874, 0.0002134511309),
+            (4.271253218, 0.01777110549, 0.02661390461),
+            (0.004771692766, 0.04637491191, 0.002504103729),
+            (9.307774174, 0.05561833074, 0.04414776866),
+            (0.01399241229, 0.07935535214, 0.009669108268),
+            (0.2952848548, 0.09170899848, 0.0215955512),
+            (9.428140361, 0.1176902274, 0.0498520945),
+            (1.653772019, 0.1552237809, 0.0331264876),
+            (2.610090089, 0.1844158441, 0.03606335888),
+            (0.06249527238, 0.2075811016, 0.01434895802),
+            (0.02592118588, 0.225980134, 0.01249557552),
+            (2.846197269, 0.2242332869, 0.04736867454),
+            (38.18836284, 0.2959437433, 0.1235783483),
+            (0.01150797982, 0.2919442552, 0.006138229343),
+        ],
+        "exp": (-115.1603059, 0.002047973094),
+    },
+    "nca_lith_ocp": {
+        "range": (0.13933, 0.90214),
+        "max_error": 4.624e-03,
+        "tolerance": 0.005,
+        "linear": (22.30510464316523, -24.095124490647613),
+        "tanh": [
+            (0.007186468865, 0.1900630498, 0.0155731837),
+            (1.191745536, 0.1730107697, 0.1350017145),
+            (0.006265201927, 0.305435323, 0.01193714338),
+            (0.005319946282, 0.3528530457, 0.01023192219),
+            (1.042599583, 0.378219578, 0.175522869),
+            (0.02442567208, 0.5111967335, 0.03613774542),
+            (0.1007238938, 0.5973067846, 0.0726916152),
+            (0.005164725616, 0.711276555, 0.02045959965),
+            (18.11728925, 0.90214, 0.76281),
+            (0.06956348718, 0.8858356771, 0.006115921276),
+            (-0.6501578565, 0.90214, 0.0178465087),
+        ],
+    },
+    "nca_delith_ocp": {
+        "range": (0.13762, 0.86935),
+        "max_error": 4.065e-03,
+        "tolerance": 0.005,
+        "linear": (72.28767034383756, -113.23517139122464),
+        "tanh": [
+            (0.337630479, 0.13762, 0.0268716128),
+            (10.34699891, 0.1712733824, 0.1202429652),
+            (0.09770911949, 0.2678316924, 0.03565340813),
+            (0.01454348507, 0.3041440685, 0.01349117148),
+            (0.006953554487, 0.3368504128, 0.008502109496),
+            (5.807046553, 0.3262617732, 0.1176595788),
+            (3.047509273, 0.4334245354, 0.1170006686),
+            (0.01814124688, 0.5067709564, 0.04219317318),
+            (10.33745161, 0.5572307756, 0.1840282372),
+            (0.06243376339, 0.6759481721, 0.05101066882),
+            (0.01202995599, 0.7342101725, 0.02287838002),
+            (31.54134235, 0.8693485721, 0.304079493),
+            (0.007405190888, 0.8563122121, 0.005447251409),
+            (-0.06583818443, 0.8661407072, 0.000365890587),
+            (-0.02826278029, 0.8691084026, 0.0003677805253),
+            (-0.1548804587, 0.8679845658, 0.0008663219463),
+        ],
+    },
+    "graphite_ocp": {
+        "range": (0.005, 1.0),
+        "max_error": 1.426e-02,
+        "tolerance": 0.005,
+        "linear": (139.27249723744447, -319.03140067078033),
+        "tanh": [
+            (0.3359136877, 0.005, 0.01120622671),
+            (4.458272296, 0.005000000177, 0.03565782357),
+            (1.327466557, 0.05616166657, 0.05036933632),
+            (0.01441653566, 0.1115995258, 0.01797160852),
+            (0.006719924387, 0.150402429, 0.01501248874),
+            (20.86055738, 0.005002621131, 0.2207108569),
+            (142.1009928, 0.3122239519, 0.5344514544),
+            (0.02357627533, 0.5083246044, 0.06640933992),
+            (50.23296084, 0.791737983, 0.3444126994),
+            (16.50531154, 0.9625592484, 0.1852430976),
+            (2.806074351, 0.9927026182, 0.07861621478),
+            (0.3631353027, 0.9942588377, 0.02868621442),
+            (0.03476510677, 0.9952221633, 0.006842496151),
+        ],
+        "exp": (7.768205531, 0.03777048066),
+    },
+}
+
+
+def evaluate_surrogate(surrogate, sto):
+    """
+    Analytic surrogate of :data:`OCP_SURROGATES` at ``sto``, a number, array or
+    :class:`pybamm.Symbol`.
+    """
+    a, b = surrogate["linear"]
+    U = a + b * sto
+    for amplitude, centre, width in surrogate["tanh"]:
+        U = U + amplitude * np.tanh((sto - centre) / width)
+    if "exp" in surrogate:
+        amplitude, decay = surrogate["exp"]
+        U = U + amplitude * np.exp(-sto / decay)
+    return U
+
+
+def tabulated(*names):
+    """
+    Mark an OCP function as the mean of the tables ``names``, so that
+    :func:`select_ocp` can swap it for the surrogates of those tables.
+    """
+
+    def mark(function):
+        function.ocp_tables = names
+        return function
+
+    return mark
+
+
+class SurrogateOCP:
+    """
+    OCP function that is the mean of the surrogates of the tables ``names``. A
+    class rather than a closure so that parameter sets using it can be pickled,
+    e.g. by ``sweep.run_sweep``.
+    """
+
+    def __init__(self, names):
+        self.ocp_tables = tuple(names)
+        self.__name__ = "surrogate_" + "_".join(self.ocp_tables)
+
+    def __call__(self, sto):
+        surrogates = [OCP_SURROGATES[name] for name in self.ocp_tables]
+        U = evaluate_surrogate(surrogates[0], sto)
+        for surrogate in surrogates[1:]:
+            U = U + evaluate_surrogate(surrogate, sto)
+        return U / len(surrogates)
+
+
+def select_ocp(parameter_values, ocp="table"):
+    """
+    Copy of ``parameter_values`` using the tabulated OCPs ("table", for
+    fidelity) or their analytic surrogates ("surrogate", for speed). Only the
+    functions marked with :func:`tabulated` are swapped, and only if the error
+    bound of each of their surrogates in :data:`OCP_SURROGATES` is within its
+    tolerance; the others keep their tables, with a warning.
+
+    Parameters
+    ----------
+    parameter_values : :class:`pybamm.ParameterValues` or dict
+        Parameter set, e.g. ``Durdel2023_single.get_final_parameter_values()``
+    ocp : str, optional
+        "table" or "surrogate"
+
+    Returns
+    -------
+    :class:`pybamm.ParameterValues`
+    """
+    import pybamm
+
+    if ocp not in ("table", "surrogate"):
+        raise ValueError(f"ocp must be 'table' or 'surrogate', not {ocp!r}")
+    if not isinstance(parameter_values, pybamm.ParameterValues):
+        parameter_values = pybamm.ParameterValues(parameter_values)
+    parameter_values = parameter_values.copy()
+    if ocp == "surrogate":
+        surrogates = {}
+        for key, value in parameter_values.items():
+            names = getattr(value, "ocp_tables", None)
+            if not names:
+                continue
+            inaccurate = [
+                name
+                for name in names
+                if OCP_SURROGATES[name]["max_error"] > OCP_SURROGATES[name]["tolerance"]
+            ]
+            if inaccurate:
+                warnings.warn(
+                    f"keeping the tables of {key!r}: the surrogates of "
+                    f"{', '.join(inaccurate)} are not within their tolerance",
+                    stacklevel=2,
+                )
+            else:
+                surrogates[key] = SurrogateOCP(names)
+        parameter_values.update(surrogates)
+    return parameter_values
@@ -0,0 +1,95 @@
+"""
+Registry of named parameter sets, each defined as overrides layered on a base set.
+
+A set is registered with the function returning its values, which is only called
+the first time the set is needed, and optionally the set it overrides::
+
+    register("OG", original_parameters)
+    register("final", final_overrides, base="OG")
+
+Durdel2023_composite.py registers "OG" (the base), "test" and "final" this way.
+:func:`parameter_dict` resolves the layers into a new dict. :func:`parameter_values`
+builds and validates the :class:`pybamm.ParameterValues` of a set once per process
+and hands out copies of it (:func:`copy_parameter_values`), so callers may update
+them freely, and sweeps cloning a set for every point no longer resolve the layers
+and rebuild the dict each time. Names that are not
+registered fall back to the parameter sets shipped with pybamm. Registering and
+resolving dicts does not import pybamm; the ParameterValues functions do.
+
+Example::
+
+    import Durdel2023_composite  # registers the composite sets
+    from parameter_sets import parameter_values
+    param = parameter_values("final")
+    param.update({"Current function [A]": 0.0029})
+"""
+
+# name -> (values or function returning them, base name or None, keys removed)
+_layers = {}
+
+# name -> validated ParameterValues, never handed out itself
+_resolved = {}
+
+
+def register(name, values, base=None, remove=()):
+    """
+    Register the parameter set ``name``.
+
+    Parameters
+    ----------
+    name : str
+        Name of the set, e.g. "final"
+    values : callable or dict
+        Function returning the values of the set (or of its overrides, with a
+        ``base``), or the values themselves
+    base : str, optional
+        Registered set these values override
+    remove : list of str, optional
+        Keys of the base set this one does not have
+    """
+    if base is not None and base not in _layers:
+        raise KeyError(f"base parameter set {base!r} is not registered")
+    _layers[name] = (values, base, tuple(remove))
+    # the sets layered on this one change with it
+    _resolved.clear()
+
+
+def names():
+    """Names of the registered parameter sets."""
+    return list(_layers)
+
+
+def parameter_dict(name):
+    """New dict of the values of the registered set ``name``, layers resolved."""
+    values, base, remove = _layers[name]
+    resolved = {} if base is None else parameter_dict(base)
+    resolved.update(values() if callable(values) else values)
+    for key in remove:
+        del resolved[key]
+    return resolved
+
+
+def parameter_values(name):
+    """
+    :class:`pybamm.ParameterValues` of the registered set ``name``, or of the
+    pybamm parameter set of that name, as a copy the caller owns.
+    """
+    import pybamm
+
+    if name not in _resolved:
+        _resolved[name] = pybamm.ParameterValues(
+            parameter_dict(name) if name in _layers else name
+        )
+    return copy_parameter_values(_resolved[name])
+
+
+def copy_parameter_values(parameter_values):
+    """
+    Copy of ``parameter_values`` that can be updated without changing it.
+
+    Only pybamm's public :meth:`pybamm.ParameterValues.copy` is used, which checks
+    the values again: about 75 us for the composite sets, against a few us for
+    sharing pybamm's internal store, which is not worth depending on its private
+    layout (see benchmarks/bench_parameter_sets.py).
+    """
+    return parameter_values.copy()
@@ -0,0 +1,294 @@
+"""
+Opt-in instrumentation of simulations: wall time per phase, solver statistics and
+calls into this project's property functions, reported as JSON and as folded
+stacks for flame graphs.
+
+Inside ``with Profiler(...)`` a few pybamm methods are wrapped, so that every call
+of them is timed as a phase:
+
+    build        model construction, e.g. ``pybamm.lithium_ion.DFN(options)``
+    parameters   processing of model and geometry by the parameter values
+    mesh         mesh generation
+    discretise   discretisation
+    setup        solver set-up (casadi functions, Jacobian, initial conditions)
+    solve        integration, less the set-up it triggers
+    variables    post-processing of the variables read from a solution
+
+Phases nest, e.g. an experiment sets up and solves each step inside
+``Simulation.solve`` ("simulation"); the report keeps the full stacks and the self
+time of each phase. Calls of the property functions of this project (OCPs,
+diffusivities, exchange-current densities...) are counted and timed when the
+parameter values turn them into expressions: their "functions" times are the
+cost of building the expressions, not of evaluating them. During integration
+they run inside the compiled casadi functions, so their cost there is part of
+"solve". The functions are timed through a private method of pybamm's
+parameter substitution; with a pybamm that lacks it, they are not timed. The
+solver statistics (steps, error test and nonlinear solver failures, linear
+solver set-ups, i.e. Jacobian evaluations) are summed over every solve.
+
+Only this process is instrumented: sweeps should be run with ``processes=1``, and
+without a cache, to be profiled. The wrappers are removed on exit.
+
+Example::
+
+    from profiling import Profiler
+    with Profiler("profile.json"):
+        sim.solve()
+
+writes ``profile.json`` and ``profile.folded``, which speedscope or flamegraph.pl
+read.
+"""
+import dataclasses
+import functools
+import json
+import os
+import sys
+import timeit
+
+import pybamm
+
+try:
+    from pybamm.parameters.parameter_substitutor import ParameterSubstitutor
+except ImportError:  # a pybamm without it: the functions are not timed
+    ParameterSubstitutor = None
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+# Method of ParameterSubstitutor turning a callable into an expression, wrapped
+# to time the property functions; private, so only wrapped if it exists
+_FUNCTION_HOOK = "_process_callable_function_parameter"
+
+
+def _phase_methods():
+    """(class, method name, phase) of every method timed by :class:`Profiler`."""
+    methods = [
+        (pybamm.Simulation, "solve", "simulation"),
+        (pybamm.ParameterValues, "process_model", "parameters"),
+        (pybamm.ParameterValues, "process_geometry", "parameters"),
+        (pybamm.Mesh, "__init__", "mesh"),
+        (pybamm.Discretisation, "process_model", "discretise"),
+        (pybamm.Solution, "update", "variables"),
+    ]
+    models = [
+        cls
+        for cls in vars(pybamm.lithium_ion).values()
+        if isinstance(cls, type) and issubclass(cls, pybamm.BaseBatteryModel)
+    ]
+    methods += [(cls, "__init__", "build") for cls in models]
+    solvers = {pybamm.BaseSolver} | {
+        cls
+        for cls in vars(pybamm).values()
+        if isinstance(cls, type) and issubclass(cls, pybamm.BaseSolver)
+    }
+    for cls in solvers:
+        methods += [
+            (cls, "set_up", "setup"),
+            (cls, "solve", "solve"),
+            (cls, "step", "solve"),
+        ]
+    # only the classes that define the method themselves; subclasses inherit the
+    # wrapper
+    return [(cls, name, phase) for cls, name, phase in methods if name in vars(cls)]
+
+
+def _project_function_name(value):
+    # name of ``value`` if it is a callable defined in this project, else None
+    if not callable(value) or isinstance(value, pybamm.Symbol):
+        return None
+    module = sys.modules.get(getattr(value, "__module__", None) or "")
+    path = getattr(module, "__file__", None)
+    if path is None or os.path.dirname(os.path.abspath(path)) != _ROOT:
+        return None
+    name = getattr(value, "__name__", type(value).__name__)
+    return f"{module.__name__}.{name}"
+
+
+class Profiler:
+    """
+    Context manager timing the simulations run inside it, see the module
+    docstring.
+
+    Parameters
+    ----------
+    path : str, optional
+        JSON report written on exit, with the folded stacks next to it (same name,
+        ".folded" extension)
+    enabled : bool, optional
+        Whether to instrument anything; with False the context does nothing, so
+        scripts can switch profiling with one flag
+
+    Attributes
+    ----------
+    report : dict
+        The report, filled on exit: "wall time [s]", "phases" (calls, self and
+        total time of each phase), "stacks" (self time of each ";"-joined stack),
+        "solver" (number of solves and summed statistics), "functions" (calls
+        and expression-build time of each property function) and "functions
+        timed" (what the "functions" times measure)
+    """
+
+    def __init__(self, path=None, enabled=True):
+        self.path = path
+        self.enabled = enabled
+        self.report = None
+        self._patched = []
+
+    def __enter__(self):
+        if not self.enabled:
+            return self
+        self._stack = []
+        self._phases = {}
+        self._stacks = {}
+        self._solver = {"solves": 0}
+        self._functions = {}
+        self._timed_total = 0.0
+        for cls, name, phase in _phase_methods():
+            original = vars(cls)[name]
+            setattr(cls, name, self._timed(original, phase))
+            self._patched.append((cls, name, original))
+        self._functions_timed = _FUNCTION_HOOK in vars(ParameterSubstitutor or object)
+        if self._functions_timed:
+            original = vars(ParameterSubstitutor)[_FUNCTION_HOOK]
+            timed = self._timed_function(original)
+            setattr(ParameterSubstitutor, _FUNCTION_HOOK, timed)
+            self._patched.append((ParameterSubstitutor, _FUNCTION_HOOK, original))
+        self._start = timeit.default_timer()
+        return self
+
+    def __exit__(self, *exc_info):
+        if not self.enabled:
+            return
+        wall_time = timeit.default_timer() - self._start
+        for cls, name, original in reversed(self._patched):
+            setattr(cls, name, original)
+        self._patched = []
+        self._stacks["(untimed)"] = max(wall_time - self._timed_total, 0)
+        self.report = {
+            "wall time [s]": wall_time,
+            "phases": {
+                name: phase
+                for name, phase in sorted(
+                    self._phases.items(), key=lambda item: -item[1]["self"]
+                )
+            },
+            "stacks": dict(sorted(self._stacks.items())),
+            "solver": self._solver,
+            "functions": dict(
+                sorted(self._functions.items(), key=lambda item: -item[1]["seconds"])
+            ),
+            "functions timed": (
+                "expression build, not evaluation (part of solve)"
+                if self._functions_timed
+                else "not timed by this pybamm version"
+            ),
+        }
+        if self.path is not None:
+            self.write(self.path)
+
+    def start(self):
+        """Start profiling, as entering the context does."""
+        return self.__enter__()
+
+    def stop(self):
+        """Stop profiling and write the report, as leaving the context does."""
+        self.__exit__(None, None, None)
+
+    def _enter_frame(self, name):
+        self._stack.append([name, timeit.default_timer(), 0.0])
+
+    def _exit_frame(self, phase):
+        name, start, children = self._stack.pop()
+        elapsed = timeit.default_timer() - start
+        stack = ";".join([frame[0] for frame in self._stack] + [name])
+        self._stacks[stack] = self._stacks.get(stack, 0) + elapsed - children
+        if self._stack:
+            self._stack[-1][2] += elapsed
+        else:
+            self._timed_total += elapsed
+        if phase is None:
+            return elapsed
+        record = self._phases.setdefault(phase, {"calls": 0, "self": 0.0, "total": 0.0})
+        record["calls"] += 1
+        record["self"] += elapsed - children
+        # a phase inside itself (e.g. a step within a solve) is counted once
+        if all(frame[0] != name for frame in self._stack):
+            record["total"] += elapsed
+        return elapsed
+
+    def _timed(self, method, phase):
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            if self._stack and self._stack[-1][0] == phase:
+                # a method calling its parent's, e.g. IDAKLUSolver.set_up
+                return method(*args, **kwargs)
+            self._enter_frame(phase)
+            try:
+                result = method(*args, **kwargs)
+            finally:
+                self._exit_frame(phase)
+            if phase == "solve" and all(frame[0] != "solve" for frame in self._stack):
+                self._add_statistics(result)
+            return result
+
+        return timed
+
+    def _add_statistics(self, solution):
+        statistics = getattr(solution, "solver_statistics", None)
+        self._solver["solves"] += 1
+        if statistics is None:
+            return
+        for key, value in dataclasses.asdict(statistics).items():
+            self._solver[key] = self._solver.get(key, 0) + value
+
+    def _timed_function(self, method):
+        @functools.wraps(method)
+        def timed(substitutor, symbol, *args, **kwargs):
+            try:
+                value = substitutor._store[symbol.name]
+            except (AttributeError, KeyError, TypeError):
+                value = None  # laid out otherwise in this pybamm: not timed
+            name = _project_function_name(value)
+            if name is None:
+                return method(substitutor, symbol, *args, **kwargs)
+            self._enter_frame(f"{name}()")
+            try:
+                return method(substitutor, symbol, *args, **kwargs)
+            finally:
+                elapsed = self._exit_frame(None)
+                record = self._functions.setdefault(name, {"calls": 0, "seconds": 0.0})
+                record["calls"] += 1
+                record["seconds"] += elapsed
+
+        return timed
+
+    def write(self, path):
+        """Write the JSON report to ``path`` and the folded stacks next to it."""
+        with open(path, "w") as f:
+            json.dump(self.report, f, indent=1)
+        folded = os.path.splitext(path)[0] + ".folded"
+        with open(folded, "w") as f:
+            for stack, seconds in self.report["stacks"].items():
+                microseconds = round(seconds * 1e6)
+                if microseconds > 0:
+                    f.write(f"{stack} {microseconds}\n")
+
+    def summary(self):
+        """Text table of the report: phases, solver statistics and functions."""
+        report = self.report
+        lines = [f"wall time {report['wall time [s]']:.3f} s"]
+        lines.append(f"{'phase':<12} {'calls':>7} {'self [s]':>10} {'total [s]':>10}")
+        for name, phase in report["phases"].items():
+            lines.append(
+                f"{name:<12} {phase['calls']:>7} {phase['self']:>10.3f} "
+                f"{phase['total']:>10.3f}"
+            )
+        solver = report["solver"]
+        lines.append("solver: " + ", ".join(f"{k} {v}" for k, v in solver.items()))
+        lines.append(f"functions: {report['functions timed']}")
+        for name, function in report["functions"].items():
+            lines.append(
+                f"{function['calls']:>7} calls {function['seconds']:>8.4f} s  {name}"
+            )
+        return "\n".join(lines)
+
@@ -0,0 +1,185 @@
+"""
+Columnar on-disk store of sweep results, written point by point as a sweep runs.
+
+A store is a directory holding one raw binary column per output variable, the
+values of every point appended one after the other, plus two small JSON files:
+``columns.json`` (file and dtype of each variable) and ``points.jsonl`` (one line
+per point: its index, overrides, and the offset and shape of each variable in the
+columns). Nothing is held in memory but the point being written, and reading
+back memory-maps the columns, so plotting a campaign only pages in the slices it
+touches.
+
+Example::
+
+    from results_store import ResultsWriter, ResultsStore
+    results = run_gitt(temps, store=ResultsWriter("gitt.results"))
+    # later, or in another process
+    results = ResultsStore("gitt.results")
+    plt.plot(results[0]["Time [s]"], results[0]["Terminal voltage [V]"])
+"""
+import json
+import os
+import re
+import shutil
+
+import numpy as np
+
+# Kept in float64 whatever the store's dtype: float32 time loses whole seconds
+FLOAT64_VARIABLES = {"Time [s]", "Cycle end time [s]"}
+
+
+def _jsonable(value):
+    # overrides can hold numbers, arrays or functions; the latter are kept as repr
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    if isinstance(value, (int, float, str, bool)) or value is None:
+        return value
+    return repr(value)
+
+
+def is_store(path):
+    """Whether the directory ``path`` holds a store (written or being written)."""
+    return any(
+        os.path.isfile(os.path.join(path, name))
+        for name in ("columns.json", "points.jsonl")
+    )
+
+
+class ResultsWriter:
+    """
+    Writer of a :class:`ResultsStore`, e.g. for the ``store`` argument of
+    :func:`sweep.run_sweep`.
+
+    Parameters
+    ----------
+    path : str
+        Store directory: created, or replaced if it already holds a store. Any
+        other existing path (a file, or a directory with other contents) is left
+        alone and raises :class:`FileExistsError`.
+    dtype : numpy dtype, optional
+        Column dtype, float64 by default; float32 halves the size. The variables
+        in :data:`FLOAT64_VARIABLES` are always float64.
+    """
+
+    def __init__(self, path, dtype=np.float64):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        if os.path.isdir(path) and is_store(path):
+            shutil.rmtree(path)
+        elif os.path.isfile(path) or (os.path.isdir(path) and os.listdir(path)):
+            raise FileExistsError(
+                f"{path!r} exists and is not a results store, refusing to replace it"
+            )
+        os.makedirs(path, exist_ok=True)
+        self._columns = {}
+        self._files = {}
+        # written now as well, so that a store with no points reads back empty
+        self._write_columns()
+        self._points = open(os.path.join(path, "points.jsonl"), "w")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _column(self, name):
+        if name not in self._columns:
+            dtype = np.float64 if name in FLOAT64_VARIABLES else self.dtype
+            slug = re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_")
+            filename = f"{len(self._columns)}_{slug}.bin"
+            self._columns[name] = {"file": filename, "dtype": np.dtype(dtype).str}
+            self._files[name] = open(os.path.join(self.path, filename), "wb")
+            self._write_columns()
+        return self._files[name], np.dtype(self._columns[name]["dtype"])
+
+    def _write_columns(self):
+        with open(os.path.join(self.path, "columns.json"), "w") as f:
+            json.dump(self._columns, f, indent=1)
+
+    def write(self, index, overrides, variables):
+        """Append the ``variables`` (name -> array) of point ``index``."""
+        layout = {}
+        for name, value in variables.items():
+            f, dtype = self._column(name)
+            value = np.asarray(value, dtype=dtype)
+            offset = f.tell() // dtype.itemsize
+            f.write(np.ascontiguousarray(value).tobytes())
+            layout[name] = [offset, list(value.shape)]
+        for f in self._files.values():
+            f.flush()
+        line = {"index": index, "overrides": _jsonable(overrides), "columns": layout}
+        self._points.write(json.dumps(line) + "\n")
+        self._points.flush()
+
+    def close(self):
+        """Close the files and return the store for reading."""
+        for f in self._files.values():
+            f.close()
+        self._points.close()
+        return ResultsStore(self.path)
+
+
+class ResultsStore:
+    """
+    Read-only view of a store written by :class:`ResultsWriter`.
+
+    Behaves like the list of dicts returned by :func:`sweep.run_sweep`:
+    ``store[i]`` is a dict of variable name -> array of the ``i``-th point, the
+    arrays being read-only memory-mapped views of the columns. Access is
+    positional, in the order of the points in the sweep: ``store[i]`` is point
+    ``i`` of the sweep only if every point was written. A store whose sweep was
+    interrupted lacks some, and :attr:`indices` gives the sweep index of each
+    point it holds.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "columns.json")) as f:
+            self.columns = json.load(f)
+        with open(os.path.join(path, "points.jsonl")) as f:
+            points = [json.loads(line) for line in f if line.strip()]
+        # points are written in the order they finish
+        self._points = sorted(points, key=lambda point: point["index"])
+        self._maps = {}
+
+    def __len__(self):
+        return len(self._points)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    @property
+    def indices(self):
+        """Index in the sweep of each point, e.g. of ``store[i]``."""
+        return [point["index"] for point in self._points]
+
+    @property
+    def overrides(self):
+        """Override dict of each point."""
+        return [point["overrides"] for point in self._points]
+
+    @property
+    def variables(self):
+        return list(self.columns)
+
+    def column(self, name):
+        """Memory-mapped column of ``name``: the values of every point, joined."""
+        if name not in self._maps:
+            column = self.columns[name]
+            filename = os.path.join(self.path, column["file"])
+            if os.path.getsize(filename) == 0:
+                self._maps[name] = np.empty(0, dtype=column["dtype"])
+            else:
+                self._maps[name] = np.memmap(filename, dtype=column["dtype"], mode="r")
+        return self._maps[name]
+
+    def __getitem__(self, i):
+        point = self._points[i]
+        variables = {}
+        for name, (offset, shape) in point["columns"].items():
+            size = int(np.prod(shape, dtype=int))
+            variables[name] = self.column(name)[offset : offset + size].reshape(shape)
+        return variables
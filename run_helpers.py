@@ -0,0 +1,531 @@
+import os
+
+import numpy as np
+
+import pybamm
+
+import mesh_profile
+import solver_profile
+from parameter_sets import copy_parameter_values
+
+# Model options used by every composite (graphite + silicon) run in this project
+COMPOSITE_OPTIONS = {
+    "particle phases": ("2", "1"),
+    "open-circuit potential": (("single", "current sigmoid"), "single"),
+}
+
+# Variables read back by composite_example.py and the notebooks
+DEFAULT_OUTPUT_VARIABLES = [
+    "Time [s]",
+    "Voltage [V]",
+    "X-averaged negative electrode primary open-circuit potential [V]",
+    "X-averaged negative electrode secondary open-circuit potential [V]",
+    "X-averaged positive electrode open-circuit potential [V]",
+]
+
+# Model variables whose end-of-cycle value lean runs keep for every cycle, e.g. the
+# end-of-rest voltage of cycles that end with a rest; see :func:`extract_variables`
+CYCLE_SUMMARY_VARIABLES = ["Time [s]", "Voltage [V]", "Discharge capacity [A.h]"]
+
+# Shared libraries of compiled runs (``compiled=True``), unless the
+# PYBAMM_CASADI_AOT_CACHE environment variable gives another directory
+COMPILED_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "LiSi", "compiled")
+
+_models = {}
+
+
+def composite_model(options=None, model_class=None):
+    """
+    Return a DFN built with ``options``, reusing the model already built in this
+    process when the same options are asked for again.
+
+    Parameters
+    ----------
+    options : dict, optional
+        Model options, defaults to :data:`COMPOSITE_OPTIONS`
+    model_class : class, optional
+        pybamm model class, defaults to :class:`pybamm.lithium_ion.DFN`
+
+    Returns
+    -------
+    :class:`pybamm.BaseModel`
+        Built (but not processed) model
+    """
+    options = COMPOSITE_OPTIONS if options is None else options
+    model_class = pybamm.lithium_ion.DFN if model_class is None else model_class
+    key = (model_class.__name__, repr(sorted(options.items())))
+    if key not in _models:
+        _models[key] = model_class(options)
+    return _models[key]
+
+
+def summary_name(name):
+    """Key of the per-cycle summary of variable ``name`` in lean results."""
+    if name == "Time [s]":
+        return "Cycle end time [s]"
+    return f"Cycle end {name[0].lower()}{name[1:]}"
+
+
+def extract_variables(solution, output_variables=None, summary_variables=None):
+    """
+    Evaluate ``output_variables`` of a solution once and return them as plain arrays.
+
+    Parameters
+    ----------
+    solution : :class:`pybamm.Solution`
+        Solution to read from
+    output_variables : list of str, optional
+        Variables to keep, defaults to :data:`DEFAULT_OUTPUT_VARIABLES`
+    summary_variables : list of str, optional
+        Variables whose end-of-cycle value is read for every cycle, including the
+        cycles that were not saved, as done for lean runs
+
+    Returns
+    -------
+    dict
+        Variable name -> :class:`numpy.ndarray`. Experiment solutions also get
+        "Cycle end time [s]", the last time of each cycle, and lean ones one
+        array per summary variable, named by :func:`summary_name`.
+    """
+    output_variables = (
+        DEFAULT_OUTPUT_VARIABLES if output_variables is None else output_variables
+    )
+    variables = {
+        name: np.asarray(solution[name].entries) for name in output_variables
+    }
+    if solution.cycles and summary_variables is not None:
+        # the last state of every cycle is kept, saved or not
+        names = list(dict.fromkeys(["Time [s]", *summary_variables]))
+        summary = {name: [] for name in names}
+        for cycle in solution.all_summary_variables:
+            # read from a copy, dropped after the cycle: each processed variable
+            # a state caches holds ~0.1-0.5 MiB, which would add up to most of
+            # the memory of a long run on the states the solution keeps
+            state = cycle.last_state.copy()
+            for name in names:
+                summary[name].append(state[name].data[0])
+        for name in names:
+            variables[summary_name(name)] = np.array(summary[name])
+    elif solution.cycles:
+        # lets cycle-based post-processing work on the flat arrays
+        variables["Cycle end time [s]"] = np.array(
+            [cycle.t[-1] for cycle in solution.cycles]
+        )
+    return variables
+
+
+def model_identity(options=None, model=None, model_class=None):
+    """
+    ``model``, or what :func:`composite_model` would build from ``options`` and
+    ``model_class`` (``(model class, options)``) without building it, for hashing.
+    """
+    if model is not None:
+        return model
+    options = COMPOSITE_OPTIONS if options is None else options
+    model_class = pybamm.lithium_ion.DFN if model_class is None else model_class
+    return (model_class, options)
+
+
+def simulation_key(
+    cache,
+    parameter_values,
+    experiment=None,
+    t_eval=None,
+    options=None,
+    output_variables=None,
+    solve_kwargs=None,
+    model=None,
+    lean=False,
+    summary_variables=None,
+    compiled=False,
+    model_class=None,
+    profile_values=None,
+):
+    """
+    Key of a run in ``cache`` (a :class:`solution_cache.SolutionCache`), for the
+    same arguments as :func:`run_simulation`.
+    """
+    profile_values = parameter_values if profile_values is None else profile_values
+    parts = {}
+    if lean:
+        parts["summary_variables"] = summary_variables or CYCLE_SUMMARY_VARIABLES
+    settings = _profiled_settings(
+        profile_values, options, model, lean, compiled, model_class
+    )
+    if settings is not None:
+        parts["solver"] = settings
+    points = mesh_profile.lookup(
+        model_identity(options, model, model_class), profile_values
+    )
+    if points is not None:
+        parts["var_pts"] = points
+    return cache.key(
+        model=model_identity(options, model, model_class),
+        parameter_values=parameter_values,
+        experiment=experiment,
+        t_eval=None if t_eval is None else np.asarray(t_eval, dtype=float),
+        output_variables=(
+            DEFAULT_OUTPUT_VARIABLES if output_variables is None else output_variables
+        ),
+        solve_kwargs=solve_kwargs or {},
+        **parts,
+    )
+
+
+def _profiled_settings(
+    parameter_values, options, model, lean, compiled, model_class=None
+):
+    # settings of the solver profile (see solver_profile.py) used for this run
+    settings = solver_profile.lookup(
+        model_identity(options, model, model_class), parameter_values
+    )
+    if settings is not None and (lean or compiled):
+        if settings["class"] != "IDAKLUSolver":
+            # only IDAKLU keeps output variables alone, or compiles
+            return None
+    return settings
+
+
+def _solver(output_variables, lean=False, compiled=False, settings=None):
+    # None leaves the model's default solver
+    if not (lean or compiled or settings):
+        return None
+    if settings is None:
+        solver_class, kwargs = pybamm.IDAKLUSolver, {}
+    else:
+        solver_class, kwargs = solver_profile.solver_arguments(settings)
+    if lean:
+        # IDAKLU evaluates the whitelisted variables as it goes and keeps no
+        # states. The experiment reads "Battery voltage [V]" for voltage stop
+        # conditions.
+        output_variables = (
+            DEFAULT_OUTPUT_VARIABLES if output_variables is None else output_variables
+        )
+        kwargs["output_variables"] = list(
+            dict.fromkeys([*output_variables, "Battery voltage [V]"])
+        )
+    if compiled:
+        # pybamm generates C for the residual, Jacobian, events and output
+        # variables, compiles it with gcc and keeps the library under a hash of
+        # the functions; the variable is inherited by sweep workers, so they load
+        # the libraries the first of them compiled
+        os.environ.setdefault("PYBAMM_CASADI_AOT_CACHE", COMPILED_DIRECTORY)
+        kwargs["options"] = {**kwargs.get("options", {}), "compile": True}
+    return solver_class(**kwargs)
+
+
+def _solve_kwargs(solve_kwargs, lean, experiment):
+    solve_kwargs = dict(solve_kwargs or {})
+    # only the first and last cycles are saved; the summaries cover the rest. A
+    # voltage stop condition reads every cycle's solution, so all are kept then
+    # (as whitelisted variables only).
+    if lean and experiment is not None and "voltage" not in experiment.termination:
+        solve_kwargs.setdefault("save_at_cycles", [])
+    return solve_kwargs
+
+
+def run_simulation(
+    parameter_values,
+    experiment=None,
+    t_eval=None,
+    options=None,
+    output_variables=None,
+    solve_kwargs=None,
+    cache=None,
+    lean=False,
+    summary_variables=None,
+    compiled=False,
+    model_class=None,
+    profile_values=None,
+):
+    """
+    Build, solve and reduce one simulation of the composite cell.
+
+    The solver is the one profiled for the model by autotune.py, if there is one
+    (see solver_profile.py), or else the model's default, and likewise the mesh
+    (mesh_convergence.py, mesh_profile.py).
+
+    Parameters
+    ----------
+    parameter_values : :class:`pybamm.ParameterValues` or dict
+        Parameters for this run
+    experiment : :class:`pybamm.Experiment`, optional
+        Experiment to run. If not given, ``t_eval`` is used with the constant
+        "Current function [A]"
+    t_eval : array-like, optional
+        Times to solve at when no experiment is given
+    options : dict, optional
+        Model options, defaults to :data:`COMPOSITE_OPTIONS`
+    output_variables : list of str, optional
+        Variables to return, defaults to :data:`DEFAULT_OUTPUT_VARIABLES`
+    solve_kwargs : dict, optional
+        Extra keyword arguments for :meth:`pybamm.Simulation.solve`
+    cache : :class:`solution_cache.SolutionCache`, optional
+        Cache to read the result from, or to store it in after solving
+    lean : bool, optional
+        Whether to solve in lean mode, for long experiments: the solver only keeps
+        ``output_variables``, only the first and last cycles are saved (unless
+        ``solve_kwargs`` gives "save_at_cycles", or the experiment has a voltage
+        stop condition), and the end-of-cycle value of ``summary_variables`` is
+        returned for every cycle, see :func:`extract_variables`
+    summary_variables : list of str, optional
+        Variables summarised per cycle in lean mode, defaults to
+        :data:`CYCLE_SUMMARY_VARIABLES`
+    compiled : bool, optional
+        Whether to solve with the model's functions compiled to a shared library
+        (with the system C compiler) instead of evaluated by the casadi virtual
+        machine. The first run of a model compiles it, which takes tens of
+        seconds; the library is kept in :data:`COMPILED_DIRECTORY` and reused by
+        later runs and processes.
+    model_class : class, optional
+        pybamm model class, defaults to :class:`pybamm.lithium_ion.DFN`; e.g. the
+        cheaper one fidelity.py picks for the protocol
+    profile_values : :class:`pybamm.ParameterValues`, optional
+        Parameter values to look the profiles up by, defaults to
+        ``parameter_values``; a sweep gives its base set, so that its points use
+        the profiles of that set whether they are rebuilt or given as inputs
+
+    Returns
+    -------
+    dict
+        Variable name -> :class:`numpy.ndarray`
+    """
+    if not isinstance(parameter_values, pybamm.ParameterValues):
+        parameter_values = pybamm.ParameterValues(parameter_values)
+    if cache is not None:
+        key = simulation_key(
+            cache,
+            parameter_values,
+            experiment,
+            t_eval,
+            options,
+            output_variables,
+            solve_kwargs,
+            lean=lean,
+            summary_variables=summary_variables,
+            compiled=compiled,
+            model_class=model_class,
+            profile_values=profile_values,
+        )
+        variables = cache.get(key)
+        if variables is not None:
+            return variables
+    if lean:
+        summary_variables = summary_variables or CYCLE_SUMMARY_VARIABLES
+    profile_values = parameter_values if profile_values is None else profile_values
+    model = composite_model(options, model_class)
+    sim = pybamm.Simulation(
+        model,
+        parameter_values=parameter_values,
+        experiment=experiment,
+        var_pts=mesh_profile.var_pts(
+            model_identity(options, None, model_class), profile_values, model
+        ),
+        solver=_solver(
+            output_variables,
+            lean,
+            compiled,
+            _profiled_settings(
+                profile_values, options, None, lean, compiled, model_class
+            ),
+        ),
+    )
+    solution = sim.solve(
+        t_eval=t_eval, **_solve_kwargs(solve_kwargs, lean, experiment)
+    )
+    variables = extract_variables(
+        solution, output_variables, summary_variables if lean else None
+    )
+    if cache is not None:
+        cache.put(key, variables)
+    return variables
+
+
+def input_parameter_values(parameter_values, input_names):
+    """
+    Copy of ``parameter_values`` with ``input_names`` turned into runtime inputs.
+
+    The model only needs to be processed and discretised once for a parameter set
+    returned by this function; the values are then given to each solve through
+    ``inputs``.
+
+    Parameters
+    ----------
+    parameter_values : :class:`pybamm.ParameterValues` or dict
+        Base parameter set, e.g. ``get_final_parameter_values()``
+    input_names : list of str
+        Keys to leave free, e.g.
+        "Secondary: Negative electrode active material volume fraction" or
+        "Current function [A]"
+
+    Returns
+    -------
+    :class:`pybamm.ParameterValues`
+    """
+    if isinstance(parameter_values, pybamm.ParameterValues):
+        parameter_values = copy_parameter_values(parameter_values)
+    else:
+        parameter_values = pybamm.ParameterValues(parameter_values)
+    parameter_values.update(
+        {name: "[input]" for name in input_names}, check_already_exists=False
+    )
+    return parameter_values
+
+
+def build_simulation(
+    parameter_values,
+    input_names=(),
+    experiment=None,
+    options=None,
+    model=None,
+    lean=False,
+    output_variables=None,
+    model_cache=None,
+    compiled=False,
+    model_class=None,
+):
+    """
+    Process and discretise the composite model once, leaving ``input_names`` free.
+
+    A ``model`` can be given instead of ``options``, e.g. one with custom
+    submodels. With ``lean``, the solver is set up as in the lean mode of
+    :func:`run_simulation`, for ``output_variables``; solve it with
+    ``lean=True`` as well. With a ``model_cache`` (a
+    :class:`model_cache.ModelCache`), the discretised model is loaded from it, or
+    stored in it once built; this does not apply to experiments. ``compiled`` and
+    ``model_class`` are as for :func:`run_simulation`, and so are the solver and
+    the mesh.
+
+    Returns
+    -------
+    :class:`pybamm.Simulation`
+        Built simulation, to be solved with :func:`solve_inputs`
+    """
+    # the profiles are those of the parameter set, with the inputs at its values
+    settings = _profiled_settings(
+        parameter_values, options, model, lean, compiled, model_class
+    )
+    var_pts = mesh_profile.var_pts(
+        model_identity(options, model, model_class),
+        parameter_values,
+        composite_model(options, model_class) if model is None else model,
+    )
+    parameter_values = input_parameter_values(parameter_values, input_names)
+    if model is None and model_class is not None:
+        model = composite_model(options, model_class)
+    if model_cache is not None and experiment is None:
+        model = model_cache.discretised_model(
+            parameter_values, options, model, var_pts
+        )
+    sim = pybamm.Simulation(
+        composite_model(options) if model is None else model,
+        parameter_values=parameter_values,
+        experiment=experiment,
+        var_pts=var_pts,
+        solver=_solver(output_variables, lean, compiled, settings),
+    )
+    if experiment is None:
+        sim.build()
+    return sim
+
+
+def solve_inputs(
+    sim,
+    inputs,
+    t_eval=None,
+    output_variables=None,
+    solve_kwargs=None,
+    lean=False,
+    summary_variables=None,
+):
+    """
+    Re-solve a simulation from :func:`build_simulation` for each dict of inputs.
+
+    Parameters
+    ----------
+    sim : :class:`pybamm.Simulation`
+        Built simulation
+    inputs : list of dict
+        Input values, one dict per solve
+    t_eval : array-like, optional
+        Times to solve at when the simulation has no experiment
+    lean : bool, optional
+        Whether to solve in lean mode, for a simulation built with ``lean=True``
+    summary_variables : list of str, optional
+        Variables summarised per cycle in lean mode, see :func:`run_simulation`
+
+    Returns
+    -------
+    list of dict
+        Variable name -> :class:`numpy.ndarray`, one dict per entry of ``inputs``
+    """
+    # pybamm only sets the attribute for simulations with an experiment
+    experiment = getattr(sim, "experiment", None)
+    solve_kwargs = _solve_kwargs(solve_kwargs, lean, experiment)
+    if lean:
+        summary_variables = summary_variables or CYCLE_SUMMARY_VARIABLES
+    return [
+        extract_variables(
+            sim.solve(t_eval=t_eval, inputs=point, **solve_kwargs),
+            output_variables,
+            summary_variables if lean else None,
+        )
+        for point in inputs
+    ]
+
+
+def repeated_experiment(
+    steps,
+    cycles,
+    stop_voltage=None,
+    stop_soc=None,
+    initial_soc=1.0,
+    cutoff_tolerance=1e-3,
+):
+    """
+    Experiment repeating ``steps`` for up to ``cycles`` cycles, with experiment-level
+    stop conditions so no cycles are set up once the run is over.
+
+    Parameters
+    ----------
+    steps : tuple of str
+        Steps of one cycle
+    cycles : int
+        Maximum number of cycles
+    stop_voltage : float, optional
+        Stop after the first cycle whose minimum voltage reaches this value [V],
+        e.g. the lower cut-off of a "... or until 2.5 V" step. A step stopped by
+        its voltage event ends marginally above the cut-off, so the check is made
+        against ``stop_voltage + cutoff_tolerance``.
+    stop_soc : float, optional
+        Stop once the cycles have discharged the cell below this state of charge.
+        Only supported for cycles made of C-rate and rest steps of fixed duration,
+        for which it just caps the number of cycles.
+    initial_soc : float, optional
+        State of charge the experiment starts from, used with ``stop_soc``
+    cutoff_tolerance : float, optional
+        Voltage tolerance [V] used with ``stop_voltage``
+
+    Returns
+    -------
+    :class:`pybamm.Experiment`
+    """
+    steps = tuple(steps)
+    if stop_soc is not None:
+        cycle = pybamm.Experiment([steps]).steps
+        soc_per_cycle = 0
+        for step in cycle:
+            if isinstance(step, pybamm.step.CRate):
+                soc_per_cycle += step.value * step.duration / 3600
+            elif not isinstance(step, pybamm.step.Rest):
+                raise ValueError(
+                    f"stop_soc needs C-rate or rest steps, not '{step.description}'"
+                )
+        if soc_per_cycle <= 0:
+            raise ValueError("stop_soc needs cycles that discharge the cell")
+        needed = int(np.ceil((initial_soc - stop_soc) / soc_per_cycle - 1e-9))
+        cycles = max(1, min(cycles, needed))
+    termination = None
+    if stop_voltage is not None:
+        termination = [f"{stop_voltage + cutoff_tolerance}V"]
+    return pybamm.Experiment([steps] * cycles, termination=termination)
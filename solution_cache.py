@@ -0,0 +1,350 @@
+"""
+Content-addressed on-disk cache of simulation results.
+
+A run is keyed on a SHA-256 hash of everything that determines its result: the
+model (class, options and submodels), the resolved parameter dictionary, the
+experiment or times, the output variables and solve arguments, and the pybamm
+version. Functions and classes from this project are hashed by their source, the
+constants they read and the values they close over, so editing e.g.
+``silicon_ocp_average_Durdel2023``, or a table in ocp_data.py, gives new keys;
+functions from installed packages are hashed by name, with the package version.
+
+Entries are the variable dicts returned by :func:`run_helpers.run_simulation`,
+stored as ``<key>.npz``. A hit loads them without building or solving anything.
+The directory is kept under ``max_bytes`` by evicting the least recently used
+entries.
+
+Example::
+
+    from solution_cache import SolutionCache
+    results = run_sweep(param, overrides, t_eval=[0, 10000], cache=SolutionCache())
+
+Inspect or clear the cache (CLI)::
+
+    python solution_cache.py info
+    python solution_cache.py clear
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sysconfig
+import tempfile
+import time
+import types
+
+import numpy as np
+
+import pybamm
+from pybamm.expression_tree.operations.serialise import convert_symbol_to_json
+
+# Cache directory, unless given explicitly or by the LISI_SOLUTION_CACHE variable
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "LiSi", "solutions")
+DEFAULT_MAX_BYTES = 2**30
+
+# Bump when the key or the entry format changes, to orphan old entries
+CACHE_VERSION = 1
+
+_LIBRARY_PATHS = tuple(
+    os.path.realpath(sysconfig.get_paths()[name])
+    for name in ("stdlib", "platstdlib", "purelib", "platlib")
+)
+
+
+def _is_library(obj):
+    module = inspect.getmodule(obj)
+    path = getattr(module, "__file__", None)
+    if module is None or path is None:
+        return module is not None  # built-in modules
+    return os.path.realpath(path).startswith(_LIBRARY_PATHS)
+
+
+def _global_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _global_names(const)
+    return names
+
+
+def _source(obj):
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        # e.g. defined interactively: fall back to the byte code
+        code = getattr(obj, "__code__", None)
+        return code.co_code.hex() if code is not None else obj.__qualname__
+
+
+def _canonical_function(function, seen):
+    name = f"{function.__module__}.{function.__qualname__}"
+    if _is_library(function):
+        return ["library", name]
+    if function in seen:
+        return ["recursive", name]
+    seen.add(function)
+    code = function.__code__
+    closure = [cell.cell_contents for cell in function.__closure__ or ()]
+    referenced = {
+        global_name: function.__globals__[global_name]
+        for global_name in sorted(_global_names(code))
+        if global_name in function.__globals__
+        and not isinstance(function.__globals__[global_name], types.ModuleType)
+    }
+    return [
+        "function",
+        name,
+        _source(function),
+        _canonical(function.__defaults__, seen),
+        _canonical(function.__kwdefaults__, seen),
+        _canonical(closure, seen),
+        _canonical(referenced, seen),
+        _canonical(vars(function), seen),  # e.g. ``ocp_tables`` of @tabulated
+    ]
+
+
+def _canonical_class(cls, seen):
+    name = f"{cls.__module__}.{cls.__qualname__}"
+    if _is_library(cls):
+        return ["library", name]
+    if cls in seen:
+        return ["recursive", name]
+    seen.add(cls)
+    methods = {
+        key: value
+        for key, value in vars(cls).items()
+        if isinstance(value, (types.FunctionType, staticmethod, classmethod, property))
+    }
+    return [
+        "class",
+        name,
+        _source(cls),
+        [_canonical_class(base, seen) for base in cls.__bases__],
+        _canonical(
+            {
+                key: getattr(value, "__func__", getattr(value, "fget", value))
+                for key, value in methods.items()
+            },
+            seen,
+        ),
+    ]
+
+
+def _canonical(value, seen=None):
+    """JSON-compatible form of ``value`` that is equal for equal contents."""
+    seen = set() if seen is None else seen
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, float):
+        return ["float", repr(value)]
+    if isinstance(value, np.generic):
+        return _canonical(value.item(), seen)
+    if isinstance(value, np.ndarray):
+        data = np.ascontiguousarray(value)
+        return [
+            "ndarray",
+            str(data.dtype),
+            list(data.shape),
+            hashlib.sha256(data.tobytes()).hexdigest(),
+        ]
+    if isinstance(value, pybamm.ParameterValues):
+        value = dict(value.items())
+    if isinstance(value, dict):
+        items = [[_canonical(k, seen), _canonical(v, seen)] for k, v in value.items()]
+        return ["dict", sorted(items, key=json.dumps)]
+    if isinstance(value, (list, tuple)):
+        return [type(value).__name__, [_canonical(item, seen) for item in value]]
+    if isinstance(value, (set, frozenset)):
+        return ["set", sorted((_canonical(item, seen) for item in value), key=json.dumps)]
+    if isinstance(value, pybamm.Symbol):
+        serialised = convert_symbol_to_json(value)
+        return ["symbol", _canonical(serialised, seen)]
+    if isinstance(value, pybamm.Experiment):
+        return [
+            "experiment",
+            _canonical([step.to_dict() for step in value.steps], seen),
+            _canonical(value.cycle_lengths, seen),
+            _canonical(value.termination_string, seen),
+            _canonical(value.period, seen),
+            _canonical(value.temperature, seen),
+        ]
+    if isinstance(value, pybamm.BaseModel):
+        return [
+            "model",
+            _canonical_class(type(value), seen),
+            _canonical(dict(getattr(value, "options", None) or {}), seen),
+            _canonical(
+                {name: type(sub) for name, sub in getattr(value, "submodels", {}).items()},
+                seen,
+            ),
+        ]
+    if isinstance(value, (types.FunctionType, types.MethodType)):
+        if isinstance(value, types.MethodType):
+            return ["method", _canonical(value.__self__, seen), value.__name__]
+        return _canonical_function(value, seen)
+    if isinstance(value, type):
+        return _canonical_class(value, seen)
+    if callable(value) and hasattr(value, "__wrapped__"):
+        # e.g. functools.lru_cache, whose repr is only an address
+        return ["wrapped", _canonical(value.__wrapped__, seen)]
+    if hasattr(value, "__dict__") and not _is_library(type(value)):
+        # instances of this project's classes, e.g. PulseCurrent or SurrogateOCP
+        return ["object", _canonical_class(type(value), seen), _canonical(vars(value), seen)]
+    return ["repr", type(value).__qualname__, repr(value)]
+
+
+def content_hash(**parts):
+    """SHA-256 hex digest of ``parts``, see the module docstring."""
+    canonical = _canonical(
+        {"cache version": CACHE_VERSION, "pybamm": pybamm.__version__, **parts}
+    )
+    encoded = json.dumps(canonical, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class SolutionCache:
+    """
+    Directory of simulation results, keyed by :func:`content_hash`.
+
+    Parameters
+    ----------
+    directory : str, optional
+        Cache directory, defaults to the LISI_SOLUTION_CACHE environment variable
+        or :data:`DEFAULT_DIRECTORY`
+    max_bytes : int, optional
+        Size the directory is kept under, 1 GiB by default
+    """
+
+    # Overridden by caches of other kinds of entries, e.g. model_cache.ModelCache
+    suffix = ".npz"
+    environment_variable = "LISI_SOLUTION_CACHE"
+    default_directory = DEFAULT_DIRECTORY
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        if directory is None:
+            directory = os.environ.get(
+                self.environment_variable, self.default_directory
+            )
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}({self.directory!r}, max_bytes={self.max_bytes})"
+        )
+
+    def key(self, **parts):
+        return content_hash(**parts)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.suffix)
+
+    def _read(self, f):
+        with np.load(f, allow_pickle=False) as data:
+            names = data["names"]
+            return {str(name): data[f"v{i}"] for i, name in enumerate(names)}
+
+    def _write(self, f, variables):
+        arrays = {f"v{i}": np.asarray(value) for i, value in enumerate(variables.values())}
+        np.savez(f, names=np.array(list(variables), dtype=str), **arrays)
+
+    def get(self, key):
+        """Stored variables of ``key``, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = self._read(f)
+        except (OSError, KeyError, ValueError, EOFError, pickle.UnpicklingError):
+            # missing, or evicted or half-written by another process
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return value
+
+    def put(self, key, variables):
+        """Store ``variables`` (name -> array) under ``key``, then evict."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(
+            suffix=self.suffix + ".tmp", dir=self.directory
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                self._write(f, variables)
+            # atomic, so parallel workers never see a partial entry
+            os.replace(temporary, self._path(key))
+        except BaseException:
+            os.remove(temporary)
+            raise
+        self.evict()
+
+    def entries(self):
+        """List of (key, size [bytes], last used [epoch s]), oldest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.suffix):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                key = entry.name[: -len(self.suffix)]
+                entries.append((key, stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, max_bytes=None):
+        """Remove least recently used entries until under ``max_bytes``."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for key, size, _ in entries:
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        """Remove every entry; returns how many there were."""
+        return self.evict(max_bytes=0)
+
+
+def cache_cli(cache_class, description, argv=None):
+    """``info`` / ``clear`` command line of a cache of class ``cache_class``."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("command", choices=["info", "clear"])
+    parser.add_argument("--directory", default=None)
+    args = parser.parse_args(argv)
+    cache = cache_class(args.directory)
+    if args.command == "clear":
+        print(f"removed {cache.clear()} entries from {cache.directory}")
+        return
+    entries = cache.entries()
+    total = sum(size for _, size, _ in entries)
+    print(
+        f"{cache.directory}: {len(entries)} entries, {total / 2**20:.1f} MiB "
+        f"of {cache.max_bytes / 2**20:.0f} MiB"
+    )
+    for key, size, used in reversed(entries):
+        used = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(used))
+        print(f"  {key[:16]}  {size / 2**10:9.1f} KiB  last used {used}")
+
+
+def main(argv=None):
+    cache_cli(SolutionCache, __doc__.split("\n\n")[0], argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Solver profile: the solver settings :mod:`autotune` found fastest for a model
+and parameter set, used by the run helpers for every run of that model with that
+parameter set.
+
+The profile is a JSON file with one entry per model (class and options, or a
+custom model's class and submodels) and parameter set, keyed by
+:func:`solution_cache.content_hash` so that it no longer applies once the model,
+the parameter values (e.g. the OCPs, tables or surrogates) or the pybamm version
+change. The protocol (current and temperatures) is left out of the key. Sweeps
+look every point up by the parameter set they sweep around, so rebuilt points
+use the same entry as points set through input parameters. Tolerances accurate
+enough for one parameter set can be too loose for another, so runs with other
+parameter values get the model's default solver, with a warning if the model has
+entries for other parameter values. Each entry holds the chosen settings under
+"solver", e.g.::
+
+    {"class": "IDAKLUSolver", "rtol": 0.001, "atol": 1e-06,
+     "options": {"linear_solver": "SUNLinSol_KLU", "jacobian": "sparse"}}
+
+with the measurements that chose them: the parameter set and protocol tuned
+on, the accuracy required, and the time and voltage error of every trial.
+
+:func:`run_helpers.run_simulation`, :func:`run_helpers.build_simulation` and the
+sweeps look the model and parameter values up here, and solve with the profiled
+solver if there is one. The profile is read from
+~/.cache/LiSi/solver_profile.json, or the path in the LISI_SOLVER_PROFILE
+environment variable; set it to an empty string to run with pybamm's defaults.
+
+Inspect or clear the profile (CLI)::
+
+    python solver_profile.py info
+    python solver_profile.py clear
+"""
+import argparse
+import json
+import os
+import tempfile
+import warnings
+
+import pybamm
+
+from solution_cache import content_hash
+
+DEFAULT_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "LiSi", "solver_profile.json"
+)
+
+# Keys set by the protocol rather than the cell, left out of the profile key so
+# that runs at other currents and temperatures (e.g. GITT campaigns) use the
+# profile of their parameter set
+PROTOCOL_KEYS = (
+    "Current function [A]",
+    "Ambient temperature [K]",
+    "Initial temperature [K]",
+)
+
+# path -> (modification time, entries), so runs do not re-read an unchanged file
+_loaded = {}
+
+# keys already reported missing by :func:`find_entry`
+_missed = set()
+
+
+def profile_path():
+    """Path of the profile in use, or None if profiles are switched off."""
+    return os.environ.get("LISI_SOLVER_PROFILE", DEFAULT_PATH) or None
+
+
+def cell_parameters(parameter_values):
+    """``parameter_values`` as a dict, without :data:`PROTOCOL_KEYS`."""
+    return {
+        key: value
+        for key, value in parameter_values.items()
+        if key not in PROTOCOL_KEYS
+    }
+
+
+def model_key(model, parameter_values, kind="solver profile"):
+    """
+    Profile key of ``model`` with ``parameter_values``: a built model, or
+    ``(model class, options)`` for one that has not been built, as in
+    :func:`run_helpers.simulation_key`, and the parameter values of the cell (see
+    :func:`cell_parameters`). Sweeps look their points up by their base set, see
+    ``profile_values`` of :func:`run_helpers.run_simulation`.
+    """
+    return content_hash(
+        kind=kind, model=model, parameter_values=cell_parameters(parameter_values)
+    )
+
+
+def find_entry(entries, model, parameter_values, kind="solver profile"):
+    """
+    Entry of ``model`` with ``parameter_values`` in ``entries`` (of a profile of
+    ``kind``), or None. A miss for a model the profile has entries of, for other
+    parameter values, is reported once with a warning: such runs get the model's
+    defaults.
+    """
+    key = model_key(model, parameter_values, kind)
+    entry = entries.get(key)
+    if entry is None and key not in _missed:
+        identity = content_hash(kind=kind, model=model)
+        if any(other.get("model key") == identity for other in entries.values()):
+            _missed.add(key)
+            warnings.warn(
+                f"the {kind} has entries for this model, but none for these "
+                "parameter values: running with the model's defaults. Profile "
+                "this parameter set, or sweep it as overrides of a profiled one.",
+                stacklevel=3,
+            )
+    return entry
+
+
+def add_entry(entries, model, parameter_values, entry, kind="solver profile"):
+    """Put ``entry`` in ``entries`` under its key, with its model's own key."""
+    entry = {**entry, "model key": content_hash(kind=kind, model=model)}
+    entries[model_key(model, parameter_values, kind)] = entry
+
+
+def load(path=None):
+    """
+    Entries of the profile at ``path`` (default :func:`profile_path`), by key; also
+    reads the other JSON files of entries, e.g. the fidelity choices.
+    """
+    path = profile_path() if path is None else path
+    if path is None:
+        return {}
+    try:
+        modified = os.path.getmtime(path)
+    except OSError:
+        return {}
+    if path not in _loaded or _loaded[path][0] != modified:
+        try:
+            with open(path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            # half-written by another process; the next call reads it again
+            return {}
+        _loaded[path] = (modified, entries)
+    return _loaded[path][1]
+
+
+def lookup(model, parameter_values, path=None):
+    """
+    Solver settings profiled for ``model`` with ``parameter_values`` (see
+    :func:`model_key`), or None.
+    """
+    entries = load(path)
+    if not entries:
+        return None
+    entry = find_entry(entries, model, parameter_values)
+    return None if entry is None else entry["solver"]
+
+
+def save_entry(model, parameter_values, entry, path=None):
+    """
+    Store the autotune ``entry`` of ``model`` with ``parameter_values``, replacing
+    any previous one.
+    """
+    path = profile_path() if path is None else path
+    if path is None:
+        raise ValueError("LISI_SOLVER_PROFILE is empty: profiles are switched off")
+    entries = dict(load(path))
+    add_entry(entries, model, parameter_values, entry)
+    write_entries(path, entries)
+
+
+def write_entries(path, entries):
+    """Replace the JSON file at ``path`` with ``entries`` in one step."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temporary = tempfile.mkstemp(suffix=".json.tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(entries, f, indent=1)
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+def solver_arguments(settings):
+    """
+    Solver class and keyword arguments of the settings of a profile entry.
+
+    Returns
+    -------
+    (type, dict)
+        e.g. ``(pybamm.IDAKLUSolver, {"rtol": 1e-3, "atol": 1e-6, "options": {...}})``
+    """
+    settings = dict(settings)
+    solver_class = getattr(pybamm, settings.pop("class"))
+    if "options" in settings:
+        settings["options"] = dict(settings["options"])
+    return solver_class, settings
+
+
+def make_solver(settings):
+    """Solver with the settings of a profile entry."""
+    solver_class, kwargs = solver_arguments(settings)
+    return solver_class(**kwargs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("command", choices=["info", "clear"])
+    parser.add_argument("--path", default=None)
+    args = parser.parse_args(argv)
+    path = profile_path() if args.path is None else args.path
+    if path is None:
+        print("solver profiles are switched off (LISI_SOLVER_PROFILE is empty)")
+        return
+    entries = load(path)
+    if args.command == "clear":
+        if os.path.exists(path):
+            os.remove(path)
+        print(f"removed {len(entries)} entries from {path}")
+        return
+    print(f"{path}: {len(entries)} entries")
+    for key, entry in entries.items():
+        print(
+            f"{key[:12]}  {entry['model']}, tuned on {entry['parameter set']!r}: "
+            f"{json.dumps(entry['solver'])}, {entry['seconds']:.2f} s, "
+            f"error {entry['error [V]'] * 1e3:.3f} mV "
+            f"(reference {entry['reference seconds']:.2f} s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
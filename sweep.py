@@ -0,0 +1,491 @@
+"""
+Parallel parameter sweeps for the composite cell.
+
+Each point of the sweep is a dict of parameter overrides applied on top of a base
+parameter set. Points are spread over a process pool and the results come back in
+the same order as the points, whatever the order the workers finish in.
+
+Example (CLI)::
+
+    python sweep.py --parameter-set OG --processes 8 \\
+        --set "Current function [A]=0.0029,0.0058" \\
+        --step "Discharge at C/2 until 3.0 V" --step "Rest for 1 hour" \\
+        --output sweep.npz
+"""
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import pybamm
+
+import Durdel2023_composite  # noqa: F401, registers "final", "test" and "OG"
+import parameter_sets
+from fidelity import protocol_c_rate, select_model_class
+from ocp_data import select_ocp
+from results_store import ResultsWriter
+from run_helpers import build_simulation, run_simulation, simulation_key, solve_inputs
+
+
+def get_parameter_values(name):
+    """
+    Return the parameter set called ``name``: one registered in parameter_sets.py
+    (e.g. "final", "test" or "OG" of Durdel2023_composite.py), or any parameter
+    set shipped with pybamm (e.g. "Chen2020_composite"). The set is only built
+    once per process; each call returns a copy.
+    """
+    return parameter_sets.parameter_values(name)
+
+
+def product_grid(axes):
+    """
+    Cartesian product of parameter values.
+
+    Parameters
+    ----------
+    axes : dict
+        Parameter name -> list of values
+
+    Returns
+    -------
+    list of dict
+        One override dict per point, last axis varying fastest
+    """
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+
+def silicon_fraction_grid(v_si, total_am_volume_fraction=0.75):
+    """
+    Overrides splitting ``total_am_volume_fraction`` between graphite (primary)
+    and silicon (secondary), as in composite_example.py.
+    """
+    return [
+        {
+            "Primary: Negative electrode active material volume fraction": (1 - v)
+            * total_am_volume_fraction,
+            "Secondary: Negative electrode active material volume fraction": v
+            * total_am_volume_fraction,
+        }
+        for v in v_si
+    ]
+
+
+def _run_point(args):
+    parameter_values, overrides, run_kwargs = args
+    point_values = parameter_sets.copy_parameter_values(parameter_values)
+    point_values.update(overrides, check_already_exists=False)
+    # the profiles are those of the base set, as for the points of input mode
+    return run_simulation(point_values, profile_values=parameter_values, **run_kwargs)
+
+
+# Simulation built once per worker process by ``_init_worker`` in input mode
+_worker_simulation = None
+
+
+def _init_worker(
+    parameter_values,
+    input_names,
+    experiment,
+    options,
+    model,
+    lean=False,
+    output_variables=None,
+    model_cache=None,
+    compiled=False,
+    model_class=None,
+):
+    global _worker_simulation
+    _worker_simulation = build_simulation(
+        parameter_values,
+        input_names,
+        experiment=experiment,
+        options=options,
+        model=model,
+        lean=lean,
+        output_variables=output_variables,
+        model_cache=model_cache,
+        compiled=compiled,
+        model_class=model_class,
+    )
+
+
+def _solve_point(args):
+    point, t_eval, output_variables, solve_kwargs, lean, summary_variables = args
+    return solve_inputs(
+        _worker_simulation,
+        [point],
+        t_eval,
+        output_variables,
+        solve_kwargs,
+        lean=lean,
+        summary_variables=summary_variables,
+    )[0]
+
+
+def run_sweep(
+    parameter_values,
+    overrides,
+    experiment=None,
+    t_eval=None,
+    options=None,
+    output_variables=None,
+    processes=None,
+    inputs=False,
+    solve_kwargs=None,
+    model=None,
+    cache=None,
+    store=None,
+    postprocess=None,
+    lean=False,
+    summary_variables=None,
+    model_cache=None,
+    compiled=False,
+    model_class=None,
+    fidelity=None,
+):
+    """
+    Solve one simulation per override dict, in parallel.
+
+    By default every point rebuilds the simulation from its own parameter set.
+    With ``inputs=True`` the overridden keys are made runtime inputs instead, so
+    each worker processes and discretises the model once and every point only
+    pays for the integration. This needs every override to be a number.
+
+    Parameters
+    ----------
+    parameter_values : :class:`pybamm.ParameterValues` or dict
+        Base parameter set, e.g. ``get_final_parameter_values()``
+    overrides : list of dict
+        One dict of parameter updates per point, see :func:`product_grid`
+    experiment : :class:`pybamm.Experiment`, optional
+        Experiment run at every point
+    t_eval : array-like, optional
+        Times to solve at when no experiment is given
+    options : dict, optional
+        Model options, defaults to :data:`run_helpers.COMPOSITE_OPTIONS`
+    output_variables : list of str, optional
+        Variables returned for each point
+    processes : int, optional
+        Number of worker processes. Defaults to the number of CPUs; 1 runs every
+        point in this process.
+    inputs : bool, optional
+        Whether to solve the points as inputs of one built simulation per worker
+    solve_kwargs : dict, optional
+        Extra keyword arguments for :meth:`pybamm.Simulation.solve`, e.g.
+        ``{"initial_soc": 1.0}``
+    model : :class:`pybamm.BaseModel`, optional
+        Model to use instead of building one from ``options``; input mode only
+    cache : :class:`solution_cache.SolutionCache`, optional
+        Cache of results. Points found in it are not built or solved; the others
+        are solved as above and stored.
+    store : :class:`results_store.ResultsWriter`, optional
+        Store each point is written to as soon as it is solved, instead of being
+        kept in memory
+    postprocess : callable, optional
+        ``postprocess(point, result)`` returns the dict kept for each point
+    lean : bool, optional
+        Whether to solve the points in the lean mode of
+        :func:`run_helpers.run_simulation`, for long experiments
+    summary_variables : list of str, optional
+        Variables summarised per cycle in lean mode, defaults to
+        :data:`run_helpers.CYCLE_SUMMARY_VARIABLES`
+    model_cache : :class:`model_cache.ModelCache`, optional
+        Cache the workers load the discretised model from instead of building it;
+        input mode over ``t_eval`` only
+    compiled : bool, optional
+        Whether to solve with compiled model functions, see
+        :func:`run_helpers.run_simulation`
+    model_class : class, optional
+        pybamm model class built from ``options``, defaults to the DFN
+    fidelity : float, optional
+        Voltage tolerance [V]: the points are solved with the cheapest model
+        (SPM, SPMe or DFN) within it of the DFN at the highest C-rate of the
+        sweep, calibrated on ``parameter_values`` the first time, see fidelity.py
+
+    Returns
+    -------
+    list of dict or :class:`results_store.ResultsStore`
+        Variable name -> array, one dict per point, in the order of ``overrides``.
+        With a ``store``, the closed store, which reads the same way.
+    """
+    points = iter_sweep(
+        parameter_values,
+        overrides,
+        experiment=experiment,
+        t_eval=t_eval,
+        options=options,
+        output_variables=output_variables,
+        processes=processes,
+        inputs=inputs,
+        solve_kwargs=solve_kwargs,
+        model=model,
+        cache=cache,
+        lean=lean,
+        summary_variables=summary_variables,
+        model_cache=model_cache,
+        compiled=compiled,
+        model_class=model_class,
+        fidelity=fidelity,
+    )
+    if store is not None:
+        try:
+            for i, result in points:
+                if postprocess is not None:
+                    result = postprocess(overrides[i], result)
+                store.write(i, overrides[i], result)
+        finally:
+            # keeps the points already written if the sweep fails
+            results = store.close()
+        return results
+    results = [None] * len(overrides)
+    for i, result in points:
+        if postprocess is not None:
+            result = postprocess(overrides[i], result)
+        results[i] = result
+    return results
+
+
+def iter_sweep(
+    parameter_values,
+    overrides,
+    experiment=None,
+    t_eval=None,
+    options=None,
+    output_variables=None,
+    processes=None,
+    inputs=False,
+    solve_kwargs=None,
+    model=None,
+    cache=None,
+    lean=False,
+    summary_variables=None,
+    model_cache=None,
+    compiled=False,
+    model_class=None,
+    fidelity=None,
+):
+    """
+    Generator of ``(index, result)`` for each point of ``overrides``, yielded as
+    the points are solved: cache hits first, then the rest in order. The
+    arguments are those of :func:`run_sweep`.
+    """
+    if not isinstance(parameter_values, pybamm.ParameterValues):
+        parameter_values = pybamm.ParameterValues(parameter_values)
+    if fidelity is not None and model is None and model_class is None:
+        model_class = select_model_class(
+            parameter_values,
+            protocol_c_rate(parameter_values, experiment, overrides),
+            fidelity,
+            options,
+        )
+    kwargs = {
+        "experiment": experiment,
+        "t_eval": t_eval,
+        "options": options,
+        "output_variables": output_variables,
+        "processes": processes,
+        "inputs": inputs,
+        "solve_kwargs": solve_kwargs,
+        "model": model,
+        "lean": lean,
+        "summary_variables": summary_variables,
+        "model_cache": model_cache,
+        "compiled": compiled,
+        "model_class": model_class,
+    }
+    if cache is not None:
+        missing = []
+        for i, point in enumerate(overrides):
+            point_values = parameter_sets.copy_parameter_values(parameter_values)
+            point_values.update(point, check_already_exists=False)
+            key = simulation_key(
+                cache,
+                point_values,
+                experiment,
+                t_eval,
+                options,
+                output_variables,
+                solve_kwargs,
+                model,
+                lean,
+                summary_variables,
+                compiled,
+                model_class,
+                profile_values=parameter_values,
+            )
+            result = cache.get(key)
+            if result is None:
+                missing.append((i, key))
+            else:
+                yield i, result
+        if missing:
+            solved = iter_sweep(
+                parameter_values, [overrides[i] for i, _ in missing], **kwargs
+            )
+            for j, result in solved:
+                i, key = missing[j]
+                cache.put(key, result)
+                yield i, result
+        return
+
+    processes = processes or os.cpu_count()
+    processes = min(processes, len(overrides))
+    if inputs:
+        input_names = sorted({name for point in overrides for name in point})
+        initargs = (
+            parameter_values,
+            input_names,
+            experiment,
+            options,
+            model,
+            lean,
+            output_variables,
+            model_cache,
+            compiled,
+            model_class,
+        )
+        tasks = [
+            (point, t_eval, output_variables, solve_kwargs, lean, summary_variables)
+            for point in overrides
+        ]
+        if processes <= 1:
+            _init_worker(*initargs)
+            yield from enumerate(map(_solve_point, tasks))
+            return
+        with ProcessPoolExecutor(
+            max_workers=processes, initializer=_init_worker, initargs=initargs
+        ) as executor:
+            yield from enumerate(executor.map(_solve_point, tasks))
+        return
+
+    if model is not None:
+        raise ValueError("a prebuilt model can only be swept with inputs=True")
+    run_kwargs = {
+        "experiment": experiment,
+        "t_eval": t_eval,
+        "options": options,
+        "output_variables": output_variables,
+        "solve_kwargs": solve_kwargs,
+        "lean": lean,
+        "summary_variables": summary_variables,
+        "compiled": compiled,
+        "model_class": model_class,
+    }
+    tasks = [(parameter_values, point, run_kwargs) for point in overrides]
+    if processes <= 1:
+        yield from enumerate(map(_run_point, tasks))
+        return
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        yield from enumerate(executor.map(_run_point, tasks))
+
+
+def save_sweep(filename, overrides, results):
+    """Save sweep results to a single ``.npz`` file, keys "<point>/<variable>"."""
+    arrays = {}
+    for i, (point, result) in enumerate(zip(overrides, results)):
+        for name, value in point.items():
+            arrays[f"{i}/override/{name}"] = np.asarray(value)
+        for name, value in result.items():
+            arrays[f"{i}/{name}"] = value
+    np.savez(filename, **arrays)
+
+
+def _parse_set(text):
+    name, _, values = text.rpartition("=")
+    return name, [float(v) for v in values.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--parameter-set", default="OG")
+    parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        type=_parse_set,
+        metavar="NAME=V1,V2,...",
+        help="parameter axis of the grid, can be repeated",
+    )
+    parser.add_argument(
+        "--step",
+        action="append",
+        default=[],
+        help="experiment step, can be repeated; without steps the model is solved "
+        "over --t-end at the constant current",
+    )
+    parser.add_argument("--cycles", type=int, default=1)
+    parser.add_argument(
+        "--lean",
+        action="store_true",
+        help="keep the first and last cycles and per-cycle summaries only, for "
+        "long experiments (see run_helpers.run_simulation)",
+    )
+    parser.add_argument(
+        "--compiled",
+        action="store_true",
+        help="solve with the model compiled to C, cached after the first run "
+        "(see run_helpers.run_simulation)",
+    )
+    parser.add_argument(
+        "--fidelity",
+        type=float,
+        default=None,
+        metavar="TOLERANCE",
+        help="solve with the cheapest of SPM, SPMe and DFN within TOLERANCE volts "
+        "of the DFN at the sweep's C-rate (see fidelity.py)",
+    )
+    parser.add_argument("--t-end", type=float, default=10000)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument(
+        "--inputs",
+        action="store_true",
+        help="build the model once per worker and pass the grid values as inputs",
+    )
+    parser.add_argument(
+        "--ocp",
+        choices=["table", "surrogate"],
+        default="table",
+        help="tabulated OCPs, or their analytic surrogates (faster, see ocp_data.py)",
+    )
+    parser.add_argument("--output", default="sweep.npz")
+    parser.add_argument(
+        "--store",
+        default=None,
+        help="stream the points into this columnar store directory instead of "
+        "writing --output at the end, see results_store.py",
+    )
+    parser.add_argument("--float32", action="store_true", help="float32 store columns")
+    args = parser.parse_args(argv)
+
+    overrides = product_grid(dict(args.set)) if args.set else [{}]
+    experiment = None
+    if args.step:
+        experiment = pybamm.Experiment([tuple(args.step)] * args.cycles)
+    results = run_sweep(
+        select_ocp(get_parameter_values(args.parameter_set), args.ocp),
+        overrides,
+        experiment=experiment,
+        t_eval=None if experiment else [0, args.t_end],
+        processes=args.processes,
+        inputs=args.inputs,
+        lean=args.lean,
+        compiled=args.compiled,
+        fidelity=args.fidelity,
+        store=(
+            ResultsWriter(args.store, np.float32 if args.float32 else np.float64)
+            if args.store
+            else None
+        ),
+    )
+    if args.store:
+        print(f"{len(results)} points saved to {args.store}")
+        return
+    save_sweep(args.output, overrides, results)
+    print(f"{len(results)} points saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Open-circuit potential submodel read from a precomputed (stoichiometry,
+temperature) table.
+
+:class:`TemperatureDependentOpenCircuitPotential` replaces pybamm's single OCP
+submodel of one electrode phase. Instead of the parameter set's expression tree
+U(sto, T) = U_ref(sto) + (T - T_ref) dU/dT(sto), the OCP is the function
+parameter "<phase>: <Domain> electrode OCP table [V]" of (sto, T), which
+:func:`add_ocp_tables` fills with one 2-D :class:`pybamm.Interpolant` tabulated
+from that same expression. pybamm's asymptotes at sto = 0 and 1 are left out of
+the table and added back analytically, as in
+:meth:`pybamm.LithiumIonParameters.U`. The solver then evaluates a single bilinear lookup
+per node, and the temperature is an ordinary argument of it, so
+a temperature sweep through "[input]" parameters needs no rebuild.
+
+Example::
+
+    from temperature_dependent_OCP import (
+        TemperatureDependentOpenCircuitPotential,
+        add_ocp_tables,
+    )
+
+    model = pybamm.lithium_ion.DFN({"thermal": "lumped"}, build=False)
+    for domain in ["negative", "positive"]:
+        model.submodels[f"{domain} primary open-circuit potential"] = (
+            TemperatureDependentOpenCircuitPotential(
+                model.param, domain, "lithium-ion main", model.options
+            )
+        )
+    model.build_model()
+    parameter_values = add_ocp_tables(pybamm.ParameterValues("ORegan2022"))
+"""
+import numpy as np
+
+import pybamm
+from pybamm.models.submodels.interface.open_circuit_potential import (
+    SingleOpenCircuitPotential,
+)
+from pybamm.parameters.lithium_ion_parameters import U_asymptotes
+
+# Temperature range [K] tabulated by default, wide enough for the GITT sweeps
+TABLE_TEMPERATURES = np.linspace(233.15, 353.15, 25)
+
+
+def ocp_table_name(phase_param):
+    """Name of the tabulated OCP function parameter of one electrode phase."""
+    Domain = phase_param.domain.capitalize()
+    return f"{phase_param.phase_prefactor}{Domain} electrode OCP table [V]"
+
+
+class OCPTable:
+    """
+    OCP function parameter of one phase, interpolating ``U`` tabulated at
+    ``(sto, temperatures)``, see :func:`add_ocp_tables`. A class rather than a
+    closure so that parameter sets using it can be pickled, e.g. by
+    ``sweep.run_sweep``.
+    """
+
+    def __init__(self, name, sto, temperatures, U):
+        self.name = name
+        self.sto = sto
+        self.temperatures = temperatures
+        self.U = U
+        self.__name__ = "ocp_table"
+
+    def __call__(self, x, T):
+        return pybamm.Interpolant((self.sto, self.temperatures), self.U, [x, T])
+
+
+class TemperatureDependentOpenCircuitPotential(SingleOpenCircuitPotential):
+    """
+    Single open-circuit potential read from a 2-D (stoichiometry, temperature)
+    table, see :func:`add_ocp_tables`. Takes the same arguments as
+    :class:`pybamm.open_circuit_potential.SingleOpenCircuitPotential`; reactions
+    other than "lithium-ion main" are handled as there.
+    """
+
+    def get_coupled_variables(self, variables):
+        if self.reaction != "lithium-ion main":
+            return super().get_coupled_variables(variables)
+
+        sto_surf, sto_bulk, T, T_bulk = self._get_stoichiometry_and_temperature(
+            variables
+        )
+        name = ocp_table_name(self.phase_param)
+        ocp_surf = pybamm.FunctionParameter(
+            name, {"Stoichiometry": sto_surf, "Temperature [K]": T}
+        ) + U_asymptotes(sto_surf)
+        ocp_bulk = pybamm.FunctionParameter(
+            name, {"Stoichiometry": sto_bulk, "Temperature [K]": T_bulk}
+        ) + U_asymptotes(sto_bulk)
+        dUdT = self.phase_param.dUdT(sto_surf)
+
+        variables.update(self._get_standard_ocp_variables(ocp_surf, ocp_bulk, dUdT))
+        self._alias_ocp_as_equilibrium(variables)
+        return variables
+
+
+def _tabulate_ocp(parameter_values, phase_param, sto, temperatures):
+    # U(sto, T) of the parameter set on the full grid, in one evaluation, without
+    # the asymptotes (at most 1 V, so no cancellation)
+    sto_grid, T_grid = np.meshgrid(sto, temperatures, indexing="ij")
+    x = pybamm.Vector(sto_grid.ravel())
+    U = phase_param.U(x, pybamm.Vector(T_grid.ravel())) - U_asymptotes(x)
+    return parameter_values.process_symbol(U).evaluate().reshape(sto_grid.shape)
+
+
+def add_ocp_tables(
+    parameter_values,
+    options=None,
+    temperatures=TABLE_TEMPERATURES,
+    n_sto=501,
+):
+    """
+    Tabulate the OCP of every electrode phase on a (stoichiometry, temperature)
+    grid, for :class:`TemperatureDependentOpenCircuitPotential`.
+
+    Parameters
+    ----------
+    parameter_values : :class:`pybamm.ParameterValues` or dict
+        Parameter set giving the OCPs and entropic changes
+    options : dict, optional
+        Model options giving the particle phases, e.g.
+        :data:`run_helpers.COMPOSITE_OPTIONS`
+    temperatures : array-like, optional
+        Temperature knots [K], see :data:`TABLE_TEMPERATURES`. The OCP is linear
+        in T, so the bilinear table is exact in T and extrapolates outside them
+    n_sto : int, optional
+        Number of stoichiometry knots, uniform on [0, 1]
+
+    Returns
+    -------
+    :class:`pybamm.ParameterValues`
+        A copy of ``parameter_values`` with one "... OCP table [V]" function
+        parameter per phase
+    """
+    if not isinstance(parameter_values, pybamm.ParameterValues):
+        parameter_values = pybamm.ParameterValues(parameter_values)
+    parameter_values = parameter_values.copy()
+    param = pybamm.LithiumIonParameters(options)
+    sto = np.linspace(0, 1, n_sto)
+    temperatures = np.asarray(temperatures, dtype=float)
+
+    tables = {}
+    for domain in ["negative", "positive"]:
+        domain_param = param.domain_params[domain]
+        for phase in param.options.phases[domain]:
+            phase_param = domain_param.phase_params[phase]
+            name = ocp_table_name(phase_param)
+            U = _tabulate_ocp(parameter_values, phase_param, sto, temperatures)
+            tables[name] = OCPTable(name, sto, temperatures, U)
+    parameter_values.update(tables, check_already_exists=False)
+    return parameter_values
@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+# the modules live in the repository root, next to this directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Run without the user's profiles, and with empty caches."""
+    monkeypatch.setenv("LISI_SOLVER_PROFILE", "")
+    monkeypatch.setenv("LISI_MESH_PROFILE", "")
+    monkeypatch.setenv("LISI_SOLUTION_CACHE", str(tmp_path / "solutions"))
+    monkeypatch.setenv("LISI_MODEL_CACHE", str(tmp_path / "models"))
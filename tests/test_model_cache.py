@@ -0,0 +1,31 @@
+import numpy as np
+
+import parameter_sets
+from model_cache import ModelCache
+from sweep import run_sweep, silicon_fraction_grid
+
+T_EVAL = [0, 600]
+
+
+def test_cached_model_matches_built_one():
+    parameter_values = parameter_sets.parameter_values("OG")
+    overrides = silicon_fraction_grid([0.04, 0.1])
+    built = run_sweep(
+        parameter_values, overrides, t_eval=T_EVAL, processes=1, inputs=True
+    )
+    cache = ModelCache()
+    for processes in [1, 2]:
+        # the first sweep stores the model, the second one's workers load it
+        cached = run_sweep(
+            parameter_values,
+            overrides,
+            t_eval=T_EVAL,
+            processes=processes,
+            inputs=True,
+            model_cache=cache,
+        )
+        assert len(cache.entries()) == 1
+        for result, reference in zip(cached, built):
+            assert result.keys() == reference.keys()
+            for name in reference:
+                np.testing.assert_allclose(result[name], reference[name], rtol=1e-10)
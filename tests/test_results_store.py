@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from results_store import ResultsStore, ResultsWriter
+
+
+def _point(i):
+    return {
+        "Time [s]": np.linspace(0, 100 + i, 7),
+        "Voltage [V]": np.full(7, 4.0 - i),
+        "Concentration [mol.m-3]": np.arange(6.0).reshape(2, 3) * i,
+    }
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "sweep.results"
+    overrides = [{"Current function [A]": 0.5 * (i + 1)} for i in range(3)]
+    writer = ResultsWriter(str(path))
+    # points are written in the order they finish
+    for i in [2, 0, 1]:
+        writer.write(i, overrides[i], _point(i))
+    closed = writer.close()
+
+    for store in [closed, ResultsStore(str(path))]:
+        assert len(store) == 3
+        assert store.indices == [0, 1, 2]
+        assert store.overrides == overrides
+        assert sorted(store.variables) == sorted(_point(0))
+        for i, result in enumerate(store):
+            for name, value in _point(i).items():
+                np.testing.assert_array_equal(result[name], value)
+
+
+def test_float32_keeps_time_in_float64(tmp_path):
+    writer = ResultsWriter(str(tmp_path / "sweep.results"), dtype=np.float32)
+    writer.write(0, {}, _point(0))
+    store = writer.close()
+    assert store[0]["Time [s]"].dtype == np.float64
+    assert store[0]["Voltage [V]"].dtype == np.float32
+
+
+def test_interrupted_sweep_keeps_the_indices(tmp_path):
+    writer = ResultsWriter(str(tmp_path / "sweep.results"))
+    writer.write(3, {}, _point(3))
+    writer.write(1, {}, _point(1))
+    store = writer.close()
+    assert store.indices == [1, 3]
+    np.testing.assert_array_equal(store[1]["Voltage [V]"], _point(3)["Voltage [V]"])
+
+
+def test_empty_store(tmp_path):
+    path = tmp_path / "sweep.results"
+    ResultsWriter(str(path)).close()
+    store = ResultsStore(str(path))
+    assert len(store) == 0
+    assert list(store) == []
+    assert store.indices == []
+    assert store.variables == []
+
+
+def test_refuses_to_replace_other_files(tmp_path):
+    (tmp_path / "notes.txt").write_text("keep me")
+    with pytest.raises(FileExistsError):
+        ResultsWriter(str(tmp_path))
+    # a store is replaced
+    path = tmp_path / "sweep.results"
+    ResultsWriter(str(path)).close()
+    writer = ResultsWriter(str(path))
+    writer.write(0, {}, _point(0))
+    assert len(writer.close()) == 1
@@ -0,0 +1,75 @@
+import importlib
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+import Durdel2023_composite  # noqa: F401, registers "final", "test" and "OG"
+import parameter_sets
+from run_helpers import simulation_key
+from solution_cache import SolutionCache, content_hash
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+KEY_SCRIPT = """
+import Durdel2023_composite, parameter_sets
+from run_helpers import simulation_key
+from solution_cache import SolutionCache
+values = parameter_sets.parameter_values("OG")
+print(simulation_key(SolutionCache(), values, t_eval=[0, 600]))
+"""
+
+
+def _og_key():
+    return simulation_key(
+        SolutionCache(), parameter_sets.parameter_values("OG"), t_eval=[0, 600]
+    )
+
+
+def test_key_is_stable():
+    key = _og_key()
+    assert key == _og_key()
+    # and across processes, which read each other's entries
+    output = subprocess.run(
+        [sys.executable, "-c", KEY_SCRIPT],
+        cwd=ROOT,
+        env=os.environ,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    assert output.split()[-1] == key
+
+
+def test_key_follows_the_run():
+    values = parameter_sets.parameter_values("OG")
+    key = _og_key()
+    assert simulation_key(SolutionCache(), values, t_eval=[0, 601]) != key
+    values.update({"Current function [A]": 2 * values["Current function [A]"]})
+    assert simulation_key(SolutionCache(), values, t_eval=[0, 600]) != key
+
+
+def test_function_body_change_invalidates(tmp_path, monkeypatch):
+    module_path = tmp_path / "cache_test_functions.py"
+    module_path.write_text("def ocp(sto):\n    return 2 * sto\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module("cache_test_functions")
+    key = content_hash(function=module.ocp)
+    assert content_hash(function=module.ocp) == key
+
+    module_path.write_text("def ocp(sto):\n    return 2.5 * sto\n")
+    module = importlib.reload(module)
+    assert content_hash(function=module.ocp) != key
+    sys.modules.pop("cache_test_functions")
+
+
+def test_put_get_round_trip():
+    cache = SolutionCache()
+    variables = {"Time [s]": np.linspace(0, 1, 5), "Voltage [V]": np.ones((2, 3))}
+    assert cache.get("missing") is None
+    cache.put("key", variables)
+    stored = cache.get("key")
+    assert stored.keys() == variables.keys()
+    for name, value in variables.items():
+        np.testing.assert_array_equal(stored[name], value)
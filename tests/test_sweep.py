@@ -0,0 +1,37 @@
+import numpy as np
+
+import parameter_sets
+from sweep import run_sweep, silicon_fraction_grid
+
+T_EVAL = [0, 600]
+
+
+def _assert_equal_results(results, expected):
+    assert len(results) == len(expected)
+    for result, reference in zip(results, expected):
+        assert result.keys() == reference.keys()
+        for name in reference:
+            np.testing.assert_allclose(result[name], reference[name], rtol=1e-10)
+
+
+def test_pool_matches_serial():
+    parameter_values = parameter_sets.parameter_values("OG")
+    overrides = silicon_fraction_grid([0.04, 0.1])
+    serial = run_sweep(parameter_values, overrides, t_eval=T_EVAL, processes=1)
+    pooled = run_sweep(parameter_values, overrides, t_eval=T_EVAL, processes=2)
+    _assert_equal_results(pooled, serial)
+    # the points differ, so each result is that of its own point
+    assert not np.allclose(serial[0]["Voltage [V]"], serial[1]["Voltage [V]"])
+
+
+def test_inputs_match_rebuilt_points():
+    parameter_values = parameter_sets.parameter_values("OG")
+    overrides = silicon_fraction_grid([0.04, 0.1])
+    rebuilt = run_sweep(parameter_values, overrides, t_eval=T_EVAL, processes=1)
+    inputs = run_sweep(
+        parameter_values, overrides, t_eval=T_EVAL, processes=2, inputs=True
+    )
+    for result, reference in zip(inputs, rebuilt):
+        np.testing.assert_allclose(
+            result["Voltage [V]"], reference["Voltage [V]"], atol=1e-6
+        )